@@ -5,10 +5,18 @@ African AI Strategies Portal - Vercel Serverless Function
 
 from flask import Flask, render_template, jsonify, request
 from flask_cors import CORS
+import hashlib
 import json
 import os
+import sys
 from datetime import datetime
 
+# Shared portal modules live in the project root (also on PYTHONPATH on Vercel)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.compression import Compressor, conditional
+from src.streaming import stream_json
+
 # Simple path setup for Vercel serverless
 TEMPLATE_DIR = '../templates'
 STATIC_DIR = '../static'
@@ -19,6 +27,7 @@ app = Flask(__name__,
            static_folder=STATIC_DIR,
            static_url_path='/static')
 CORS(app)
+Compressor(app)
 
 # Configuration
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -112,6 +121,15 @@ KENYA_STRATEGY = {
     }
 }
 
+# The demo data is fixed per deployment, so its hash versions every response built from it
+DEMO_DATA_VERSION = hashlib.sha1(
+    json.dumps([COUNTRIES_DATA, THEMES_DATA, KENYA_STRATEGY], sort_keys=True).encode()
+).hexdigest()[:16]
+
+def demo_data_version() -> str:
+    """Version of the bundled demo data"""
+    return DEMO_DATA_VERSION
+
 @app.route('/')
 def index():
     """Main dashboard page"""
@@ -120,16 +138,19 @@ def index():
                          themes=THEMES_DATA)
 
 @app.route('/api/countries')
+@conditional(demo_data_version)
 def api_countries():
     """API endpoint for countries data"""
     return jsonify(COUNTRIES_DATA)
 
 @app.route('/api/themes')
+@conditional(demo_data_version)
 def api_themes():
     """API endpoint for themes data"""
     return jsonify(THEMES_DATA)
 
 @app.route('/api/country/<country_code>')
+@conditional(demo_data_version)
 def api_country_detail(country_code):
     """API endpoint for specific country data"""
     if country_code.upper() == 'KE':
@@ -171,6 +192,7 @@ def compare():
     return render_template('compare.html', countries=COUNTRIES_DATA)
 
 @app.route('/api/compare')
+@conditional(demo_data_version)
 def api_compare():
     """API endpoint for comparison data"""
     return jsonify({
@@ -188,6 +210,7 @@ def search():
     return render_template('search.html')
 
 @app.route('/api/search')
+@conditional(demo_data_version)
 def api_search():
     """API endpoint for search functionality"""
     query = request.args.get('q', '').lower()
@@ -221,6 +244,7 @@ def analysis():
     return render_template('analysis.html', themes=THEMES_DATA)
 
 @app.route('/api/analysis')
+@conditional(demo_data_version)
 def api_analysis():
     """API endpoint for analysis data"""
     return jsonify({
@@ -243,38 +267,39 @@ def network():
     return render_template('network.html')
 
 @app.route('/api/network')
+@conditional(demo_data_version)
 def api_network():
-    """API endpoint for network visualization data"""
-    nodes = []
-    links = []
-    
-    # Add country nodes
-    for country in COUNTRIES_DATA:
-        nodes.append({
-            "id": country['code'],
-            "name": country['name'],
-            "type": "country",
-            "status": country['status']
-        })
-    
-    # Add theme nodes
-    for theme in THEMES_DATA:
-        nodes.append({
-            "id": theme['name'],
-            "name": theme['name'],
-            "type": "theme",
-            "frequency": theme['frequency']
-        })
+    """API endpoint for network visualization data, streamed as nodes and links are generated"""
+    def nodes():
+        # Country nodes
+        for country in COUNTRIES_DATA:
+            yield {
+                "id": country['code'],
+                "name": country['name'],
+                "type": "country",
+                "status": country['status']
+            }
         
-        # Add links between themes and countries
-        for country_code in theme['countries']:
-            links.append({
-                "source": country_code,
-                "target": theme['name'],
-                "type": "implements"
-            })
+        # Theme nodes
+        for theme in THEMES_DATA:
+            yield {
+                "id": theme['name'],
+                "name": theme['name'],
+                "type": "theme",
+                "frequency": theme['frequency']
+            }
+    
+    def links():
+        # Links between themes and countries
+        for theme in THEMES_DATA:
+            for country_code in theme['countries']:
+                yield {
+                    "source": country_code,
+                    "target": theme['name'],
+                    "type": "implements"
+                }
     
-    return jsonify({"nodes": nodes, "links": links})
+    return stream_json({"nodes": nodes(), "links": links()})
 
 @app.route('/timeline')
 def timeline():
@@ -4,15 +4,26 @@ African AI Strategies Portal - Main Flask Application
 Interactive web portal for exploring National AI Strategies across Africa
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, redirect, render_template, jsonify, request, url_for
 from flask_cors import CORS
 from flask_moment import Moment
 from werkzeug.middleware.proxy_fix import ProxyFix
-import json
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
 
+from src.analyzer import CrossCuttingAnalyzer
+from src.compression import Compressor, conditional
+from src.geo import resolution_for_zoom
+from src.jobs import JobContext, JobRunner, JobStore
+from src.models import StrategyDatabase
+from src.scoring import parse_weights
+from src.strategy_store import StrategyProvider
+from src.streaming import stream_json
+from src.svg_charts import DEFAULT_SIZE, SVG_CHARTS, ChartSnapshots, snap_size
+from src.visualizer import MIND_MAP_MAX_DEPTH, VisualizationEngine
+
 # Get absolute paths
 BASE_DIR = Path(__file__).parent
 TEMPLATE_DIR = str(BASE_DIR / 'templates')
@@ -24,6 +35,7 @@ app = Flask(__name__,
            static_url_path='/static')
 CORS(app)
 moment = Moment(app)
+compressor = Compressor(app)
 
 # Configure ProxyFix for Vercel deployment
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
@@ -31,6 +43,8 @@ app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 # Configuration
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 app.config['DATA_PATH'] = 'data'
+# Seconds the strategy files' version token is reused before the files are stat-ed again
+app.config['STRATEGY_VERSION_TTL'] = 1.0
 
 # Initialize demo data for Vercel deployment
 def load_demo_data():
@@ -66,14 +80,124 @@ def load_demo_data():
 # Load demo data
 COUNTRIES_DATA, THEMES_DATA = load_demo_data()
 
+_analyzer = None
+
+def get_analyzer() -> CrossCuttingAnalyzer:
+    """Shared analysis engine over the processed strategy data, created on first use"""
+    global _analyzer
+    if _analyzer is None:
+        provider = StrategyProvider(Path(app.config['DATA_PATH']) / 'processed',
+                                    version_ttl=app.config['STRATEGY_VERSION_TTL'])
+        _analyzer = CrossCuttingAnalyzer(data_dir=app.config['DATA_PATH'], provider=provider)
+    return _analyzer
+
+_database = None
+
+def get_database() -> StrategyDatabase:
+    """Strategy database whose writes maintain the materialized dashboard summary"""
+    global _database
+    if _database is None:
+        _database = StrategyDatabase(os.path.join(app.config['DATA_PATH'], 'strategies.db'))
+    return _database
+
+_visualizer = None
+
+def get_visualizer() -> VisualizationEngine:
+    """Visualization engine sharing the analyzer's strategy provider, created on first use"""
+    global _visualizer
+    if _visualizer is None:
+        _visualizer = VisualizationEngine(data_dir=app.config['DATA_PATH'], provider=get_analyzer().strategies)
+    return _visualizer
+
+def run_cross_cutting_job(params, context: JobContext):
+    """Job handler: full cross-cutting analysis, reporting progress per stage"""
+    analysis = get_analyzer().analyze_cross_cutting_themes(
+        countries=params.get('countries'),
+        force=params.get('force', False),
+        progress=context.progress
+    )
+    return {
+        "fingerprint": analysis["fingerprint"],
+        "countries_analyzed": analysis["countries_analyzed"],
+        "total_themes": analysis["total_themes"]
+    }
+
+_chart_snapshots = None
+
+def get_chart_snapshots() -> ChartSnapshots:
+    """Rendered SVG chart cache over the visualization engine, created on first use"""
+    global _chart_snapshots
+    if _chart_snapshots is None:
+        visualizer = get_visualizer()
+        _chart_snapshots = ChartSnapshots(visualizer)
+        # Re-render in the background whenever the strategy files change, starting with the current data
+        visualizer.strategies.add_listener(schedule_chart_prerender)
+        schedule_chart_prerender(_chart_snapshots.version)
+    return _chart_snapshots
+
+def run_prerender_job(params, context: JobContext):
+    """Job handler: render every SVG chart for the current data version in a process pool"""
+    context.progress(0.0, "rendering")
+    return get_chart_snapshots().prerender(workers=params.get('workers', len(SVG_CHARTS)))
+
+JOB_HANDLERS = {
+    "cross_cutting_analysis": run_cross_cutting_job,
+    "prerender_charts": run_prerender_job
+}
+
+_prerendered_version = None
+_prerender_lock = threading.Lock()
+
+def schedule_chart_prerender(version: str):
+    """Queue one bulk pre-render per data version, as soon as the strategy provider reports it"""
+    global _prerendered_version
+    with _prerender_lock:
+        if version == _prerendered_version:
+            return
+        _prerendered_version = version
+    get_job_runner().submit("prerender_charts", {"version": version})
+
+def strategy_files_version() -> str:
+    """Version of the processed strategy files the analyzer and visualizer read"""
+    return get_analyzer().strategies.version
+
+def database_version() -> str:
+    """Version of the strategies table"""
+    return get_database().version
+
+_job_runner = None
+
+def get_job_runner() -> JobRunner:
+    """Background job runner on the strategies database, started on first use"""
+    global _job_runner
+    if _job_runner is None:
+        store = JobStore(os.path.join(app.config['DATA_PATH'], 'strategies.db'))
+        _job_runner = JobRunner(store, JOB_HANDLERS)
+        _job_runner.start()
+    return _job_runner
+
+def analysis_queued():
+    """202 pointing at the queued full analysis; requests never run it inline"""
+    runner = get_job_runner()
+    job_id = runner.submit('cross_cutting_analysis')
+    job = runner.store.get(job_id)
+    response = jsonify({'job_id': job_id, 'status': job['status'], 'status_url': f'/api/jobs/{job_id}'})
+    response.status_code = 202
+    response.headers['Retry-After'] = '1'
+    return response
+
 @app.route('/')
 def index():
     """Main dashboard page"""
-    countries = COUNTRIES_DATA
+    summary = get_database().get_dashboard_summary()
+    countries = [
+        {"code": c["country_code"], "name": c["country"], "status": c["status"]}
+        for c in summary["country_status"]
+    ]
     stats = {
-        'total_countries': len(countries),
-        'total_strategies': len([c for c in countries if c['status'] == 'published']),
-        'last_updated': datetime.now().strftime('%Y-%m-%d')
+        'total_countries': summary['statistics']['total_countries'],
+        'total_strategies': summary['statistics']['published_strategies'],
+        'last_updated': (summary['last_updated'] or '')[:10]
     }
     return render_template('index.html', countries=countries, stats=stats)
 
@@ -119,9 +243,10 @@ def country_detail(country_code):
         return render_template('404.html'), 404
 
 @app.route('/api/countries')
+@conditional(database_version)
 def api_countries():
     """API endpoint for countries list"""
-    return jsonify(COUNTRIES_DATA)
+    return jsonify(get_database().get_all_countries())
 
 @app.route('/api/country/<country_code>/strategy')
 def api_country_strategy(country_code):
@@ -132,8 +257,15 @@ def api_country_strategy(country_code):
     return jsonify({'error': 'Country not found'}), 404
 
 @app.route('/api/cross-cutting')
+@conditional(strategy_files_version)
 def api_cross_cutting():
     """API endpoint for cross-cutting analysis"""
+    analyzer = get_analyzer()
+    if len(analyzer.strategies):
+        analysis = analyzer.load_analysis()
+        return jsonify(analysis) if analysis is not None else analysis_queued()
+    
+    # Demo analysis when no processed strategies are available
     analysis = {
         "analysis_date": datetime.now().isoformat(),
         "countries_analyzed": [c["code"] for c in COUNTRIES_DATA],
@@ -162,10 +294,20 @@ def api_cross_cutting():
     }
     return jsonify(analysis)
 
+def mind_map_depth(default: int) -> int:
+    """Levels to return below and including the requested mind map node"""
+    return min(max(request.args.get('depth', default, type=int), 1), MIND_MAP_MAX_DEPTH)
+
 @app.route('/api/mind-map/<country_code>')
 def api_mind_map(country_code):
-    """API endpoint for mind map data"""
-    if country_code == 'KE':
+    """API endpoint for mind map data; ?path= selects a subtree and ?depth= limits its levels"""
+    path = request.args.get('path', '')
+    mind_map = get_visualizer().get_mind_map(country_code.upper(), path, mind_map_depth(2))
+    if mind_map is not None:
+        return jsonify(mind_map)
+    
+    # Demo tree when no processed strategy is available
+    if country_code == 'KE' and not path:
         mind_map_data = {
             "name": "Kenya AI Strategy",
             "type": "root",
@@ -195,33 +337,110 @@ def api_mind_map(country_code):
         return jsonify(mind_map_data)
     return jsonify({'error': 'Country not found'}), 404
 
+@app.route('/api/mind-map/<country_code>/children')
+def api_mind_map_children(country_code):
+    """API endpoint for the children of one mind map node, fetched on demand"""
+    path = request.args.get('path', '')
+    node = get_visualizer().get_mind_map(country_code.upper(), path, mind_map_depth(1) + 1)
+    if node is None:
+        return jsonify({'error': 'Mind map node not found'}), 404
+    return jsonify({'path': node['path'], 'children': node.get('children', [])})
+
 @app.route('/api/comparison')
 def api_comparison():
-    """API endpoint for country comparison"""
+    """API endpoint for country comparison, with charts for every requested metric (metrics=budget,sectors,...)"""
     countries = request.args.getlist('countries')
     if len(countries) < 2:
         return jsonify({'error': 'At least 2 countries required for comparison'}), 400
     
-    comparison = {
-        "countries": countries,
-        "similarities": {
-            "Priority Sectors": ["Agriculture", "Healthcare", "Education"]
-        },
-        "differences": {
-            country: {
-                "budget": f"USD {100 + i*50} million",
-                "governance": f"Ministry of {['ICT', 'Science', 'Digital'][i % 3]}"
-            } for i, country in enumerate(countries)
-        },
-        "common_themes": ["Skills Development", "Innovation", "Infrastructure"],
-        "collaboration_opportunities": [
-            "Joint AI research initiative",
-            "Shared AI talent development program",
-            "Cross-border AI regulatory harmonization"
-        ]
-    }
+    try:
+        charts = get_visualizer().generate_comparison(countries, list_arg('metrics'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    comparison = {"countries": charts["countries"], "missing": charts["missing"]}
+    if len(charts["countries"]) >= 2:
+        result = get_analyzer().compare_strategies(charts["countries"])
+        comparison.update({
+            "similarities": result.similarities,
+            "differences": result.differences,
+            "common_themes": result.common_themes,
+            "unique_approaches": result.unique_approaches,
+            "collaboration_opportunities": result.collaboration_opportunities
+        })
+    comparison.update({"metrics": charts["metrics"], "charts": charts["charts"]})
     return jsonify(comparison)
 
+@app.route('/api/rankings')
+@conditional(strategy_files_version)
+def api_rankings():
+    """API endpoint for composite AI-readiness rankings"""
+    try:
+        weights = parse_weights(request.args.get('weights'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        "weights": weights,
+        "rankings": get_analyzer().rank_countries(weights)
+    })
+
+@app.route('/api/regions')
+def api_regions():
+    """API endpoint for regional bloc summaries"""
+    return jsonify(get_analyzer().get_regional_rollup().summaries())
+
+@app.route('/api/regions/<region_code>')
+def api_region(region_code):
+    """API endpoint for one regional bloc summary"""
+    try:
+        return jsonify(get_analyzer().get_regional_rollup().region_summary(region_code.upper()))
+    except KeyError:
+        return jsonify({'error': 'Region not found'}), 404
+
+@app.route('/api/map')
+@conditional(strategy_files_version)
+def api_map():
+    """API endpoint for the choropleth map; resolution=low|medium|high, or chosen from zoom"""
+    resolution = request.args.get('resolution') or resolution_for_zoom(request.args.get('zoom', 0, type=float))
+    try:
+        return jsonify(get_analyzer().get_choropleth_map(resolution))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/initiatives/duplicates')
+def api_duplicate_initiatives():
+    """API endpoint for clusters of near-duplicate initiatives"""
+    min_size = request.args.get('min_size', 2, type=int)
+    return stream_json(get_analyzer().find_duplicate_initiatives(max(min_size, 1)))
+
+@app.route('/api/jobs', methods=['POST'])
+def api_submit_job():
+    """API endpoint to queue a background job"""
+    payload = request.get_json(silent=True) or {}
+    kind = payload.get('kind', 'cross_cutting_analysis')
+    if kind not in JOB_HANDLERS:
+        return jsonify({'error': f"Unknown job kind '{kind}'"}), 400
+    
+    job_id = get_job_runner().submit(kind, payload.get('params', {}))
+    return jsonify({'job_id': job_id, 'status_url': f'/api/jobs/{job_id}'}), 202
+
+@app.route('/api/jobs/<job_id>')
+def api_job_status(job_id):
+    """API endpoint for background job status, progress and result"""
+    job = get_job_runner().store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def api_cancel_job(job_id):
+    """API endpoint to cancel a pending or running job"""
+    runner = get_job_runner()
+    if runner.store.get(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({'job_id': job_id, 'cancelled': runner.store.cancel(job_id)})
+
 @app.route('/compare')
 def compare():
     """Strategy comparison page"""
@@ -235,8 +454,13 @@ def analysis():
     return render_template('analysis.html', themes=themes)
 
 @app.route('/api/themes')
+@conditional(strategy_files_version)
 def api_themes():
     """API endpoint for all themes"""
+    analyzer = get_analyzer()
+    if len(analyzer.strategies):
+        themes = analyzer.get_all_themes(compute=False)
+        return jsonify(themes) if themes is not None else analysis_queued()
     return jsonify(THEMES_DATA)
 
 @app.route('/api/search')
@@ -259,8 +483,14 @@ def search():
     return render_template('search.html')
 
 @app.route('/api/network-graph')
+@conditional(strategy_files_version)
 def api_network_graph():
     """API endpoint for network graph data"""
+    visualizer = get_visualizer()
+    if len(visualizer.strategies):
+        return stream_json(visualizer.generate_network_graph())
+    
+    # Demo graph when no processed strategies are available
     graph_data = {
         "nodes": [
             {"id": "KE", "name": "Kenya", "type": "country", "group": 1, "size": 20, "color": "#FF6B35"},
@@ -279,14 +509,92 @@ def api_network_graph():
     }
     return jsonify(graph_data)
 
+@app.route('/api/network-graph/layout')
+def api_network_layout():
+    """API endpoint for the network graph with server-computed node positions"""
+    level = 'overview' if request.args.get('level') == 'overview' else 'full'
+    return stream_json(get_visualizer().generate_network_layout(level))
+
+def network_budgets():
+    """Node/edge budgets from the query string, clamped so payloads stay bounded"""
+    return {
+        'max_nodes': min(max(request.args.get('max_nodes', 150, type=int), 1), 500),
+        'max_edges': min(max(request.args.get('max_edges', 600, type=int), 0), 2000),
+        'top_k': min(max(request.args.get('top_k', 5, type=int), 1), 20)
+    }
+
+@app.route('/api/network-graph/overview')
+def api_network_overview():
+    """API endpoint for the clustered low-zoom network graph"""
+    return stream_json(get_visualizer().generate_network_overview(**network_budgets()))
+
+@app.route('/api/network-graph/clusters/<cluster_id>')
+def api_network_cluster(cluster_id):
+    """API endpoint to expand one cluster of the network overview"""
+    try:
+        return stream_json(get_visualizer().expand_network_cluster(cluster_id, **network_budgets()))
+    except KeyError:
+        return jsonify({'error': 'Cluster not found'}), 404
+
+@app.route('/api/heatmap')
+def api_heatmap():
+    """API endpoint for the country x theme heatmap; encoding=cells|dense|sparse"""
+    try:
+        return stream_json(get_visualizer().stream_theme_heatmap(request.args.get('encoding', 'cells')))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/charts/<chart>.svg')
+def chart_svg(chart):
+    """Static SVG of a chart; unversioned URLs redirect to the current data version, which is cached for a year"""
+    if chart not in SVG_CHARTS:
+        return jsonify({'error': 'Chart not found'}), 404
+    width, height = snap_size(request.args.get('width', DEFAULT_SIZE[0], type=int),
+                              request.args.get('height', DEFAULT_SIZE[1], type=int))
+    
+    snapshots = get_chart_snapshots()
+    version = snapshots.version
+    if request.args.get('v') != version or request.args.get('width', type=int) != width \
+            or request.args.get('height', type=int) != height:
+        response = redirect(url_for('chart_svg', chart=chart, v=version, width=width, height=height))
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    
+    svg, _ = snapshots.render(chart, width, height)
+    response = Response(svg, mimetype='image/svg+xml')
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
 @app.route('/network')
 def network():
     """Network visualization page"""
     return render_template('network.html')
 
+def list_arg(name: str):
+    """Comma-separated query parameter as a list, or None when absent"""
+    value = request.args.get(name)
+    return [item.strip() for item in value.split(',') if item.strip()] if value else None
+
 @app.route('/api/timeline')
+@conditional(strategy_files_version)
 def api_timeline():
-    """API endpoint for timeline data"""
+    """API endpoint for timeline data: ?from=&to=&countries=&types= with offset/limit paging"""
+    visualizer = get_visualizer()
+    if len(visualizer.strategies):
+        countries = list_arg('countries')
+        try:
+            return jsonify(visualizer.query_timeline(
+                start=request.args.get('from'),
+                end=request.args.get('to'),
+                countries=[c.upper() for c in countries] if countries else None,
+                types=list_arg('types'),
+                offset=max(request.args.get('offset', 0, type=int), 0),
+                limit=min(max(request.args.get('limit', 200, type=int), 1), 1000)
+            ))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    
+    # Demo events when no processed strategies are available
     timeline_data = {
         "events": [
             {
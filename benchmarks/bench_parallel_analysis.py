@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark serial vs process-pool cross-cutting analysis on a synthetic corpus
+
+Usage: python benchmarks/bench_parallel_analysis.py [--strategies 2000] [--chunk-size 64] [--workers 1,2,4]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.analyzer import CrossCuttingAnalyzer
+
+WORDS = [
+    "agriculture", "health", "skills", "training", "infrastructure", "broadband", "innovation",
+    "research", "startup", "ethics", "governance", "transparency", "data", "cloud", "youth",
+    "inclusion", "finance", "mobile", "education", "energy", "transport", "manufacturing"
+]
+
+def build_corpus(data_dir: Path, n_strategies: int, n_themes: int, seed: int = 7):
+    """Write a synthetic corpus of sub-national and sector strategies"""
+    rng = random.Random(seed)
+    themes = [f"Theme {i:03d}" for i in range(n_themes)] + [
+        "Skills Development", "Innovation", "Infrastructure", "Agriculture", "Healthcare", "Ethics"
+    ]
+    processed_dir = data_dir / "processed"
+    processed_dir.mkdir(parents=True, exist_ok=True)
+
+    for i in range(n_strategies):
+        strategy = {
+            "country_code": f"S{i:05d}",
+            "country_name": f"Strategy {i}",
+            "themes": rng.sample(themes, 25),
+            "priority_sectors": rng.sample(themes, 8),
+            "objectives": [" ".join(rng.choices(WORDS, k=12)) for _ in range(20)],
+            "key_initiatives": [
+                {
+                    "name": " ".join(rng.choices(WORDS, k=4)).title(),
+                    "description": " ".join(rng.choices(WORDS, k=60)),
+                    "budget": f"USD {rng.randint(1, 200)} million"
+                }
+                for _ in range(40)
+            ]
+        }
+        with open(processed_dir / f"strategy_S{i:05d}.json", "w") as f:
+            json.dump(strategy, f)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--strategies", type=int, default=2000)
+    parser.add_argument("--themes", type=int, default=300)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", help="comma-separated worker counts (default: powers of two up to CPU count)")
+    args = parser.parse_args()
+
+    cpu_count = os.cpu_count() or 1
+    if args.workers:
+        worker_counts = sorted({1} | {int(w) for w in args.workers.split(",")})
+    else:
+        worker_counts = sorted({1, 2, 4, 8, 16, cpu_count} & set(range(1, cpu_count + 1)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_corpus(Path(tmp), args.strategies, args.themes)
+        analyzer = CrossCuttingAnalyzer(data_dir=tmp)
+
+        print(f"{args.strategies} strategies, chunk size {args.chunk_size}, {cpu_count} CPUs")
+        print(f"{'workers':>8} {'best (s)':>10} {'speedup':>8} {'identical':>10}")
+
+        baseline_time = None
+        baseline_result = None
+        for workers in worker_counts:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                result = analyzer.analyze_cross_cutting_themes(
+                    workers=workers, chunk_size=args.chunk_size, force=True
+                )
+                timings.append(time.perf_counter() - start)
+
+            best = min(timings)
+            if baseline_time is None:
+                baseline_time, baseline_result = best, result
+            identical = json.dumps(result, sort_keys=True) == json.dumps(baseline_result, sort_keys=True)
+            print(f"{workers:>8} {best:>10.3f} {baseline_time / best:>7.2f}x {str(identical):>10}")
+
+if __name__ == "__main__":
+    main()
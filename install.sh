@@ -38,6 +38,10 @@ db = StrategyDatabase()
 print('✓ Database initialized successfully')
 "
 
+# Precompute simplified map topologies
+echo "🗺️ Precomputing map topologies..."
+python3 -m src.geo
+
 # Load initial data
 echo "📊 Loading initial data..."
 python3 -c "
@@ -3,15 +3,35 @@ Cross-cutting analysis engine for African AI Strategies Portal
 """
 
 import json
+import hashlib
+import os
 from collections import Counter, defaultdict
-from typing import Dict, List, Any, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import lru_cache
+from typing import Callable, Dict, List, Any, Optional, Set, Tuple
 from pathlib import Path
 import numpy as np
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import logging
 
+from src.comparison import ComparisonResult, StrategyComparator
+from src.dedup import InitiativeDeduplicator
+from src.features import extract_strategy_themes
+from src.geo import ChoroplethMap
+from src.itemsets import ItemsetMiner
+from src.regions import RegionHierarchy, RegionalRollup
+from src.scoring import ReadinessScorer
+from src.strategy_store import StrategyProvider
+from src.text_similarity import StrategyTextIndex
+from src.theme_clustering import ThemeCategorizer
+from src.trends import TrendCube
+
 logger = logging.getLogger(__name__)
 
+# Called as progress(fraction_done, stage) by long-running analyses
+ProgressCallback = Callable[[float, str], None]
+
 @dataclass
 class ThemeAnalysis:
     """Analysis results for a specific theme"""
@@ -22,30 +42,138 @@ class ThemeAnalysis:
     related_themes: List[str]
     key_initiatives: List[Dict[str, Any]]
     common_approaches: List[str]
+    initiative_count: int = 0
 
 @dataclass
-class ComparisonResult:
-    """Results of comparing strategies between countries"""
-    countries: List[str]
-    similarities: Dict[str, List[str]]
-    differences: Dict[str, Dict[str, Any]]
-    common_themes: List[str]
-    unique_approaches: Dict[str, List[str]]
-    collaboration_opportunities: List[str]
+class ThemeCounts:
+    """Partial theme statistics for a shard of strategies, merged in the reduce step"""
+    country_themes: Dict[str, List[str]] = field(default_factory=dict)
+    theme_countries: Dict[str, List[str]] = field(default_factory=lambda: defaultdict(list))
+    co_occurrence: Dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+    theme_initiatives: Dict[str, Dict[str, List[Dict[str, Any]]]] = field(default_factory=lambda: defaultdict(dict))
+    
+    def merge(self, other: 'ThemeCounts') -> 'ThemeCounts':
+        """Fold another shard's counts into this one"""
+        self.country_themes.update(other.country_themes)
+        for theme, countries in other.theme_countries.items():
+            self.theme_countries[theme].extend(countries)
+        for theme, counts in other.co_occurrence.items():
+            self.co_occurrence[theme].update(counts)
+        for theme, by_country in other.theme_initiatives.items():
+            self.theme_initiatives[theme].update(by_country)
+        return self
+
+THEME_KEYWORDS = {
+    'Skills Development': ['skill', 'training', 'education', 'capacity'],
+    'Innovation': ['innovation', 'research', 'development', 'startup'],
+    'Infrastructure': ['infrastructure', 'connectivity', 'broadband', 'network'],
+    'Agriculture': ['agriculture', 'farming', 'crop', 'livestock'],
+    'Healthcare': ['health', 'medical', 'hospital', 'diagnosis'],
+    'Ethics': ['ethics', 'responsible', 'governance', 'transparency']
+}
+
+MAX_THEME_INITIATIVES = 10
+
+ANALYSIS_FILE = "cross_cutting_analysis.json"
+
+# Analyses of a country subset are stored beside the full one, one file per fingerprint
+SUBSET_ANALYSIS_PATTERN = "cross_cutting_analysis.{fingerprint}.json"
+MAX_SUBSET_ANALYSES = 32
+
+# Every module whose code shapes the stored analysis, including those imported along the way
+ANALYSIS_MODULES = ("analyzer.py", "dedup.py", "features.py", "itemsets.py", "text_similarity.py",
+                    "theme_clustering.py")
+
+@lru_cache(maxsize=1)
+def analysis_code_version() -> str:
+    """Hash of the analysis source, so code changes invalidate stored results"""
+    digest = hashlib.sha256()
+    for module_name in ANALYSIS_MODULES:
+        digest.update((Path(__file__).parent / module_name).read_bytes())
+    return digest.hexdigest()[:16]
+
+def validate_chunk_size(chunk_size: int) -> int:
+    """Strategies per shard for parallel counting; raise ValueError unless at least 1"""
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    return chunk_size
+
+def initiative_matches_theme(initiative: Dict[str, Any], theme: str) -> bool:
+    """Check if an initiative matches a theme"""
+    text = f"{initiative.get('name', '')} {initiative.get('description', '')}".lower()
+    keywords = THEME_KEYWORDS.get(theme, [theme.lower()])
+    return any(keyword in text for keyword in keywords)
+
+def count_strategy_features(shard: List[Tuple[str, Dict[str, Any]]]) -> ThemeCounts:
+    """Map step: extract themes and theme-matched initiatives for a shard of strategies
+    
+    Kept at module level so it can be shipped to process pool workers.
+    """
+    counts = ThemeCounts()
+    
+    for country, strategy in shard:
+        themes = sorted(extract_strategy_themes(strategy))
+        counts.country_themes[country] = themes
+        
+        for theme in themes:
+            counts.theme_countries[theme].append(country)
+            counts.co_occurrence[theme].update(t for t in themes if t != theme)
+            
+            matches = []
+            for i, initiative in enumerate(strategy.get('key_initiatives', [])):
+                if initiative_matches_theme(initiative, theme):
+                    matches.append({
+                        "id": f"{country}:{i}",
+                        "country": country,
+                        "name": initiative.get('name', ''),
+                        "description": initiative.get('description', ''),
+                        "budget": initiative.get('budget', 'Not specified')
+                    })
+                    if len(matches) >= MAX_THEME_INITIATIVES:
+                        break
+            counts.theme_initiatives[theme][country] = matches
+    
+    return counts
 
 class CrossCuttingAnalyzer:
     """Analyzes cross-cutting themes and patterns across AI strategies"""
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", workers: int = 1, chunk_size: int = 16,
+                 provider: StrategyProvider = None):
         self.data_dir = Path(data_dir)
         self.processed_dir = self.data_dir / "processed"
         self.analysis_dir = self.data_dir / "analysis"
         
+        # Parallel mode: shard strategies across a process pool when workers > 1
+        self.workers = workers
+        self.chunk_size = validate_chunk_size(chunk_size)
+        
         # Ensure analysis directory exists
         self.analysis_dir.mkdir(parents=True, exist_ok=True)
         
-        # Load strategy data
-        self.strategies = self._load_all_strategies()
+        # Index strategy data; files are parsed on first access
+        self.strategies = provider if provider is not None else self._load_all_strategies()
+        
+        # Per-country feature bitsets and memoized comparisons
+        self.comparator = StrategyComparator()
+        
+        # Composite readiness scores, sharing the comparator's per-country features
+        self.scorer = ReadinessScorer(self.comparator)
+        
+        # MinHash/LSH clusters of near-duplicate initiatives across strategies
+        self.deduplicator = InitiativeDeduplicator()
+        
+        # Free-text TF-IDF index, filled lazily and refreshed per changed strategy
+        self.text_index = StrategyTextIndex()
+        
+        # Views built on first use and rebuilt when the data version changes
+        self._regional_rollup: Optional[RegionalRollup] = None
+        self._regions_version: Optional[str] = None
+        self._choropleth: Optional[ChoroplethMap] = None
+        self._trend_cube: Optional[TrendCube] = None
+        self._trend_version: Optional[str] = None
+        self._all_themes_fingerprint: Optional[str] = None
+        self._all_themes_cache: List[Dict[str, Any]] = []
         
         # Define theme categories for analysis
         self.theme_categories = {
@@ -70,64 +198,81 @@ class CrossCuttingAnalyzer:
                 "Rural Development", "Poverty Reduction", "Digital Divide"
             ]
         }
-    
-    def _load_all_strategies(self) -> Dict[str, Dict[str, Any]]:
-        """Load all processed strategy data"""
-        strategies = {}
         
+        # Seeded theme clustering; the theme -> category map is cached per theme incidence
+        self.theme_categorizer = ThemeCategorizer(self.theme_categories)
+    
+    def _load_all_strategies(self) -> StrategyProvider:
+        """Create a lazy provider over processed strategy data"""
         if not self.processed_dir.exists():
             logger.warning("Processed data directory not found")
-            return strategies
-        
-        for strategy_file in self.processed_dir.glob("strategy_*.json"):
-            try:
-                country_code = strategy_file.stem.split("_")[1]
-                with open(strategy_file, 'r') as f:
-                    strategies[country_code] = json.load(f)
-            except Exception as e:
-                logger.error(f"Error loading strategy file {strategy_file}: {e}")
         
-        return strategies
+        return StrategyProvider(self.processed_dir)
     
-    def analyze_cross_cutting_themes(self, countries: List[str] = None) -> Dict[str, Any]:
-        """Analyze themes that appear across multiple countries"""
-        if countries is None:
-            countries = list(self.strategies.keys())
-        
-        # Extract themes from each country
-        country_themes = {}
-        all_themes = set()
-        
-        for country in countries:
-            if country in self.strategies:
-                strategy = self.strategies[country]
-                themes = self._extract_themes_from_strategy(strategy)
-                country_themes[country] = themes
-                all_themes.update(themes)
+    def analyze_cross_cutting_themes(self, countries: List[str] = None, workers: int = None,
+                                     chunk_size: int = None, force: bool = False,
+                                     progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """Analyze themes that appear across multiple countries
+        
+        Results are stored with a fingerprint of their inputs; when the stored
+        fingerprint matches, the saved analysis is returned without recomputing.
+        A run over a subset of countries is stored under its own fingerprint,
+        so it never replaces the full-corpus analysis. progress, if given, is
+        called with the fraction done and the stage name.
+        """
+        report = progress or (lambda fraction, stage: None)
+        chunk_size = validate_chunk_size(chunk_size if chunk_size is not None else self.chunk_size)
+        subset = countries is not None
+        countries = sorted(set(countries)) if subset else list(self.strategies.keys())
+        
+        report(0.0, "fingerprint")
+        fingerprint = self.input_fingerprint(countries)
+        if not force:
+            stored = self.load_analysis(fingerprint)
+            if stored is not None:
+                report(1.0, "cached")
+                return stored
+        
+        # Extract themes from each country (map), then merge partial counts (reduce)
+        counts = self._count_features(
+            [c for c in countries if c in self.strategies],
+            workers if workers is not None else self.workers,
+            chunk_size,
+            progress=lambda done: report(0.05 + 0.6 * done, "counting")
+        )
+        country_themes = {country: set(themes) for country, themes in counts.country_themes.items()}
+        report(0.65, "deduplicating")
+        self._sync_deduplicator()
+        all_themes = sorted(counts.theme_countries.keys())
         
+        report(0.75, "themes")
         # Analyze theme frequency and co-occurrence
         theme_analysis = {}
         for theme in all_themes:
-            countries_with_theme = [c for c, themes in country_themes.items() if theme in themes]
+            countries_with_theme = counts.theme_countries[theme]
+            initiatives = self._extract_theme_initiatives(theme, countries_with_theme, counts)
             
             theme_analysis[theme] = ThemeAnalysis(
                 theme_name=theme,
                 countries=countries_with_theme,
                 frequency=len(countries_with_theme),
                 percentage=(len(countries_with_theme) / len(countries)) * 100,
-                related_themes=self._find_related_themes(theme, country_themes),
-                key_initiatives=self._extract_theme_initiatives(theme, countries_with_theme),
-                common_approaches=self._identify_common_approaches(theme, countries_with_theme)
+                related_themes=self._find_related_themes(theme, counts.co_occurrence),
+                key_initiatives=initiatives[:MAX_THEME_INITIATIVES],  # Top 10
+                common_approaches=self._identify_common_approaches(theme, countries_with_theme),
+                initiative_count=len(initiatives)
             )
         
         # Group by categories
+        report(0.85, "categorizing")
         categorized_themes = self._categorize_themes(theme_analysis)
         
         # Generate insights
         insights = self._generate_cross_cutting_insights(theme_analysis, country_themes)
         
         analysis_result = {
-            "analysis_date": "2024-06-19",
+            "fingerprint": fingerprint,
+            "analysis_date": date.today().isoformat(),
             "countries_analyzed": countries,
             "total_themes": len(all_themes),
             "theme_analysis": {theme: {
@@ -136,105 +281,127 @@ class CrossCuttingAnalyzer:
                 "percentage": round(analysis.percentage, 1),
                 "related_themes": analysis.related_themes[:5],  # Top 5
                 "key_initiatives": analysis.key_initiatives[:3],  # Top 3
+                "initiative_count": analysis.initiative_count,
                 "common_approaches": analysis.common_approaches
             } for theme, analysis in theme_analysis.items()},
             "categorized_themes": categorized_themes,
             "insights": insights,
-            "collaboration_opportunities": self._identify_collaboration_opportunities(country_themes)
+            "collaboration_opportunities": self._identify_collaboration_opportunities(country_themes),
+            "collaboration_groups": self._identify_collaboration_groups(country_themes)
         }
         
-        # Save analysis results
-        with open(self.analysis_dir / "cross_cutting_analysis.json", "w") as f:
-            json.dump(analysis_result, f, indent=2)
+        # Save analysis results; write-then-rename so readers never see a partial file
+        report(0.95, "saving")
+        self._save_analysis(analysis_result, subset)
         
+        report(1.0, "done")
         return analysis_result
     
+    def input_fingerprint(self, countries: List[str] = None) -> str:
+        """Fingerprint of everything the analysis output depends on; the order of countries does not matter"""
+        countries = sorted(set(countries if countries is not None else self.strategies.keys()))
+        
+        inputs = {
+            "code_version": analysis_code_version(),
+            "countries": countries,
+            "strategies": {c: self.strategies.content_hash(c) for c in countries if c in self.strategies},
+            "theme_categories": self.theme_categories,
+            "theme_keywords": THEME_KEYWORDS
+        }
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+    
+    def load_analysis(self, fingerprint: str = None) -> Dict[str, Any]:
+        """Read stored analysis if it was computed from the current inputs"""
+        if fingerprint is None:
+            fingerprint = self.input_fingerprint()
+        
+        for path in (self.analysis_dir / ANALYSIS_FILE,
+                     self.analysis_dir / SUBSET_ANALYSIS_PATTERN.format(fingerprint=fingerprint)):
+            try:
+                with open(path, "r") as f:
+                    stored = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            if stored.get("fingerprint") == fingerprint:
+                return stored
+        return None
+    
+    def _save_analysis(self, analysis_result: Dict[str, Any], subset: bool):
+        """Write an analysis; write-then-rename so readers never see a partial file"""
+        if subset:
+            name = SUBSET_ANALYSIS_PATTERN.format(fingerprint=analysis_result["fingerprint"])
+        else:
+            name = ANALYSIS_FILE
+        tmp_path = self.analysis_dir / f"{name}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(analysis_result, f, indent=2)
+        os.replace(tmp_path, self.analysis_dir / name)
+        
+        if subset:
+            # Keep only the most recently written subset analyses
+            stored = sorted(self.analysis_dir.glob(SUBSET_ANALYSIS_PATTERN.format(fingerprint="*")),
+                            key=lambda p: p.stat().st_mtime_ns, reverse=True)
+            for path in stored[MAX_SUBSET_ANALYSES:]:
+                path.unlink(missing_ok=True)
+    
+    def _count_features(self, countries: List[str], workers: int, chunk_size: int,
+                        progress: Callable[[float], None] = None) -> ThemeCounts:
+        """Shard strategies, extract features per shard and merge the partial counts"""
+        order = {country: i for i, country in enumerate(countries)}
+        items = [(country, self.strategies[country]) for country in countries]
+        shards = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        
+        counts = ThemeCounts()
+        if workers > 1 and len(shards) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for done, partial in enumerate(executor.map(count_strategy_features, shards), start=1):
+                    counts.merge(partial)
+                    if progress:
+                        progress(done / len(shards))
+        else:
+            for done, shard in enumerate(shards, start=1):
+                counts.merge(count_strategy_features(shard))
+                if progress:
+                    progress(done / len(shards))
+        
+        # Shards may complete in any order; restore the requested country order
+        for theme_countries in counts.theme_countries.values():
+            theme_countries.sort(key=order.get)
+        counts.country_themes = {c: counts.country_themes[c] for c in countries}
+        
+        return counts
+    
     def _extract_themes_from_strategy(self, strategy: Dict[str, Any]) -> Set[str]:
         """Extract themes from a strategy document"""
-        themes = set()
-        
-        # Extract from explicit themes field
-        if 'themes' in strategy:
-            themes.update(strategy['themes'])
-        
-        # Extract from strategic pillars
-        if 'strategic_pillars' in strategy:
-            for pillar in strategy['strategic_pillars']:
-                themes.add(pillar.get('name', ''))
-        
-        # Extract from priority sectors
-        if 'priority_sectors' in strategy:
-            if isinstance(strategy['priority_sectors'], list):
-                for sector in strategy['priority_sectors']:
-                    if isinstance(sector, dict):
-                        themes.add(sector.get('name', ''))
-                    else:
-                        themes.add(str(sector))
-        
-        # Extract from objectives
-        if 'objectives' in strategy:
-            for obj in strategy['objectives']:
-                # Simple keyword extraction
-                if 'skill' in obj.lower() or 'talent' in obj.lower():
-                    themes.add('Skills Development')
-                if 'infrastructure' in obj.lower():
-                    themes.add('Infrastructure')
-                if 'innovation' in obj.lower():
-                    themes.add('Innovation')
-                if 'ethics' in obj.lower() or 'responsible' in obj.lower():
-                    themes.add('Ethics')
-        
-        # Remove empty themes
-        themes.discard('')
-        
-        return themes
-    
-    def _find_related_themes(self, target_theme: str, country_themes: Dict[str, Set[str]]) -> List[str]:
+        return extract_strategy_themes(strategy)
+    
+    def _find_related_themes(self, target_theme: str, co_occurrence: Dict[str, Counter]) -> List[str]:
         """Find themes that frequently co-occur with the target theme"""
-        co_occurrence = Counter()
-        
-        for country, themes in country_themes.items():
-            if target_theme in themes:
-                for theme in themes:
-                    if theme != target_theme:
-                        co_occurrence[theme] += 1
-        
-        return [theme for theme, count in co_occurrence.most_common(10)]
+        ranked = sorted(co_occurrence.get(target_theme, {}).items(), key=lambda item: (-item[1], item[0]))
+        return [theme for theme, count in ranked[:10]]
     
-    def _extract_theme_initiatives(self, theme: str, countries: List[str]) -> List[Dict[str, Any]]:
-        """Extract key initiatives related to a specific theme"""
+    def _extract_theme_initiatives(self, theme: str, countries: List[str], counts: ThemeCounts) -> List[Dict[str, Any]]:
+        """Collect initiatives related to a theme, one entry per near-duplicate cluster"""
         initiatives = []
+        by_cluster = {}
         
         for country in countries:
-            if country in self.strategies:
-                strategy = self.strategies[country]
-                if 'key_initiatives' in strategy:
-                    for initiative in strategy['key_initiatives']:
-                        # Simple matching based on keywords
-                        if self._initiative_matches_theme(initiative, theme):
-                            initiatives.append({
-                                "country": country,
-                                "name": initiative.get('name', ''),
-                                "description": initiative.get('description', ''),
-                                "budget": initiative.get('budget', 'Not specified')
-                            })
-        
-        return initiatives[:10]  # Return top 10
+            for initiative in counts.theme_initiatives[theme].get(country, []):
+                cluster_id = self.deduplicator.cluster_of(initiative["id"])
+                if cluster_id in by_cluster:
+                    entry = by_cluster[cluster_id]
+                    if country not in entry["countries"]:
+                        entry["countries"].append(country)
+                    continue
+                entry = dict(initiative, cluster_id=cluster_id, countries=[country])
+                by_cluster[cluster_id] = entry
+                initiatives.append(entry)
+        
+        return initiatives
     
     def _initiative_matches_theme(self, initiative: Dict[str, Any], theme: str) -> bool:
         """Check if an initiative matches a theme"""
-        text = f"{initiative.get('name', '')} {initiative.get('description', '')}".lower()
-        theme_keywords = {
-            'Skills Development': ['skill', 'training', 'education', 'capacity'],
-            'Innovation': ['innovation', 'research', 'development', 'startup'],
-            'Infrastructure': ['infrastructure', 'connectivity', 'broadband', 'network'],
-            'Agriculture': ['agriculture', 'farming', 'crop', 'livestock'],
-            'Healthcare': ['health', 'medical', 'hospital', 'diagnosis'],
-            'Ethics': ['ethics', 'responsible', 'governance', 'transparency']
-        }
-        
-        keywords = theme_keywords.get(theme, [theme.lower()])
-        return any(keyword in text for keyword in keywords)
+        return initiative_matches_theme(initiative, theme)
     
     def _identify_common_approaches(self, theme: str, countries: List[str]) -> List[str]:
         """Identify common approaches for implementing a theme"""
@@ -264,27 +431,10 @@ class CrossCuttingAnalyzer:
         return approach_mapping.get(theme, ['Policy development', 'Stakeholder engagement'])
     
     def _categorize_themes(self, theme_analysis: Dict[str, ThemeAnalysis]) -> Dict[str, List[str]]:
-        """Categorize themes into predefined categories"""
-        categorized = {category: [] for category in self.theme_categories.keys()}
-        uncategorized = []
-        
-        for theme_name in theme_analysis.keys():
-            categorized_flag = False
-            for category, category_themes in self.theme_categories.items():
-                if any(cat_theme.lower() in theme_name.lower() or 
-                      theme_name.lower() in cat_theme.lower() 
-                      for cat_theme in category_themes):
-                    categorized[category].append(theme_name)
-                    categorized_flag = True
-                    break
-            
-            if not categorized_flag:
-                uncategorized.append(theme_name)
-        
-        if uncategorized:
-            categorized['Other'] = uncategorized
-        
-        return categorized
+        """Categorize themes by clustering them around the predefined categories"""
+        return self.theme_categorizer.categorize(
+            {theme: analysis.countries for theme, analysis in theme_analysis.items()}
+        )
     
     def _generate_cross_cutting_insights(self, theme_analysis: Dict[str, ThemeAnalysis], 
                                        country_themes: Dict[str, Set[str]]) -> List[str]:
@@ -333,6 +483,21 @@ class CrossCuttingAnalyzer:
         
         return sorted(opportunities, key=lambda x: len(x["countries"]), reverse=True)[:10]
     
+    def _identify_collaboration_groups(self, country_themes: Dict[str, Set[str]], min_support: float = 0.3,
+                                       max_size: int = 4, limit: int = 20) -> List[Dict[str, Any]]:
+        """Identify groups of countries sharing a whole set of themes and sectors"""
+        itemsets = ItemsetMiner(country_themes).mine(min_support=min_support, max_size=max_size, min_size=2)
+        return [itemset.to_dict() for itemset in itemsets[:limit]]
+    
+    def find_collaboration_groups(self, countries: List[str] = None, min_support: float = 0.3,
+                                  max_size: int = 4, limit: int = 20) -> List[Dict[str, Any]]:
+        """Mine multi-theme collaboration groups with custom support and size limits"""
+        if countries is None:
+            countries = list(self.strategies.keys())
+        
+        counts = self._count_features([c for c in countries if c in self.strategies], self.workers, self.chunk_size)
+        return self._identify_collaboration_groups(counts.country_themes, min_support, max_size, limit)
+    
     def _suggest_collaboration_type(self, theme: str) -> str:
         """Suggest type of collaboration based on theme"""
         collaboration_types = {
@@ -346,122 +511,103 @@ class CrossCuttingAnalyzer:
         
         return collaboration_types.get(theme, 'Policy coordination and best practice sharing')
     
+    def _data_version(self) -> Optional[str]:
+        """Version token of the strategy data, or None when it is not tracked"""
+        return getattr(self.strategies, 'version', None)
+    
     def compare_strategies(self, countries: List[str]) -> ComparisonResult:
         """Compare AI strategies between specified countries"""
-        if len(countries) < 2:
-            raise ValueError("At least 2 countries required for comparison")
+        return self.comparator.compare(self.strategies, countries, version=self._data_version())
+    
+    def rank_countries(self, weights: Dict[str, float] = None) -> List[Dict[str, Any]]:
+        """Rank countries by composite AI-readiness score for a weight profile"""
+        return self.scorer.rank(self.strategies, weights, version=self._data_version())
+    
+    def get_regional_rollup(self) -> RegionalRollup:
+        """Regional aggregates, updated only for strategies that changed since the last call"""
+        if self._regional_rollup is None:
+            self._regional_rollup = RegionalRollup(RegionHierarchy.load(), self.comparator)
         
-        # Extract data for comparison
-        comparison_data = {}
-        for country in countries:
-            if country in self.strategies:
-                comparison_data[country] = self.strategies[country]
-        
-        # Find similarities and differences
-        similarities = self._find_similarities(comparison_data)
-        differences = self._find_differences(comparison_data)
-        common_themes = self._find_common_themes(comparison_data)
-        unique_approaches = self._find_unique_approaches(comparison_data)
-        collaboration_opportunities = self._suggest_bilateral_collaboration(comparison_data)
-        
-        result = ComparisonResult(
-            countries=countries,
-            similarities=similarities,
-            differences=differences,
-            common_themes=common_themes,
-            unique_approaches=unique_approaches,
-            collaboration_opportunities=collaboration_opportunities
-        )
+        version = self._data_version()
+        if version is None or self._regions_version != version:
+            self._regional_rollup.sync(self.strategies)
+            self._regions_version = version
         
-        return result
-    
-    def _find_similarities(self, comparison_data: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
-        """Find similarities between strategies"""
-        similarities = defaultdict(list)
-        
-        # Compare priority sectors
-        all_sectors = set()
-        country_sectors = {}
-        for country, strategy in comparison_data.items():
-            sectors = set()
-            if 'priority_sectors' in strategy:
-                for sector in strategy['priority_sectors']:
-                    if isinstance(sector, dict):
-                        sectors.add(sector.get('name', ''))
-                    else:
-                        sectors.add(str(sector))
-            country_sectors[country] = sectors
-            all_sectors.update(sectors)
-        
-        common_sectors = all_sectors
-        for sectors in country_sectors.values():
-            common_sectors = common_sectors.intersection(sectors)
-        
-        if common_sectors:
-            similarities['Priority Sectors'] = list(common_sectors)
-        
-        return dict(similarities)
-    
-    def _find_differences(self, comparison_data: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
-        """Find key differences between strategies"""
-        differences = {}
-        
-        for country, strategy in comparison_data.items():
-            differences[country] = {
-                'budget': strategy.get('funding_strategy', {}).get('total_budget', 'Not specified'),
-                'timeline': strategy.get('implementation_timeline', {}),
-                'governance': strategy.get('governance_structure', {}).get('steering_committee', {}).get('chair', 'Not specified')
+        return self._regional_rollup
+    
+    def get_choropleth_map(self, resolution: str) -> Dict[str, Any]:
+        """Country boundaries at a map resolution, joined with strategy status, themes and readiness score"""
+        if self._choropleth is None:
+            self._choropleth = ChoroplethMap()
+        return self._choropleth.render(resolution, self._map_values, version=self._data_version())
+    
+    def _map_values(self) -> Dict[str, Dict[str, Any]]:
+        scores = {entry["country_code"]: entry["score"] for entry in self.rank_countries()}
+        values = {}
+        for code in sorted(self.strategies.keys()):
+            features = self.comparator.country_entry(self.strategies, code).features
+            values[code] = {
+                "status": features.status or "unknown",
+                "themes": sorted(features.themes),
+                "theme_count": len(features.themes),
+                "score": scores.get(code)
             }
-        
-        return differences
+        return values
     
-    def _find_common_themes(self, comparison_data: Dict[str, Dict[str, Any]]) -> List[str]:
-        """Find themes common to all compared countries"""
-        all_themes = []
-        for country, strategy in comparison_data.items():
-            themes = self._extract_themes_from_strategy(strategy)
-            all_themes.append(themes)
-        
-        if all_themes:
-            common_themes = all_themes[0]
-            for themes in all_themes[1:]:
-                common_themes = common_themes.intersection(themes)
-            return list(common_themes)
-        
-        return []
+    def _sync_deduplicator(self) -> InitiativeDeduplicator:
+        """Bring the near-duplicate index up to date with the loaded strategies"""
+        self.deduplicator.sync(self.strategies)
+        return self.deduplicator
     
-    def _find_unique_approaches(self, comparison_data: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
-        """Find unique approaches for each country"""
-        unique_approaches = {}
-        
-        for country, strategy in comparison_data.items():
-            approaches = []
-            
-            # Extract unique initiatives
-            if 'key_initiatives' in strategy:
-                for initiative in strategy['key_initiatives'][:3]:  # Top 3
-                    approaches.append(initiative.get('name', ''))
-            
-            unique_approaches[country] = approaches
-        
-        return unique_approaches
+    def find_duplicate_initiatives(self, min_size: int = 2) -> List[Dict[str, Any]]:
+        """Clusters of near-duplicate initiatives across strategies"""
+        return self._sync_deduplicator().clusters(min_size)
     
-    def _suggest_bilateral_collaboration(self, comparison_data: Dict[str, Dict[str, Any]]) -> List[str]:
-        """Suggest collaboration opportunities between countries"""
-        suggestions = []
-        
-        countries = list(comparison_data.keys())
-        if len(countries) >= 2:
-            suggestions.append(f"Joint AI research initiative between {' and '.join(countries)}")
-            suggestions.append(f"Shared AI talent development program")
-            suggestions.append(f"Cross-border AI regulatory harmonization")
-        
-        return suggestions
+    def _sync_text_index(self) -> StrategyTextIndex:
+        """Bring the TF-IDF index up to date with the loaded strategies"""
+        self.text_index.sync(self.strategies)
+        return self.text_index
+    
+    def find_similar_strategies(self, country: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Find strategies whose vision, objectives and initiatives read most alike"""
+        return self._sync_text_index().similar_strategies(country, top_k)
+    
+    def find_similar_initiatives(self, country: str, initiative_index: int, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Find initiatives in other countries that are described most alike"""
+        return self._sync_text_index().similar_initiatives(f"{country}:{initiative_index}", top_k)
+    
+    def text_similarity_matrix(self, countries: List[str] = None) -> Dict[str, Any]:
+        """Pairwise free-text similarity between strategies"""
+        return self._sync_text_index().strategy_similarity_matrix(countries)
+    
+    def search_text(self, query: str, top_k: int = 5) -> Dict[str, List[Dict[str, Any]]]:
+        """Rank strategies and initiatives against a free-text query"""
+        return self._sync_text_index().search(query, top_k)
+    
+    def get_trend_cube(self) -> TrendCube:
+        """Year-bucketed trend cubes, rebuilt only when the strategy data changes"""
+        version = self._data_version()
+        if version is None or self._trend_version != version:
+            self._trend_cube = TrendCube(self.strategies)
+            self._trend_version = version
+        
+        return self._trend_cube
+    
+    def get_trends(self, measure: str, members: List[str] = None, start_year: int = None,
+                   end_year: int = None, cumulative: bool = False, rollup: bool = False) -> Dict[str, Any]:
+        """Slice (or roll up across members) one trend measure"""
+        cube = self.get_trend_cube()
+        query = cube.rollup if rollup else cube.slice
+        return query(measure, members, start_year, end_year, cumulative)
     
-    def get_all_themes(self) -> List[Dict[str, Any]]:
-        """Get all identified themes with metadata"""
-        if not hasattr(self, '_all_themes_cache'):
-            analysis = self.analyze_cross_cutting_themes()
+    def get_all_themes(self, compute: bool = True) -> Optional[List[Dict[str, Any]]]:
+        """Get all identified themes with metadata; None if compute is False and no current analysis is stored"""
+        fingerprint = self.input_fingerprint()
+        if self._all_themes_fingerprint != fingerprint:
+            analysis = self.analyze_cross_cutting_themes() if compute else self.load_analysis(fingerprint)
+            if analysis is None:
+                return None
+            self._all_themes_fingerprint = analysis["fingerprint"]
             self._all_themes_cache = [
                 {
                     "name": theme,
@@ -0,0 +1,255 @@
+"""
+Strategy comparison engine for African AI Strategies Portal
+N-way comparison of country strategies over cached feature bitsets
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import Dict, List, Any, Optional, Tuple
+import logging
+
+from src.features import CountryFeatures, country_features, format_period
+
+logger = logging.getLogger(__name__)
+
+FEATURE_KINDS = ("themes", "sectors", "partners", "initiatives")
+
+@dataclass
+class ComparisonResult:
+    """Results of comparing strategies between countries"""
+    countries: List[str]
+    similarities: Dict[str, List[str]]
+    differences: Dict[str, Dict[str, Any]]
+    common_themes: List[str]
+    unique_approaches: Dict[str, List[str]]
+    collaboration_opportunities: List[str]
+    unique_features: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)
+    pairwise: List[Dict[str, Any]] = field(default_factory=list)
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+class FeatureBitsets:
+    """Append-only vocabularies assigning every feature value a bit position
+    
+    Bits are never reassigned, so masks computed for one country stay valid
+    as other countries add new values to the vocabulary. Values that no
+    country holds any more are dropped by building a fresh vocabulary.
+    """
+    
+    def __init__(self):
+        self._bits: Dict[str, Dict[str, int]] = {kind: {} for kind in FEATURE_KINDS}
+        self._values: Dict[str, List[str]] = {kind: [] for kind in FEATURE_KINDS}
+    
+    def encode(self, kind: str, items) -> int:
+        bits, values = self._bits[kind], self._values[kind]
+        mask = 0
+        for item in items:
+            bit = bits.get(item)
+            if bit is None:
+                bit = bits[item] = len(values)
+                values.append(item)
+            mask |= 1 << bit
+        return mask
+    
+    def size(self, kind: str) -> int:
+        """Number of values with a bit position"""
+        return len(self._values[kind])
+    
+    def decode(self, kind: str, mask: int) -> List[str]:
+        values = self._values[kind]
+        items = []
+        while mask:
+            low = mask & -mask
+            items.append(values[low.bit_length() - 1])
+            mask ^= low
+        return sorted(items)
+
+@dataclass
+class CountryEntry:
+    """Cached features and bitsets of one country, tagged with its file hash"""
+    content_key: Optional[str]
+    features: CountryFeatures
+    masks: Dict[str, int]
+
+class StrategyComparator:
+    """Compares any number of strategies in one pass over integer bitsets
+    
+    Per-country features are extracted once per file version and encoded
+    as one bitset per feature kind. A single sweep over the compared
+    countries yields the N-way intersection and the set of values seen
+    more than once (so each country's uniques are its mask minus that
+    set), and pairwise differences are XORs of two masks. Whole results
+    are memoized by (sorted country set, data version). When the data
+    version changes, removed countries are forgotten and the vocabulary is
+    rebuilt if it holds values no remaining country has.
+    """
+    
+    def __init__(self, max_results: int = 256):
+        self.max_results = max_results
+        self.bitsets = FeatureBitsets()
+        
+        self._lock = threading.RLock()
+        self._countries: Dict[str, CountryEntry] = {}
+        self._results: "OrderedDict[Tuple[Tuple[str, ...], str], ComparisonResult]" = OrderedDict()
+        self._version: Optional[str] = None
+        
+        self.stats = {"hits": 0, "computed": 0, "extracted": 0, "compactions": 0}
+    
+    def country_entry(self, strategies: Mapping, country: str) -> CountryEntry:
+        """Features and bitsets for one country, re-extracted only when its file changed"""
+        content_hash = getattr(strategies, 'content_hash', None)
+        content_key = content_hash(country) if content_hash else None
+        
+        with self._lock:
+            entry = self._countries.get(country)
+            if entry is None or content_key is None or entry.content_key != content_key:
+                features = country_features(strategies[country])
+                entry = CountryEntry(content_key, features, self._encode(features))
+                self._countries[country] = entry
+                self.stats["extracted"] += 1
+            
+            return entry
+    
+    def _encode(self, features: CountryFeatures) -> Dict[str, int]:
+        return {
+            "themes": self.bitsets.encode("themes", sorted(features.themes)),
+            "sectors": self.bitsets.encode("sectors", features.sectors),
+            "partners": self.bitsets.encode("partners", features.partners),
+            "initiatives": self.bitsets.encode("initiatives", features.initiatives)
+        }
+    
+    def sync(self, strategies: Mapping, version: Optional[str]):
+        """On a new data version, drop removed countries and stale results, and compact the vocabulary"""
+        with self._lock:
+            if version is None or version == self._version:
+                return
+            self._version = version
+            self._results.clear()
+            for code in [code for code in self._countries if code not in strategies]:
+                del self._countries[code]
+            
+            live = dict.fromkeys(FEATURE_KINDS, 0)
+            for entry in self._countries.values():
+                for kind, mask in entry.masks.items():
+                    live[kind] |= mask
+            if any(_popcount(live[kind]) < self.bitsets.size(kind) for kind in FEATURE_KINDS):
+                self.bitsets = FeatureBitsets()
+                for entry in self._countries.values():
+                    entry.masks = self._encode(entry.features)
+                self.stats["compactions"] += 1
+    
+    def compare(self, strategies: Mapping, countries: List[str], version: str = None) -> ComparisonResult:
+        """Compare strategies of the given countries, reusing memoized results per data version"""
+        if len(countries) < 2:
+            raise ValueError("At least 2 countries required for comparison")
+        
+        codes = tuple(sorted({c for c in countries if c in strategies}))
+        key = (codes, version)
+        
+        with self._lock:
+            self.sync(strategies, version)
+            if version is not None and key in self._results:
+                self._results.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._results[key]
+            
+            result = self._compare(strategies, list(codes))
+            self.stats["computed"] += 1
+            
+            if version is not None:
+                self._results[key] = result
+                while len(self._results) > self.max_results:
+                    self._results.popitem(last=False)
+        
+        return result
+    
+    def _compare(self, strategies: Mapping, codes: List[str]) -> ComparisonResult:
+        entries = {code: self.country_entry(strategies, code) for code in codes}
+        
+        # One sweep per kind: values held by everyone, and values held by two or more
+        common = {kind: -1 if codes else 0 for kind in FEATURE_KINDS}
+        seen_once = dict.fromkeys(FEATURE_KINDS, 0)
+        seen_twice = dict.fromkeys(FEATURE_KINDS, 0)
+        for code in codes:
+            for kind, mask in entries[code].masks.items():
+                common[kind] &= mask
+                seen_twice[kind] |= seen_once[kind] & mask
+                seen_once[kind] |= mask
+        
+        unique_features = {
+            code: {
+                kind: self.bitsets.decode(kind, entries[code].masks[kind] & ~seen_twice[kind])
+                for kind in FEATURE_KINDS
+            }
+            for code in codes
+        }
+        
+        pairwise = []
+        for a, b in combinations(codes, 2):
+            mask_a, mask_b = entries[a].masks["themes"], entries[b].masks["themes"]
+            union = _popcount(mask_a | mask_b)
+            pairwise.append({
+                "countries": [a, b],
+                "shared_themes": _popcount(mask_a & mask_b),
+                "theme_similarity": round(_popcount(mask_a & mask_b) / union, 3) if union else 0.0,
+                "only": {
+                    a: self.bitsets.decode("themes", mask_a & ~mask_b),
+                    b: self.bitsets.decode("themes", mask_b & ~mask_a)
+                }
+            })
+        
+        similarities = {}
+        for label, kind in (("Priority Sectors", "sectors"), ("International Cooperation", "partners")):
+            shared = self.bitsets.decode(kind, common[kind])
+            if shared:
+                similarities[label] = shared
+        
+        differences = {}
+        for code in codes:
+            features = entries[code].features
+            differences[code] = {
+                'budget': features.budget_label,
+                'budget_usd_millions': round(features.budget, 3),
+                'timeline': format_period(features.period),
+                'governance': features.lead_agency,
+                'theme_count': len(features.themes),
+                'sector_count': len(features.sectors)
+            }
+        
+        return ComparisonResult(
+            countries=list(codes),
+            similarities=similarities,
+            differences=differences,
+            common_themes=self.bitsets.decode("themes", common["themes"]),
+            unique_approaches={
+                code: unique["initiatives"] + unique["themes"] for code, unique in unique_features.items()
+            },
+            collaboration_opportunities=self._suggest_collaboration(codes, similarities, pairwise),
+            unique_features=unique_features,
+            pairwise=pairwise
+        )
+    
+    def _suggest_collaboration(self, codes: List[str], similarities: Dict[str, List[str]],
+                               pairwise: List[Dict[str, Any]]) -> List[str]:
+        """Suggest collaboration opportunities between countries"""
+        suggestions = []
+        if len(codes) < 2:
+            return suggestions
+        
+        group = " and ".join(codes) if len(codes) <= 4 else f"the {len(codes)} compared countries"
+        suggestions.append(f"Joint AI research initiative between {group}")
+        for sector in similarities.get("Priority Sectors", [])[:3]:
+            suggestions.append(f"Shared AI programme for {sector} across {group}")
+        suggestions.append("Shared AI talent development program")
+        suggestions.append("Cross-border AI regulatory harmonization")
+        
+        closest = max(pairwise, key=lambda p: (p["theme_similarity"], p["shared_themes"]), default=None)
+        if closest and closest["shared_themes"]:
+            a, b = closest["countries"]
+            suggestions.append(f"Bilateral partnership between {a} and {b} ({closest['shared_themes']} shared themes)")
+        
+        return suggestions
@@ -0,0 +1,234 @@
+"""
+Response compression for African AI Strategies Portal
+gzip and brotli content negotiation with a cache of precompressed bodies
+"""
+
+import functools
+import gzip
+import hashlib
+import json
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+import logging
+
+from flask import Flask, Response, current_app, request
+
+try:
+    import brotli
+except ImportError:  # optional; responses are gzip-only without it
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Bodies smaller than this are sent uncompressed; the saving would not cover the coding overhead
+MIN_SIZE = 1024
+
+COMPRESSIBLE_TYPES = frozenset({
+    "application/json", "application/javascript", "text/javascript",
+    "text/html", "text/css", "text/plain", "image/svg+xml"
+})
+
+# Levels for bodies compressed per request, and for cached bodies that are compressed only once
+LEVELS = {"br": 5, "gzip": 6}
+CACHED_LEVELS = {"br": 9, "gzip": 9}
+
+def available_encodings() -> Tuple[str, ...]:
+    """Content codings this process can produce, most preferred first"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+def negotiate(accept_encodings) -> Optional[str]:
+    """Best coding in a parsed Accept-Encoding header, or None to send the body as it is"""
+    return accept_encodings.best_match(available_encodings())
+
+def compress(data: bytes, encoding: str, level: int = None) -> bytes:
+    """Whole body in one coding; gzip output has no timestamp, so equal bodies compress equally"""
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=LEVELS["gzip"] if level is None else level, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=LEVELS["br"] if level is None else level)
+    raise ValueError(f"Unsupported content coding '{encoding}'; expected one of {list(available_encodings())}")
+
+def compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """Compress a streamed body incrementally, flushing after each chunk so it goes out at once"""
+    if encoding == "gzip":
+        compressor = zlib.compressobj(LEVELS["gzip"], zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        process, flush, finish = compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+    elif encoding == "br" and brotli is not None:
+        compressor = brotli.Compressor(quality=LEVELS["br"])
+        process, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        raise ValueError(f"Unsupported content coding '{encoding}'; expected one of {list(available_encodings())}")
+    
+    for chunk in chunks:
+        data = process(chunk) + flush()
+        if data:
+            yield data
+    yield finish()
+
+class CompressedCache:
+    """Compressed response bodies keyed by (ETag, coding) in an LRU bounded by total bytes
+    
+    An ETag names one representation of a resource (data version, path
+    and query string), so its compressed bytes stay valid until the data
+    changes, and then the tag changes with it. Each body is compressed
+    once per coding, at a higher level than per-request compression, and
+    later requests for the same tag are served the stored bytes.
+    """
+    
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[bytes, str]]" = OrderedDict()
+        self._size = 0
+        
+        self.stats = {"hits": 0, "compressions": 0}
+    
+    def get(self, etag: str, encoding: str) -> Optional[Tuple[bytes, str]]:
+        """Stored (body, mimetype) of a tagged representation in a coding, if cached"""
+        with self._lock:
+            entry = self._entries.get((etag, encoding))
+            if entry is not None:
+                self._entries.move_to_end((etag, encoding))
+                self.stats["hits"] += 1
+            return entry
+    
+    def put(self, etag: str, encoding: str, body: bytes, mimetype: str):
+        """Store a compressed body, evicting the least recently used ones beyond max_bytes"""
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop((etag, encoding), None)
+            if previous is not None:
+                self._size -= len(previous[0])
+            self._entries[(etag, encoding)] = (body, mimetype)
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted[0])
+    
+    def compressed(self, etag: str, encoding: str, data: bytes, mimetype: str) -> bytes:
+        """Cached compressed body of a tagged representation, compressing data on a miss"""
+        entry = self.get(etag, encoding)
+        if entry is not None:
+            return entry[0]
+        body = compress(data, encoding, CACHED_LEVELS[encoding])
+        self.stats["compressions"] += 1
+        self.put(etag, encoding, body, mimetype)
+        return body
+    
+    def collect(self, etag: str, encoding: str, mimetype: str, stream: Iterator[bytes]) -> Iterator[bytes]:
+        """Pass a compressed stream through and store it once it has been sent in full"""
+        parts, size = [], 0
+        for data in stream:
+            yield data
+            if parts is not None:
+                parts.append(data)
+                size += len(data)
+                if size > self.max_bytes:
+                    parts = None
+        if parts is not None:
+            self.stats["compressions"] += 1
+            self.put(etag, encoding, b"".join(parts), mimetype)
+
+class Compressor:
+    """Flask extension compressing responses for clients that accept gzip or brotli
+    
+    The coding is negotiated from Accept-Encoding, preferring brotli when
+    it is installed. Bodies under min_size and types that do not shrink
+    are sent as they are. Responses with an ETag are compressed through
+    the cache, so conditional views can answer a hot resource with
+    precompressed bytes; streamed responses are compressed chunk by chunk.
+    Compressed responses carry a weak ETag, since their bytes differ from
+    the uncompressed representation.
+    """
+    
+    def __init__(self, app: Flask = None, min_size: int = MIN_SIZE, cache: CompressedCache = None):
+        self.min_size = min_size
+        self.cache = cache if cache is not None else CompressedCache()
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app: Flask):
+        app.after_request(self.after_request)
+        app.extensions["compressor"] = self
+    
+    def cached_response(self, etag: str) -> Optional[Response]:
+        """Precompressed response for a tagged representation in a coding this client accepts, if cached"""
+        encoding = negotiate(request.accept_encodings)
+        entry = self.cache.get(etag, encoding) if encoding else None
+        if entry is None:
+            return None
+        body, mimetype = entry
+        response = Response(body, mimetype=mimetype)
+        response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        response.set_etag(etag, weak=True)
+        return response
+    
+    def after_request(self, response: Response) -> Response:
+        encoding = negotiate(request.accept_encodings)
+        if response.status_code == 304:
+            response.vary.add("Accept-Encoding")
+            etag, weak = response.get_etag()
+            if encoding and etag and not weak:
+                response.set_etag(etag, weak=True)
+            return response
+        
+        if (response.status_code != 200 or response.mimetype not in COMPRESSIBLE_TYPES
+                or response.direct_passthrough or "Content-Encoding" in response.headers):
+            return response
+        response.vary.add("Accept-Encoding")
+        if encoding is None:
+            return response
+        
+        etag, weak = response.get_etag()
+        if response.is_streamed:
+            stream = compress_stream(response.response, encoding)
+            response.response = self.cache.collect(etag, encoding, response.mimetype, stream) if etag else stream
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            if etag:
+                response.set_data(self.cache.compressed(etag, encoding, data, response.mimetype))
+            else:
+                response.set_data(compress(data, encoding))
+        
+        response.headers["Content-Encoding"] = encoding
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+def conditional(data_version: Callable[[], str]):
+    """Decorator: tag responses with an ETag of the data version, path and query string
+    
+    A request whose If-None-Match holds the current tag gets an empty 304
+    before the view runs, so revalidating an unchanged resource costs one
+    version check; a tag whose compressed body is already cached by the
+    app's Compressor is served from it without running the view either.
+    Responses say no-cache so clients always revalidate.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            key = [request.path, data_version(), sorted(request.args.items(multi=True))]
+            etag = hashlib.sha1(json.dumps(key).encode()).hexdigest()[:24]
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+                response.set_etag(etag)
+            else:
+                # A precompressed response comes with the tag already set
+                compressor = current_app.extensions.get("compressor")
+                response = compressor.cached_response(etag) if compressor is not None else None
+                if response is None:
+                    response = current_app.make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    response.set_etag(etag)
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+        return wrapper
+    return decorator
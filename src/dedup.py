@@ -0,0 +1,224 @@
+"""
+Near-duplicate detection for African AI Strategies Portal
+MinHash signatures and locality-sensitive hashing over initiative text
+"""
+
+import json
+import hashlib
+from collections import defaultdict
+from typing import Dict, List, Any, Iterable, Mapping, Set, Tuple
+import numpy as np
+import logging
+
+from src.strategy_store import document_key
+from src.text_similarity import tokenize, initiative_text
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime for the universal hash family; shingle hashes are masked below it
+HASH_PRIME = (1 << 31) - 1
+
+def shingles(text: str) -> Set[str]:
+    """Word unigrams and bigrams of a text, so reordered names still overlap"""
+    tokens = tokenize(text)
+    return set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+def _shingle_hashes(items: Iterable[str]) -> np.ndarray:
+    """Stable 31-bit hashes (unlike hash(), identical across processes)"""
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(item.encode(), digest_size=8).digest(), 'little') & HASH_PRIME
+         for item in sorted(items)],
+        dtype=np.uint64
+    )
+
+class MinHasher:
+    """MinHash signatures under num_perm seeded hash functions (a*x + b) mod p"""
+    
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, HASH_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, HASH_PRIME, size=num_perm, dtype=np.uint64)
+    
+    def signature(self, items: Set[str]) -> np.ndarray:
+        if not items:
+            return np.full(self.num_perm, HASH_PRIME, dtype=np.uint64)
+        hashes = _shingle_hashes(items)
+        # num_perm x n_shingles in one broadcast; a, x < 2^31 so the product fits in uint64
+        return ((self._a[:, None] * hashes[None, :] + self._b[:, None]) % HASH_PRIME).min(axis=1)
+
+class InitiativeDeduplicator:
+    """Clusters near-duplicate initiatives across strategies
+    
+    Each initiative's name and description are shingled and reduced to a
+    MinHash signature. Signatures are split into bands, and only
+    initiatives that share a band bucket are compared, so adding an
+    initiative costs time proportional to its bucket mates rather than to
+    the whole corpus. Candidates whose estimated Jaccard similarity clears
+    the threshold are linked, and clusters are the connected components,
+    identified by their smallest member id. Strategies are re-hashed only
+    when their initiative text changes.
+    """
+    
+    def __init__(self, num_perm: int = 128, bands: int = 32, threshold: float = 0.5, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._initiatives: Dict[str, Dict[str, Any]] = {}
+        self._buckets: Dict[Tuple[int, bytes], Set[str]] = defaultdict(set)
+        self._edges: Dict[str, Set[str]] = defaultdict(set)
+        self._fingerprints: Dict[str, str] = {}
+        self._revisions: Dict[str, Any] = {}
+        self._doc_ids: Dict[str, List[str]] = {}
+        self._cluster_of: Dict[str, str] = {}
+        self._dirty = True
+        
+        self.stats = {"candidates": 0, "comparisons": 0}
+    
+    def __len__(self) -> int:
+        return len(self._signatures)
+    
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+    
+    def add(self, doc_id: str, text: str, info: Dict[str, Any] = None):
+        """Index one initiative and link it to its near-duplicates"""
+        self.remove(doc_id)
+        signature = self.hasher.signature(shingles(text))
+        
+        candidates = set()
+        for key in self._band_keys(signature):
+            candidates |= self._buckets[key]
+            self._buckets[key].add(doc_id)
+        self.stats["candidates"] += len(candidates)
+        
+        for other in candidates:
+            self.stats["comparisons"] += 1
+            if self.estimated_similarity(signature, self._signatures[other]) >= self.threshold:
+                self._edges[doc_id].add(other)
+                self._edges[other].add(doc_id)
+        
+        self._signatures[doc_id] = signature
+        self._initiatives[doc_id] = dict(info or {}, id=doc_id)
+        self._dirty = True
+    
+    def remove(self, doc_id: str):
+        signature = self._signatures.pop(doc_id, None)
+        if signature is None:
+            return
+        for key in self._band_keys(signature):
+            self._buckets[key].discard(doc_id)
+            if not self._buckets[key]:
+                del self._buckets[key]
+        for other in self._edges.pop(doc_id, set()):
+            self._edges[other].discard(doc_id)
+        self._initiatives.pop(doc_id, None)
+        self._dirty = True
+    
+    @staticmethod
+    def estimated_similarity(a: np.ndarray, b: np.ndarray) -> float:
+        """Fraction of agreeing MinHash slots, an unbiased Jaccard estimate"""
+        return float(np.mean(a == b))
+    
+    def update_strategy(self, country_code: str, strategy: Dict[str, Any]) -> bool:
+        """Re-hash a strategy's initiatives if their text changed; returns True if updated"""
+        initiatives = strategy.get('key_initiatives', [])
+        texts = [initiative_text(initiative) for initiative in initiatives]
+        fingerprint = hashlib.sha1(json.dumps(texts).encode()).hexdigest()
+        if self._fingerprints.get(country_code) == fingerprint:
+            return False
+        
+        self.remove_strategy(country_code)
+        doc_ids = []
+        for i, (initiative, text) in enumerate(zip(initiatives, texts)):
+            doc_id = f"{country_code}:{i}"
+            self.add(doc_id, text, {"country": country_code, "name": initiative.get('name', '')})
+            doc_ids.append(doc_id)
+        
+        self._doc_ids[country_code] = doc_ids
+        self._fingerprints[country_code] = fingerprint
+        return True
+    
+    def remove_strategy(self, country_code: str):
+        for doc_id in self._doc_ids.pop(country_code, []):
+            self.remove(doc_id)
+        self._fingerprints.pop(country_code, None)
+        self._revisions.pop(country_code, None)
+    
+    def sync(self, strategies: Mapping[str, Dict[str, Any]]) -> int:
+        """Bring the index in line with a set of strategies; returns number of changes
+        
+        A strategy provider's file revisions mark unchanged strategies, so
+        their documents are not loaded again.
+        """
+        changed = 0
+        for country_code in list(self._fingerprints.keys()):
+            if country_code not in strategies:
+                self.remove_strategy(country_code)
+                changed += 1
+        
+        for country_code in strategies.keys():
+            key, previous = document_key(strategies, country_code), self._revisions.get(country_code)
+            if previous is not None and (previous is key or previous == key):
+                continue
+            if self.update_strategy(country_code, strategies[country_code]):
+                changed += 1
+            self._revisions[country_code] = key
+        
+        if changed:
+            logger.debug(f"Initiative dedup index refreshed for {changed} strategies")
+        return changed
+    
+    def _components(self) -> Dict[str, str]:
+        """Connected components of the near-duplicate graph, recomputed only after changes"""
+        if not self._dirty:
+            return self._cluster_of
+        
+        cluster_of = {}
+        for start in sorted(self._signatures):
+            if start in cluster_of:
+                continue
+            component, stack = [], [start]
+            while stack:
+                doc_id = stack.pop()
+                if doc_id in cluster_of:
+                    continue
+                cluster_of[doc_id] = None
+                component.append(doc_id)
+                stack.extend(self._edges.get(doc_id, ()))
+            cluster_id = min(component)
+            for doc_id in component:
+                cluster_of[doc_id] = cluster_id
+        
+        self._cluster_of, self._dirty = cluster_of, False
+        return cluster_of
+    
+    def cluster_of(self, doc_id: str) -> str:
+        """Cluster id of an initiative (its own id when it has no duplicates)"""
+        return self._components().get(doc_id, doc_id)
+    
+    def clusters(self, min_size: int = 2) -> List[Dict[str, Any]]:
+        """Groups of near-duplicate initiatives, largest first"""
+        members = defaultdict(list)
+        for doc_id, cluster_id in self._components().items():
+            members[cluster_id].append(doc_id)
+        
+        groups = []
+        for cluster_id, doc_ids in members.items():
+            if len(doc_ids) < min_size:
+                continue
+            initiatives = [self._initiatives[doc_id] for doc_id in sorted(doc_ids)]
+            groups.append({
+                "cluster_id": cluster_id,
+                "size": len(doc_ids),
+                "countries": sorted({i["country"] for i in initiatives}),
+                "initiatives": initiatives
+            })
+        
+        groups.sort(key=lambda g: (-g["size"], g["cluster_id"]))
+        return groups
@@ -0,0 +1,198 @@
+"""
+Strategy feature extraction for African AI Strategies Portal
+Shared parsing of themes, sectors, budgets and dates from strategy documents
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+BUDGET_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(BILLION|BN|B|MILLION|M|THOUSAND|K)?\b")
+
+YEAR_PATTERN = re.compile(r"(19|20)\d{2}")
+
+BUDGET_MULTIPLIERS = {
+    "BILLION": 1000.0, "BN": 1000.0, "B": 1000.0,
+    "MILLION": 1.0, "M": 1.0,
+    "THOUSAND": 0.001, "K": 0.001
+}
+
+def extract_strategy_themes(strategy: Dict[str, Any]) -> Set[str]:
+    """Extract themes from a strategy document"""
+    themes = set()
+    
+    # Extract from explicit themes field
+    if 'themes' in strategy:
+        themes.update(strategy['themes'])
+    
+    # Extract from strategic pillars
+    if 'strategic_pillars' in strategy:
+        for pillar in strategy['strategic_pillars']:
+            themes.add(pillar.get('name', ''))
+    
+    # Extract from priority sectors
+    if 'priority_sectors' in strategy:
+        if isinstance(strategy['priority_sectors'], list):
+            for sector in strategy['priority_sectors']:
+                if isinstance(sector, dict):
+                    themes.add(sector.get('name', ''))
+                else:
+                    themes.add(str(sector))
+    
+    # Extract from objectives
+    if 'objectives' in strategy:
+        for obj in strategy['objectives']:
+            # Simple keyword extraction
+            if 'skill' in obj.lower() or 'talent' in obj.lower():
+                themes.add('Skills Development')
+            if 'infrastructure' in obj.lower():
+                themes.add('Infrastructure')
+            if 'innovation' in obj.lower():
+                themes.add('Innovation')
+            if 'ethics' in obj.lower() or 'responsible' in obj.lower():
+                themes.add('Ethics')
+    
+    # Remove empty themes
+    themes.discard('')
+    
+    return themes
+
+def sector_names(strategy: Dict[str, Any]) -> List[str]:
+    """Names of a strategy's priority sectors, whether given as strings or dicts"""
+    names = []
+    for sector in strategy.get('priority_sectors', []) or []:
+        name = sector.get('name', '') if isinstance(sector, dict) else str(sector)
+        if name and name not in names:
+            names.append(name)
+    return names
+
+def parse_budget(budget_str: Any) -> float:
+    """Parse a budget string such as 'USD 50 million' or 'USD 1.2B' into USD millions"""
+    if isinstance(budget_str, (int, float)):
+        return float(budget_str)
+    if not budget_str or budget_str == "Not specified":
+        return 0.0
+    
+    text = str(budget_str).upper().replace(',', '')
+    match = BUDGET_PATTERN.search(text)
+    if not match:
+        return 0.0
+    
+    amount = float(match.group(1))
+    unit = match.group(2)
+    if unit is None:
+        # Bare numbers are taken as whole dollars
+        return amount / 1_000_000
+    return amount * BUDGET_MULTIPLIERS[unit]
+
+def strategy_budget(strategy: Dict[str, Any]) -> float:
+    """Total budget in USD millions, falling back to the sum of initiative budgets"""
+    total = parse_budget(strategy.get('funding_strategy', {}).get('total_budget'))
+    if total:
+        return total
+    
+    total = parse_budget(strategy.get('budget'))
+    if total:
+        return total
+    
+    return sum(parse_budget(i.get('budget')) for i in strategy.get('key_initiatives', []))
+
+def parse_year(value: Any) -> Optional[int]:
+    """First four-digit year in a date or period value"""
+    if isinstance(value, int):
+        return value
+    match = YEAR_PATTERN.search(str(value or ''))
+    return int(match.group(0)) if match else None
+
+def parse_period(value: Any) -> Optional[Tuple[int, int]]:
+    """(start, end) years from '2022-2024', '2022' or {'start': ..., 'end': ...}"""
+    if isinstance(value, dict):
+        if 'period' in value:
+            return parse_period(value['period'])
+        start, end = parse_year(value.get('start')), parse_year(value.get('end'))
+    else:
+        years = [int(m.group(0)) for m in YEAR_PATTERN.finditer(str(value or ''))]
+        start, end = (years[0], years[-1]) if years else (None, None)
+    
+    if start is None:
+        return None
+    return (start, end if end is not None and end >= start else start)
+
+def strategy_period(strategy: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    """Implementation horizon of a strategy, across all of its timeline phases"""
+    periods = []
+    for field_name in ('timeline', 'implementation_timeline'):
+        timeline = strategy.get(field_name)
+        if isinstance(timeline, dict):
+            for phase, details in timeline.items():
+                period = parse_period(details)
+                if period is None:
+                    # Year-keyed timelines: {"2022": "Launch", ...}
+                    period = parse_period(phase)
+                if period:
+                    periods.append(period)
+    
+    if not periods:
+        return None
+    return (min(p[0] for p in periods), max(p[1] for p in periods))
+
+# Governance roles and the structure fields that fill them, in either document schema
+GOVERNANCE_ROLES = {
+    "leadership": ("lead_agency", "steering_committee"),
+    "coordination": ("coordinating_body", "implementation_unit"),
+    "implementation": ("implementation_agencies", "implementation_unit"),
+    "advisory": ("advisory_council",)
+}
+
+def format_period(period: Optional[Tuple[int, int]]) -> str:
+    """Render a (start, end) year pair as '2022-2027'"""
+    if period is None:
+        return "Not specified"
+    return str(period[0]) if period[0] == period[1] else f"{period[0]}-{period[1]}"
+
+@dataclass
+class CountryFeatures:
+    """Comparable features of one strategy, extracted once per file version"""
+    themes: Set[str]
+    sectors: List[str]
+    partners: List[str]
+    initiatives: List[str]
+    budget: float
+    budget_label: str
+    lead_agency: str
+    period: Optional[Tuple[int, int]]
+    country_name: str = ''
+    status: str = ''
+    governance_roles: List[str] = field(default_factory=list)
+    partner_count: int = 0
+
+def country_features(strategy: Dict[str, Any]) -> CountryFeatures:
+    """Extract the features used to compare and score strategies"""
+    budget = strategy_budget(strategy)
+    governance = strategy.get('governance_structure', {}) or {}
+    partners = [p for p in strategy.get('international_cooperation', []) or [] if p]
+    lead_agency = governance.get('lead_agency')
+    if not lead_agency and isinstance(governance.get('steering_committee'), dict):
+        lead_agency = governance['steering_committee'].get('chair')
+    budget_label = strategy.get('funding_strategy', {}).get('total_budget') or strategy.get('budget')
+    if not budget_label:
+        budget_label = f"USD {budget:g} million" if budget else "Not specified"
+    
+    return CountryFeatures(
+        themes=extract_strategy_themes(strategy),
+        sectors=sector_names(strategy),
+        partners=partners,
+        initiatives=[i.get('name', '') for i in strategy.get('key_initiatives', []) if i.get('name')],
+        budget=budget,
+        budget_label=budget_label,
+        lead_agency=lead_agency or 'Not specified',
+        period=strategy_period(strategy),
+        country_name=strategy.get('country_name', ''),
+        status=strategy.get('status', ''),
+        governance_roles=[
+            role for role, fields in GOVERNANCE_ROLES.items() if any(governance.get(f) for f in fields)
+        ],
+        partner_count=len(set(partners).union(
+            p for i in strategy.get('key_initiatives', []) for p in i.get('partners', []) or []
+        ))
+    )
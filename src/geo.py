@@ -0,0 +1,342 @@
+"""
+Map geometry engine for African AI Strategies Portal
+Shared-border topology, multi-resolution simplification and TopoJSON-style encoding
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Any, Optional, Tuple
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+BOUNDARIES_FILE = Path(__file__).resolve().parent.parent / "data" / "reference" / "africa_boundaries.geojson"
+
+# (name, minimum zoom, simplification tolerance in degrees, quantization grid size)
+MAP_RESOLUTIONS = (
+    ("low", 0, 0.5, 1_000),
+    ("medium", 3, 0.1, 10_000),
+    ("high", 5, 0.0, 100_000)
+)
+
+def encoded_topology_path(resolution: str, boundaries=None) -> Path:
+    """File holding a resolution's prebuilt topology, next to the boundaries it was built from"""
+    boundaries = Path(boundaries or BOUNDARIES_FILE)
+    return boundaries.with_name(f"{boundaries.stem}.{resolution}.topo.json")
+
+def boundaries_digest(boundaries=None) -> str:
+    """Hash of a boundaries file, recorded in prebuilt topologies so stale ones are ignored"""
+    with open(boundaries or BOUNDARIES_FILE, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
+
+def resolution_for_zoom(zoom: float) -> str:
+    """Name of the coarsest resolution meant for a zoom level"""
+    name = MAP_RESOLUTIONS[0][0]
+    for candidate, min_zoom, _, _ in MAP_RESOLUTIONS:
+        if zoom >= min_zoom:
+            name = candidate
+    return name
+
+def _chord_distance(points: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Distance of each point from the line through a and b (from a itself when a == b)"""
+    chord = b - a
+    length = np.hypot(chord[0], chord[1])
+    offset = points - a
+    if length == 0:
+        return np.hypot(offset[:, 0], offset[:, 1])
+    return np.abs(chord[0] * offset[:, 1] - chord[1] * offset[:, 0]) / length
+
+def douglas_peucker(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Mask of the points Douglas-Peucker keeps; both endpoints are always kept"""
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    if tolerance <= 0:
+        keep[:] = True
+        return keep
+    
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        distance = _chord_distance(points[first + 1:last], points[first], points[last])
+        farthest = int(np.argmax(distance))
+        if distance[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.extend(((first, split), (split, last)))
+    return keep
+
+def simplify_arc(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Simplify an arc, keeping its endpoints; closed arcs keep at least four points"""
+    if tolerance <= 0 or len(points) <= 4:
+        return points
+    if not np.array_equal(points[0], points[-1]):
+        return points[douglas_peucker(points, tolerance)]
+    
+    # A closed ring is split at its farthest point from the start, and each half keeps its
+    # most prominent point, so small islands shrink to a quadrilateral instead of a line
+    far = int(np.argmax(np.hypot(*(points - points[0]).T)))
+    keep = np.zeros(len(points), dtype=bool)
+    for low, high in ((0, far), (far, len(points) - 1)):
+        keep[low:high + 1] |= douglas_peucker(points[low:high + 1], tolerance)
+        if high - low >= 2:
+            keep[low + 1 + int(np.argmax(_chord_distance(points[low + 1:high], points[low], points[high])))] = True
+    return points[keep]
+
+def extract_arcs(rings: List[List[Tuple[float, float]]]) -> Tuple[List[np.ndarray], List[List[int]]]:
+    """Split closed rings into shared arcs; returns the arcs and each ring as arc references
+    
+    A junction is a point reached from different neighbours by different
+    rings (where a border between two countries starts or ends). Rings are
+    cut at their junctions, and an arc that a neighbouring ring traverses
+    in the opposite direction is stored once and referenced as ~index, as
+    in TopoJSON. Rings without junctions become one closed arc starting at
+    their smallest point, so a ring that fills another's hole is shared too.
+    """
+    neighbours: Dict[Tuple[float, float], set] = {}
+    for ring in rings:
+        open_ring = ring[:-1]
+        for i, point in enumerate(open_ring):
+            pair = frozenset((open_ring[i - 1], open_ring[(i + 1) % len(open_ring)]))
+            neighbours.setdefault(point, set()).add(pair)
+    
+    arcs: List[np.ndarray] = []
+    index: Dict[tuple, int] = {}
+    
+    def reference(points: List[Tuple[float, float]]) -> int:
+        key = tuple(points)
+        if key in index:
+            return index[key]
+        reverse = tuple(reversed(points))
+        if reverse in index:
+            return ~index[reverse]
+        index[key] = len(arcs)
+        arcs.append(np.array(points, dtype=float))
+        return index[key]
+    
+    ring_arcs = []
+    for ring in rings:
+        open_ring = ring[:-1]
+        junctions = [i for i, point in enumerate(open_ring) if len(neighbours[point]) > 1]
+        if not junctions:
+            start = open_ring.index(min(open_ring))
+            rotated = open_ring[start:] + open_ring[:start]
+            ring_arcs.append([reference(rotated + rotated[:1])])
+            continue
+        
+        rotated = open_ring[junctions[0]:] + open_ring[:junctions[0]]
+        cuts = [i - junctions[0] for i in junctions] + [len(open_ring)]
+        closed = rotated + rotated[:1]
+        ring_arcs.append([reference(closed[a:b + 1]) for a, b in zip(cuts, cuts[1:])])
+    
+    return arcs, ring_arcs
+
+def quantize_arc(points: np.ndarray, translate: np.ndarray, scale: np.ndarray) -> List[List[int]]:
+    """Quantize an arc to the integer grid and delta-encode it, dropping repeated positions"""
+    grid = np.round((points - translate) / scale).astype(np.int64)
+    moved = np.ones(len(grid), dtype=bool)
+    moved[1:] = (np.diff(grid, axis=0) != 0).any(axis=1)
+    if moved.sum() < 2:
+        moved[-1] = True
+    grid = grid[moved]
+    return np.vstack([grid[:1], np.diff(grid, axis=0)]).tolist()
+
+class BoundaryTopology:
+    """Country boundaries as shared arcs, encoded once per resolution
+    
+    Borders are stored once for both neighbouring countries and simplified
+    as one arc with fixed endpoints, so simplification never opens gaps or
+    overlaps between countries. Each resolution simplifies every arc at its
+    tolerance, quantizes the coordinates to its grid and delta-encodes
+    them; the encoded topology is kept for the life of the process.
+    """
+    
+    def __init__(self, features: List[Dict[str, Any]]):
+        rings = []
+        self.geometries = []
+        for feature in features:
+            geometry = feature["geometry"]
+            polygons = [geometry["coordinates"]] if geometry["type"] == "Polygon" else geometry["coordinates"]
+            shape = []
+            for polygon in polygons:
+                shape.append([len(rings) + i for i in range(len(polygon))])
+                rings.extend([tuple(map(float, point)) for point in ring] for ring in polygon)
+            self.geometries.append({
+                "id": feature["properties"]["code"],
+                "name": feature["properties"]["name"],
+                "polygons": shape
+            })
+        
+        self.arcs, self._ring_arcs = extract_arcs(rings)
+        points = np.vstack(self.arcs) if self.arcs else np.zeros((1, 2))
+        self.bbox = np.concatenate([points.min(axis=0), points.max(axis=0)])
+        
+        self._lock = threading.Lock()
+        self._encoded: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"encodings": 0}
+        logger.debug(f"Extracted {len(self.arcs)} arcs from {len(rings)} rings")
+    
+    @classmethod
+    def load(cls, path=None) -> 'BoundaryTopology':
+        """Read boundaries from a GeoJSON FeatureCollection with code and name properties"""
+        with open(path or BOUNDARIES_FILE, 'r', encoding='utf-8') as f:
+            return cls(json.load(f)["features"])
+    
+    @property
+    def codes(self) -> List[str]:
+        return [geometry["id"] for geometry in self.geometries]
+    
+    def encode(self, resolution: str) -> Dict[str, Any]:
+        """Quantized, delta-encoded topology at one resolution (shared; do not mutate)"""
+        settings = {name: (tolerance, grid) for name, _, tolerance, grid in MAP_RESOLUTIONS}
+        if resolution not in settings:
+            raise ValueError(f"Unknown map resolution '{resolution}'; expected one of {list(settings)}")
+        
+        with self._lock:
+            if resolution not in self._encoded:
+                self._encoded[resolution] = self._encode(*settings[resolution])
+                self.stats["encodings"] += 1
+            return self._encoded[resolution]
+    
+    def _encode(self, tolerance: float, grid: int) -> Dict[str, Any]:
+        translate = self.bbox[:2]
+        scale = np.maximum(self.bbox[2:] - self.bbox[:2], 1e-9) / (grid - 1)
+        simplified = [simplify_arc(arc, tolerance) for arc in self.arcs]
+        
+        geometries = []
+        for geometry in self.geometries:
+            polygons = [[self._ring_arcs[ring] for ring in polygon] for polygon in geometry["polygons"]]
+            geometries.append({
+                "type": "Polygon" if len(polygons) == 1 else "MultiPolygon",
+                "id": geometry["id"],
+                "arcs": polygons[0] if len(polygons) == 1 else polygons,
+                "properties": {"name": geometry["name"]}
+            })
+        
+        return {
+            "type": "Topology",
+            "bbox": [round(float(v), 5) for v in self.bbox],
+            "transform": {"scale": scale.tolist(), "translate": translate.tolist()},
+            "objects": {"countries": {"type": "GeometryCollection", "geometries": geometries}},
+            "arcs": [quantize_arc(arc, translate, scale) for arc in simplified],
+            "point_count": int(sum(len(arc) for arc in simplified))
+        }
+
+def build_encoded_topologies(boundaries=None) -> List[Path]:
+    """Encode the boundaries at every resolution and write each next to them; run at build time"""
+    topology = BoundaryTopology.load(boundaries)
+    digest = boundaries_digest(boundaries)
+    written = []
+    for name, _, _, _ in MAP_RESOLUTIONS:
+        path = encoded_topology_path(name, boundaries)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(topology.encode(name), source=digest), f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        written.append(path)
+    return written
+
+class PrebuiltTopology:
+    """Encoded topologies read from the files build_encoded_topologies wrote
+    
+    A resolution whose file is missing, or was built from different
+    boundaries, is encoded in process instead (and a warning logged), so
+    the map still works before the build step has run.
+    """
+    
+    def __init__(self, boundaries=None):
+        self.boundaries = Path(boundaries or BOUNDARIES_FILE)
+        self.digest = boundaries_digest(self.boundaries)
+        
+        self._lock = threading.Lock()
+        self._encoded: Dict[str, Dict[str, Any]] = {}
+        self._fallback: Optional[BoundaryTopology] = None
+        self.stats = {"loads": 0, "fallbacks": 0}
+    
+    def encode(self, resolution: str) -> Dict[str, Any]:
+        """Encoded topology at one resolution (shared; do not mutate)"""
+        if resolution not in {name for name, _, _, _ in MAP_RESOLUTIONS}:
+            raise ValueError(f"Unknown map resolution '{resolution}'; expected one of {[r[0] for r in MAP_RESOLUTIONS]}")
+        
+        with self._lock:
+            if resolution not in self._encoded:
+                encoded = self._read(resolution)
+                if encoded is None:
+                    logger.warning(f"No prebuilt '{resolution}' topology for {self.boundaries.name}; encoding it now")
+                    if self._fallback is None:
+                        self._fallback = BoundaryTopology.load(self.boundaries)
+                    encoded = self._fallback.encode(resolution)
+                    self.stats["fallbacks"] += 1
+                else:
+                    self.stats["loads"] += 1
+                self._encoded[resolution] = encoded
+            return self._encoded[resolution]
+    
+    def _read(self, resolution: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(encoded_topology_path(resolution, self.boundaries), 'r', encoding='utf-8') as f:
+                encoded = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if encoded.pop("source", None) != self.digest:
+            return None
+        return encoded
+
+class ChoroplethMap:
+    """Encoded boundaries joined with per-country values, cached per (resolution, data version)"""
+    
+    def __init__(self, topology=None):
+        self.topology = topology if topology is not None else PrebuiltTopology()
+        
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._joined: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"joins": 0, "hits": 0}
+    
+    def render(self, resolution: str, load_values: Callable[[], Dict[str, Dict[str, Any]]],
+               version: str = None) -> Dict[str, Any]:
+        """Topology at a resolution with each country's values in its properties
+        
+        load_values is only called when the (resolution, version) pair is
+        not cached yet.
+        """
+        encoded = self.topology.encode(resolution)
+        with self._lock:
+            if version is None or version != self._version:
+                self._joined = {}
+                self._version = version
+            if version is not None and resolution in self._joined:
+                self.stats["hits"] += 1
+                return self._joined[resolution]
+            
+            values = load_values()
+            geometries = [
+                dict(geometry, properties=dict(geometry["properties"], **values.get(geometry["id"], {}),
+                                               has_strategy=geometry["id"] in values))
+                for geometry in encoded["objects"]["countries"]["geometries"]
+            ]
+            mapped = {geometry["id"] for geometry in geometries}
+            joined = dict(
+                {key: value for key, value in encoded.items() if key != "point_count"},
+                objects={"countries": {"type": "GeometryCollection", "geometries": geometries}},
+                metadata={
+                    "resolution": resolution,
+                    "arc_count": len(encoded["arcs"]),
+                    "point_count": encoded["point_count"],
+                    "countries_with_strategies": len(mapped & set(values)),
+                    "unmapped": sorted(set(values) - mapped)
+                }
+            )
+            self.stats["joins"] += 1
+            self._joined[resolution] = joined
+            return joined
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    for written in build_encoded_topologies():
+        logger.info(f"Wrote {written}")
@@ -0,0 +1,107 @@
+"""
+Frequent-itemset mining for African AI Strategies Portal
+Finds groups of countries that share whole sets of themes and sectors
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Any, Tuple, Iterable
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class FrequentItemset:
+    """A set of themes shared by a group of countries"""
+    items: Tuple[str, ...]
+    countries: List[str]
+    support: float
+    lift: float
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "themes": list(self.items),
+            "label": " + ".join(self.items),
+            "countries": self.countries,
+            "support": round(self.support, 3),
+            "lift": round(self.lift, 3)
+        }
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+class ItemsetMiner:
+    """Bitset-based frequent-itemset miner (depth-first Eclat over country bitsets)
+    
+    Each theme is represented by an integer bitset of the countries that
+    have it, so the support of any theme set is the popcount of an AND.
+    Only frequent prefixes are ever extended, and infrequent themes are
+    dropped before the search, so hundreds of themes stay tractable.
+    """
+    
+    def __init__(self, transactions: Dict[str, Iterable[str]]):
+        self.countries = list(transactions.keys())
+        self.n_transactions = len(self.countries)
+        
+        self.item_masks: Dict[str, int] = {}
+        for bit, country in enumerate(self.countries):
+            for item in transactions[country]:
+                self.item_masks[item] = self.item_masks.get(item, 0) | (1 << bit)
+    
+    def mine(self, min_support: float = 0.3, max_size: int = 4, min_size: int = 2,
+             max_itemsets: int = 1000) -> List[FrequentItemset]:
+        """Find theme sets shared by at least min_support of countries"""
+        if self.n_transactions == 0:
+            return []
+        
+        min_count = max(1, math.ceil(min_support * self.n_transactions))
+        item_support = {item: _popcount(mask) for item, mask in self.item_masks.items()}
+        
+        # Most frequent items first so shared prefixes are explored early
+        frequent = sorted(
+            (item for item, count in item_support.items() if count >= min_count),
+            key=lambda item: (-item_support[item], item)
+        )
+        
+        results: List[FrequentItemset] = []
+        stack: List[Tuple[Tuple[str, ...], int, int]] = [
+            ((item,), self.item_masks[item], i) for i, item in reversed(list(enumerate(frequent)))
+        ]
+        
+        while stack and len(results) < max_itemsets:
+            items, mask, last = stack.pop()
+            count = _popcount(mask)
+            
+            if len(items) >= min_size:
+                results.append(self._itemset(items, mask, count, item_support))
+            
+            if len(items) >= max_size:
+                continue
+            
+            extensions = []
+            for j in range(last + 1, len(frequent)):
+                extended = mask & self.item_masks[frequent[j]]
+                if _popcount(extended) >= min_count:
+                    extensions.append((items + (frequent[j],), extended, j))
+            stack.extend(reversed(extensions))
+        
+        if stack:
+            logger.info(f"Itemset mining stopped at {max_itemsets} itemsets; raise min_support to narrow")
+        
+        # Larger shared theme sets first, then by how many countries share them
+        results.sort(key=lambda r: (-len(r.items), -r.support, -r.lift, r.items))
+        return results
+    
+    def _itemset(self, items: Tuple[str, ...], mask: int, count: int,
+                 item_support: Dict[str, int]) -> FrequentItemset:
+        support = count / self.n_transactions
+        expected = 1.0
+        for item in items:
+            expected *= item_support[item] / self.n_transactions
+        
+        return FrequentItemset(
+            items=tuple(sorted(items)),
+            countries=[c for bit, c in enumerate(self.countries) if mask >> bit & 1],
+            support=support,
+            lift=support / expected if expected else 0.0
+        )
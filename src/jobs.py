@@ -0,0 +1,326 @@
+"""
+Background job runner for African AI Strategies Portal
+Persistent job queue in the strategies database, executed by worker threads
+"""
+
+import json
+import sqlite3
+import threading
+import uuid
+import hashlib
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Any, Optional, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+PENDING, RUNNING, SUCCEEDED, FAILED, CANCELLED = "pending", "running", "succeeded", "failed", "cancelled"
+
+# Seconds without a heartbeat after which a running job's worker is presumed dead
+DEFAULT_STALE_AFTER = 120.0
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation was requested"""
+
+class JobContext:
+    """Handed to job handlers for progress reporting and cooperative cancellation"""
+    
+    def __init__(self, store: 'JobStore', job_id: str):
+        self.store = store
+        self.job_id = job_id
+    
+    def progress(self, fraction: float, stage: str = None):
+        """Record progress; raises JobCancelled if the job has been cancelled"""
+        if self.store.update_progress(self.job_id, fraction, stage):
+            raise JobCancelled(self.job_id)
+    
+    @property
+    def cancelled(self) -> bool:
+        job = self.store.get(self.job_id)
+        return bool(job and job["cancel_requested"])
+
+def job_key(kind: str, params: Dict[str, Any]) -> str:
+    """Identity of a job: identical kind and parameters are the same work"""
+    return hashlib.sha1(json.dumps([kind, params], sort_keys=True).encode()).hexdigest()
+
+class JobStore:
+    """Job table in the SQLite database shared with StrategyDatabase"""
+    
+    def __init__(self, db_path: str = "data/strategies.db"):
+        self.db_path = db_path
+        self._init_table()
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def _init_table(self):
+        with self._connect() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    params_json TEXT NOT NULL,
+                    job_key TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress REAL DEFAULT 0,
+                    stage TEXT,
+                    result_json TEXT,
+                    error TEXT,
+                    cancel_requested INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    started_at TIMESTAMP,
+                    heartbeat_at TIMESTAMP,
+                    finished_at TIMESTAMP
+                )
+            ''')
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "heartbeat_at" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at TIMESTAMP")
+            # At most one pending or running job per key; identical submissions share it
+            conn.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS jobs_active_key
+                ON jobs (job_key) WHERE status IN ('pending', 'running')
+            ''')
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+    
+    def enqueue(self, kind: str, params: Dict[str, Any] = None) -> str:
+        """Add a job, or return the id of an identical job that is still pending or running"""
+        params = params or {}
+        key = job_key(kind, params)
+        job_id = uuid.uuid4().hex
+        
+        with self._connect() as conn:
+            try:
+                conn.execute(
+                    "INSERT INTO jobs (job_id, kind, params_json, job_key, status, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, kind, json.dumps(params), key, PENDING, datetime.now().isoformat())
+                )
+                return job_id
+            except sqlite3.IntegrityError:
+                row = conn.execute(
+                    "SELECT job_id FROM jobs WHERE job_key = ? AND status IN ('pending', 'running')", (key,)
+                ).fetchone()
+                if row is None:
+                    raise
+                return row["job_id"]
+    
+    def claim_next(self) -> Optional[Dict[str, Any]]:
+        """Atomically move the oldest pending job to running and return it"""
+        with self._connect() as conn:
+            while True:
+                row = conn.execute(
+                    "SELECT job_id FROM jobs WHERE status = ? ORDER BY created_at, rowid LIMIT 1", (PENDING,)
+                ).fetchone()
+                if row is None:
+                    return None
+                now = datetime.now().isoformat()
+                claimed = conn.execute(
+                    "UPDATE jobs SET status = ?, started_at = ?, heartbeat_at = ? WHERE job_id = ? AND status = ?",
+                    (RUNNING, now, now, row["job_id"], PENDING)
+                ).rowcount
+                if claimed:
+                    conn.commit()
+                    return self._row_dict(conn.execute("SELECT * FROM jobs WHERE job_id = ?", (row["job_id"],)).fetchone())
+    
+    def update_progress(self, job_id: str, fraction: float, stage: str = None) -> bool:
+        """Store progress; returns True if cancellation has been requested"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET progress = ?, stage = COALESCE(?, stage), heartbeat_at = ? WHERE job_id = ?",
+                (max(0.0, min(1.0, fraction)), stage, datetime.now().isoformat(), job_id)
+            )
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            return bool(row and row["cancel_requested"])
+    
+    def heartbeat(self, job_ids: List[str]):
+        """Mark running jobs as still owned by a live worker"""
+        if not job_ids:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE jobs SET heartbeat_at = ? WHERE job_id = ? AND status = ?",
+                [(datetime.now().isoformat(), job_id, RUNNING) for job_id in job_ids]
+            )
+    
+    def recover_stale(self, stale_after: float = DEFAULT_STALE_AFTER) -> int:
+        """Fail running jobs whose worker sent no heartbeat for stale_after seconds; returns how many
+        
+        A worker that crashed leaves its job running, and the unique active
+        key would then dedup every identical submission to the dead job.
+        Failing it frees the key, so the next submission starts afresh.
+        """
+        cutoff = (datetime.now() - timedelta(seconds=stale_after)).isoformat()
+        with self._connect() as conn:
+            recovered = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? "
+                "WHERE status = ? AND COALESCE(heartbeat_at, started_at, created_at) < ?",
+                (FAILED, f"Worker stopped responding for over {stale_after:g}s", datetime.now().isoformat(),
+                 RUNNING, cutoff)
+            ).rowcount
+        if recovered:
+            logger.warning(f"Marked {recovered} stale running job(s) failed")
+        return recovered
+    
+    def finish(self, job_id: str, status: str, result: Any = None, error: str = None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result_json = ?, error = ?, finished_at = ?, "
+                "progress = CASE WHEN ? = 'succeeded' THEN 1.0 ELSE progress END WHERE job_id = ?",
+                (status, json.dumps(result) if result is not None else None, error,
+                 datetime.now().isoformat(), status, job_id)
+            )
+    
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a pending job now, or ask a running one to stop; False if already finished"""
+        with self._connect() as conn:
+            if conn.execute(
+                "UPDATE jobs SET status = ?, cancel_requested = 1, finished_at = ? WHERE job_id = ? AND status = ?",
+                (CANCELLED, datetime.now().isoformat(), job_id, PENDING)
+            ).rowcount:
+                return True
+            return bool(conn.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE job_id = ? AND status = ?", (job_id, RUNNING)
+            ).rowcount)
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            return self._row_dict(row) if row else None
+    
+    def list_jobs(self, status: str = None, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            if status:
+                rows = conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?", (status, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+            return [self._row_dict(row) for row in rows]
+    
+    def _row_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["params"] = json.loads(job.pop("params_json"))
+        result_json = job.pop("result_json")
+        job["result"] = json.loads(result_json) if result_json is not None else None
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+class JobRunner:
+    """Runs queued jobs on background threads
+    
+    Handlers are registered per job kind and called as handler(params,
+    context); they report progress through context.progress(), which is
+    also where cancellation takes effect. Workers sleep until a job is
+    enqueued through this runner, and poll so jobs enqueued by other
+    processes sharing the database are picked up too. While a job runs, a
+    heartbeat thread keeps it marked live; jobs left running by a worker
+    that died are failed once they miss heartbeats for stale_after seconds.
+    """
+    
+    def __init__(self, store: JobStore, handlers: Dict[str, Callable[[Dict[str, Any], JobContext], Any]] = None,
+                 workers: int = 1, poll_interval: float = 2.0, stale_after: float = DEFAULT_STALE_AFTER):
+        self.store = store
+        self.handlers = dict(handlers or {})
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._active_lock = threading.Lock()
+        self._active: Set[str] = set()
+    
+    def register(self, kind: str, handler: Callable[[Dict[str, Any], JobContext], Any]):
+        self.handlers[kind] = handler
+    
+    def submit(self, kind: str, params: Dict[str, Any] = None) -> str:
+        """Enqueue a job (deduplicated against identical active jobs) and wake a worker"""
+        if kind not in self.handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+        job_id = self.store.enqueue(kind, params)
+        self._wakeup.set()
+        return job_id
+    
+    def start(self):
+        """Recover jobs orphaned by dead workers, then start worker threads if they are not running yet"""
+        self.store.recover_stale(self.stale_after)
+        self._threads = [t for t in self._threads if t.is_alive()]
+        self._stopping.clear()
+        for i in range(len(self._threads), self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if self._heartbeat_thread is None or not self._heartbeat_thread.is_alive():
+            self._heartbeat_thread = threading.Thread(target=self._beat, name="job-heartbeat", daemon=True)
+            self._heartbeat_thread.start()
+    
+    def stop(self, timeout: float = None):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        if self._heartbeat_thread is not None:
+            self._heartbeat_thread.join(timeout)
+            self._heartbeat_thread = None
+    
+    def run_pending(self) -> int:
+        """Run queued jobs on the calling thread until none are left; returns how many ran"""
+        ran = 0
+        while self.run_one():
+            ran += 1
+        return ran
+    
+    def run_one(self) -> bool:
+        job = self.store.claim_next()
+        if job is None:
+            return False
+        
+        job_id = job["job_id"]
+        handler = self.handlers.get(job["kind"])
+        if handler is None:
+            self.store.finish(job_id, FAILED, error=f"No handler registered for job kind '{job['kind']}'")
+            return True
+        
+        with self._active_lock:
+            self._active.add(job_id)
+        try:
+            result = handler(job["params"], JobContext(self.store, job_id))
+        except JobCancelled:
+            self.store.finish(job_id, CANCELLED)
+            logger.info(f"Job {job_id} ({job['kind']}) cancelled")
+        except Exception as e:
+            self.store.finish(job_id, FAILED, error=str(e))
+            logger.error(f"Job {job_id} ({job['kind']}) failed: {e}")
+        else:
+            self.store.finish(job_id, SUCCEEDED, result=result)
+        finally:
+            with self._active_lock:
+                self._active.discard(job_id)
+        return True
+    
+    def _work(self):
+        while not self._stopping.is_set():
+            try:
+                if self.run_one():
+                    continue
+            except Exception as e:
+                logger.error(f"Job worker error: {e}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+    
+    def _beat(self):
+        """Refresh heartbeats of this runner's jobs, and recover other workers' stale ones"""
+        interval = max(self.stale_after / 4, 0.1)
+        while not self._stopping.wait(interval):
+            try:
+                with self._active_lock:
+                    active = list(self._active)
+                self.store.heartbeat(active)
+                self.store.recover_stale(self.stale_after)
+            except Exception as e:
+                logger.error(f"Job heartbeat error: {e}")
@@ -3,6 +3,7 @@ Data models and database management for African AI Strategies Portal
 """
 
 import json
+import hashlib
 import sqlite3
 import os
 from datetime import datetime
@@ -10,6 +11,8 @@ from typing import List, Dict, Optional, Any
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
+from src.summary import DashboardSummary
+
 @dataclass
 class AIStrategy:
     """Data model for a country's AI strategy"""
@@ -76,6 +79,9 @@ class StrategyDatabase:
         self.processed_dir.mkdir(parents=True, exist_ok=True)
         self.analysis_dir.mkdir(parents=True, exist_ok=True)
         
+        # Dashboard summary, materialized on first use and then maintained by save_strategy
+        self._summary: Optional[DashboardSummary] = None
+        
         self._init_database()
         self._load_sample_data()
     
@@ -270,6 +276,7 @@ class StrategyDatabase:
     
     def save_strategy(self, strategy: AIStrategy):
         """Save or update a strategy in the database"""
+        updated_at = datetime.now().isoformat()
         with sqlite3.connect(self.db_path) as conn:
             conn.execute('''
                 INSERT OR REPLACE INTO strategies 
@@ -282,8 +289,33 @@ class StrategyDatabase:
                 strategy.publication_date,
                 strategy.status,
                 json.dumps(asdict(strategy)),
-                datetime.now().isoformat()
+                updated_at
             ))
+        
+        if self._summary is not None:
+            self._summary.apply(strategy.country_code, asdict(strategy), updated_at)
+    
+    @property
+    def summary(self) -> DashboardSummary:
+        """Materialized dashboard summary, built from the table once and then updated on every save"""
+        if self._summary is None:
+            summary = DashboardSummary()
+            with sqlite3.connect(self.db_path) as conn:
+                rows = conn.execute("SELECT country_code, data_json, updated_at FROM strategies").fetchall()
+            summary.apply_many((code, json.loads(data_json), updated_at) for code, data_json, updated_at in rows)
+            self._summary = summary
+        return self._summary
+    
+    @property
+    def version(self) -> str:
+        """Token that changes whenever a strategy row is saved or removed"""
+        with sqlite3.connect(self.db_path) as conn:
+            count, latest = conn.execute("SELECT COUNT(*), MAX(updated_at) FROM strategies").fetchone()
+        return hashlib.sha1(f"{count}:{latest}".encode()).hexdigest()[:16]
+    
+    def get_dashboard_summary(self) -> Dict[str, Any]:
+        """Dashboard statistics, top themes and sectors, and recent publications"""
+        return self.summary.record
     
     def get_country_strategy(self, country_code: str) -> Optional[Dict[str, Any]]:
         """Get strategy data for a specific country"""
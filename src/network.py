@@ -0,0 +1,214 @@
+"""
+Network level-of-detail engine for African AI Strategies Portal
+Community detection, cluster super-nodes and size budgets for network graphs
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Any, Tuple
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Node types drawn in preference to themes when a node budget is tight
+PRIMARY_NODE_TYPES = ("cluster", "country")
+
+def top_k_edges(weights: np.ndarray, k: int, min_weight: float = 1.0) -> List[Tuple[int, int, float]]:
+    """Edges (i, j, weight), i < j, that rank among the k strongest of either endpoint
+    
+    Replaces a fixed weight threshold: every node keeps its best
+    connections however sparse or dense the graph is, and there are at
+    most k·n edges in total. A single node can keep more than k, since
+    it also keeps every edge it is among the top k of the other end;
+    views cap their edge count separately. Ties go to the lower index.
+    """
+    count = len(weights)
+    if count < 2 or k <= 0:
+        return []
+    
+    scores = np.array(weights, dtype=float)
+    np.fill_diagonal(scores, -np.inf)
+    order = np.argsort(-scores, axis=1, kind='stable')[:, :k]
+    
+    keep = set()
+    for i in range(count):
+        for j in order[i]:
+            if scores[i, j] >= min_weight:
+                keep.add((min(i, int(j)), max(i, int(j))))
+    return [(i, j, float(weights[i][j])) for i, j in sorted(keep)]
+
+def label_propagation(nodes: List[str], edges: List[Tuple[str, str, float]], max_iter: int = 20) -> Dict[str, str]:
+    """Weighted label propagation; returns each node's community, named by its smallest member
+    
+    Nodes are visited in sorted order and take the label with the largest
+    total edge weight among their neighbours, keeping their current label
+    on ties and otherwise preferring the smallest, so the result is
+    deterministic.
+    """
+    adjacency = defaultdict(list)
+    for a, b, weight in edges:
+        adjacency[a].append((b, weight))
+        adjacency[b].append((a, weight))
+    
+    labels = {node: node for node in nodes}
+    for _ in range(max_iter):
+        changed = False
+        for node in sorted(nodes):
+            scores = defaultdict(float)
+            for neighbour, weight in adjacency.get(node, ()):
+                scores[labels[neighbour]] += weight
+            if not scores:
+                continue
+            best = max(scores.values())
+            if scores.get(labels[node]) == best:
+                continue
+            labels[node] = min(label for label, score in scores.items() if score == best)
+            changed = True
+        if not changed:
+            break
+    
+    members = defaultdict(list)
+    for node, label in labels.items():
+        members[label].append(node)
+    return {node: min(members[labels[node]]) for node in nodes}
+
+def bound_graph(nodes: List[Dict[str, Any]], links: List[Dict[str, Any]], max_nodes: int,
+                max_edges: int, top_k: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, int]]:
+    """Trim a graph to its budgets: strongest nodes first, then top-k links per node, then strongest links"""
+    strength = defaultdict(float)
+    for link in links:
+        strength[link["source"]] += link["value"]
+        strength[link["target"]] += link["value"]
+    
+    ranked = sorted(nodes, key=lambda n: (n["type"] not in PRIMARY_NODE_TYPES, -strength[n["id"]], n["id"]))
+    kept_nodes = ranked[:max_nodes]
+    kept_ids = {node["id"] for node in kept_nodes}
+    candidates = [link for link in links if link["source"] in kept_ids and link["target"] in kept_ids]
+    
+    by_node = defaultdict(list)
+    for position, link in enumerate(candidates):
+        by_node[link["source"]].append(position)
+        by_node[link["target"]].append(position)
+    selected = set()
+    for positions in by_node.values():
+        positions.sort(key=lambda p: -candidates[p]["value"])
+        selected.update(positions[:top_k])
+    
+    kept_links = sorted((candidates[p] for p in selected),
+                        key=lambda l: (-l["value"], l["source"], l["target"]))[:max_edges]
+    kept_nodes = [node for node in nodes if node["id"] in kept_ids]
+    return kept_nodes, kept_links, {
+        "nodes_dropped": len(nodes) - len(kept_nodes),
+        "links_dropped": len(links) - len(kept_links)
+    }
+
+class NetworkLOD:
+    """Cluster-level views of the country/theme network
+    
+    Countries are grouped by label propagation over the top-k similarity
+    graph. The overview replaces every multi-country community with one
+    super-node and sums the links of its members, so its size depends on
+    the number of communities rather than countries; expanding a cluster
+    returns just its members, their themes and their links to the rest of
+    the overview. Both views are trimmed to node and edge budgets.
+    """
+    
+    def __init__(self, graph: Dict[str, Any], top_k: int = 5):
+        self.top_k = top_k
+        
+        self.nodes = {node["id"]: node for node in graph["nodes"]}
+        self.links = graph["links"]
+        countries = sorted(node_id for node_id, node in self.nodes.items() if node["type"] == "country")
+        similarity = [(l["source"], l["target"], l["value"]) for l in self.links if l["type"] == "country_similarity"]
+        
+        community = label_propagation(countries, similarity)
+        self.cluster_of = {country: f"cluster_{community[country]}" for country in countries}
+        self.members: Dict[str, List[str]] = defaultdict(list)
+        for country in countries:
+            self.members[self.cluster_of[country]].append(country)
+        self.members = dict(self.members)
+        
+        # Where each country appears in the overview: its cluster, or itself when alone
+        self.display_id = {
+            country: cluster_id if len(members) > 1 else country
+            for cluster_id, members in self.members.items() for country in members
+        }
+        logger.debug(f"Grouped {len(countries)} countries into {len(self.members)} communities")
+    
+    def _display(self, node_id: str) -> str:
+        return self.display_id.get(node_id, node_id)
+    
+    def _cluster_node(self, cluster_id: str) -> Dict[str, Any]:
+        members = self.members[cluster_id]
+        first = self.nodes[members[0]]["name"]
+        return {
+            "id": cluster_id,
+            "name": f"{first} + {len(members) - 1} more",
+            "type": "cluster",
+            "group": 3,
+            "size": min(20 + 4 * len(members), 50),
+            "color": "#6C757D",
+            "members": members,
+            "member_count": len(members)
+        }
+    
+    def _aggregate_links(self, links: List[Dict[str, Any]], endpoint) -> List[Dict[str, Any]]:
+        """Sum link values after mapping endpoints, dropping links that collapse into one node"""
+        totals = {}
+        for link in links:
+            source, target = endpoint(link["source"]), endpoint(link["target"])
+            if source == target:
+                continue
+            if link["type"] == "country_similarity":
+                source, target = sorted((source, target))
+            key = (link["type"], source, target)
+            totals[key] = totals.get(key, 0) + link["value"]
+        return [{"source": s, "target": t, "value": v, "type": kind} for (kind, s, t), v in totals.items()]
+    
+    def _node_view(self, node_id: str) -> Dict[str, Any]:
+        if node_id in self.members:
+            return self._cluster_node(node_id)
+        node = dict(self.nodes[node_id])
+        if node["type"] == "country":
+            node["cluster"] = self.cluster_of[node_id]
+        return node
+    
+    def _view(self, node_ids: List[str], links: List[Dict[str, Any]], metadata: Dict[str, Any],
+              max_nodes: int, max_edges: int) -> Dict[str, Any]:
+        nodes = [self._node_view(node_id) for node_id in node_ids]
+        nodes, links, dropped = bound_graph(nodes, links, max_nodes, max_edges, self.top_k)
+        return {
+            "nodes": nodes,
+            "links": links,
+            "metadata": dict(metadata, total_nodes=len(nodes), total_connections=len(links), **dropped)
+        }
+    
+    def overview(self, max_nodes: int = 150, max_edges: int = 600) -> Dict[str, Any]:
+        """Communities as super-nodes alongside single countries and themes"""
+        links = self._aggregate_links(self.links, self._display)
+        node_ids = sorted(set(self.display_id.values())) + sorted(
+            node_id for node_id, node in self.nodes.items() if node["type"] != "country"
+        )
+        return self._view(node_ids, links, {
+            "level": "overview",
+            "total_countries": len(self.display_id),
+            "clusters": len([c for c in self.members.values() if len(c) > 1])
+        }, max_nodes, max_edges)
+    
+    def expand(self, cluster_id: str, max_nodes: int = 150, max_edges: int = 600) -> Dict[str, Any]:
+        """Members of one cluster, their themes, and their links to the rest of the overview"""
+        if cluster_id not in self.members:
+            raise KeyError(cluster_id)
+        members = set(self.members[cluster_id])
+        
+        def endpoint(node_id):
+            return node_id if node_id in members else self._display(node_id)
+        
+        touching = [l for l in self.links if l["source"] in members or l["target"] in members]
+        links = self._aggregate_links(touching, endpoint)
+        node_ids = sorted({l["source"] for l in links} | {l["target"] for l in links} | members)
+        return self._view(node_ids, links, {
+            "level": "cluster",
+            "cluster": cluster_id,
+            "members": sorted(members)
+        }, max_nodes, max_edges)
@@ -0,0 +1,169 @@
+"""
+Regional rollups for African AI Strategies Portal
+Country -> regional economic community -> continent aggregates of strategy features
+"""
+
+import json
+import threading
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+import logging
+
+from src.comparison import StrategyComparator
+from src.features import CountryFeatures
+
+logger = logging.getLogger(__name__)
+
+REGIONS_FILE = Path(__file__).resolve().parent.parent / "data" / "reference" / "regions.json"
+
+@dataclass
+class RegionNode:
+    """A regional economic community or the continent"""
+    code: str
+    name: str
+    level: str
+    members: List[str]
+
+class RegionHierarchy:
+    """Country -> REC -> continent membership from local reference data
+    
+    A country can belong to several RECs (the DRC and Tanzania are in both
+    EAC and SADC), so the hierarchy is a DAG; every country also rolls up
+    directly to the continent so overlapping memberships are not counted
+    twice there.
+    """
+    
+    def __init__(self, reference: Dict[str, Any]):
+        continent = reference["continent"]
+        self.country_names: Dict[str, str] = reference.get("countries", {})
+        self.continent = RegionNode(continent["code"], continent["name"], "continent", sorted(self.country_names))
+        
+        self.nodes: Dict[str, RegionNode] = {}
+        self._parents: Dict[str, List[str]] = {}
+        for region in reference.get("regions", []):
+            node = RegionNode(region["code"], region["name"], "rec", sorted(region["members"]))
+            self.nodes[node.code] = node
+            for country in node.members:
+                self._parents.setdefault(country, []).append(node.code)
+        self.nodes[self.continent.code] = self.continent
+    
+    @classmethod
+    def load(cls, path=None) -> 'RegionHierarchy':
+        """Read the hierarchy from a reference JSON file"""
+        with open(path or REGIONS_FILE, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+    
+    def ancestors(self, country_code: str) -> List[str]:
+        """RECs of a country followed by the continent"""
+        return self._parents.get(country_code, []) + [self.continent.code]
+
+@dataclass
+class RegionAggregate:
+    """Theme, sector, budget and status totals over the strategies in a region"""
+    countries: set = field(default_factory=set)
+    themes: Counter = field(default_factory=Counter)
+    sectors: Counter = field(default_factory=Counter)
+    statuses: Counter = field(default_factory=Counter)
+    budget: float = 0.0
+    
+    def add(self, country_code: str, features: CountryFeatures, sign: int = 1):
+        """Add (sign=1) or retract (sign=-1) one country's contribution"""
+        if sign > 0:
+            self.countries.add(country_code)
+        else:
+            self.countries.discard(country_code)
+        
+        delta = {"themes": Counter(features.themes), "sectors": Counter(features.sectors),
+                 "statuses": Counter([features.status or "unknown"])}
+        for name, counts in delta.items():
+            totals = getattr(self, name)
+            if sign > 0:
+                totals.update(counts)
+            else:
+                totals.subtract(counts)
+                for key in counts:
+                    if totals[key] <= 0:
+                        del totals[key]
+        self.budget += sign * features.budget
+
+def _top_counts(counts: Counter, top_n: int) -> List[Dict[str, Any]]:
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:top_n]
+    return [{"name": name, "count": count} for name, count in ranked]
+
+class RegionalRollup:
+    """Precomputed aggregates for every node of the region hierarchy
+    
+    The full build is one bottom-up pass: each country's features are
+    added to the aggregates of its RECs and the continent. When a single
+    strategy changes, only its old contribution is retracted from and its
+    new one added to those few ancestors, so regional dashboards never
+    iterate member strategies.
+    """
+    
+    def __init__(self, hierarchy: RegionHierarchy, comparator: StrategyComparator = None):
+        self.hierarchy = hierarchy
+        self.comparator = comparator if comparator is not None else StrategyComparator()
+        
+        self._lock = threading.RLock()
+        self.aggregates: Dict[str, RegionAggregate] = {code: RegionAggregate() for code in hierarchy.nodes}
+        self._contributions: Dict[str, CountryFeatures] = {}
+        self._content_keys: Dict[str, Optional[str]] = {}
+        
+        self.stats = {"updates": 0}
+    
+    def update_country(self, country_code: str, features: Optional[CountryFeatures]):
+        """Replace one country's contribution; None removes it"""
+        with self._lock:
+            ancestors = self.hierarchy.ancestors(country_code)
+            previous = self._contributions.pop(country_code, None)
+            if previous is not None:
+                for node in ancestors:
+                    self.aggregates[node].add(country_code, previous, sign=-1)
+            if features is not None:
+                for node in ancestors:
+                    self.aggregates[node].add(country_code, features)
+                self._contributions[country_code] = features
+            self.stats["updates"] += 1
+    
+    def sync(self, strategies: Mapping):
+        """Apply only the countries whose strategy file changed since the last sync"""
+        with self._lock:
+            codes = set(strategies.keys())
+            for code in sorted(set(self._contributions) - codes):
+                self.update_country(code, None)
+                self._content_keys.pop(code, None)
+            
+            for code in sorted(codes):
+                entry = self.comparator.country_entry(strategies, code)
+                if entry.content_key is None or self._content_keys.get(code) != entry.content_key:
+                    self.update_country(code, entry.features)
+                    self._content_keys[code] = entry.content_key
+    
+    def region_summary(self, region_code: str, top_n: int = 10) -> Dict[str, Any]:
+        """Dashboard view of one region, read from its precomputed aggregate"""
+        node = self.hierarchy.nodes.get(region_code)
+        if node is None:
+            raise KeyError(region_code)
+        
+        aggregate = self.aggregates[region_code]
+        return {
+            "code": node.code,
+            "name": node.name,
+            "level": node.level,
+            "member_count": len(node.members),
+            "countries": sorted(aggregate.countries),
+            "strategy_count": len(aggregate.countries),
+            "coverage": round(len(aggregate.countries) / len(node.members), 3) if node.members else 0.0,
+            "status_counts": dict(aggregate.statuses),
+            "total_budget_usd_millions": round(aggregate.budget, 3),
+            "top_themes": _top_counts(aggregate.themes, top_n),
+            "top_sectors": _top_counts(aggregate.sectors, top_n)
+        }
+    
+    def summaries(self, top_n: int = 10) -> List[Dict[str, Any]]:
+        """Summaries of every REC followed by the continent"""
+        codes = sorted(c for c in self.hierarchy.nodes if c != self.hierarchy.continent.code)
+        return [self.region_summary(code, top_n) for code in codes + [self.hierarchy.continent.code]]
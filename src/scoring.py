@@ -0,0 +1,150 @@
+"""
+Readiness scoring engine for African AI Strategies Portal
+Composite, weight-configurable AI-readiness scores and country rankings
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
+import logging
+
+from src.comparison import StrategyComparator
+from src.features import CountryFeatures, GOVERNANCE_ROLES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WEIGHTS = {
+    "theme_coverage": 0.25,
+    "sector_breadth": 0.15,
+    "budget": 0.2,
+    "governance": 0.15,
+    "partners": 0.1,
+    "timeline": 0.15
+}
+
+SCORE_COMPONENTS = tuple(DEFAULT_WEIGHTS.keys())
+
+def parse_weights(spec: Optional[str]) -> Dict[str, float]:
+    """Parse 'budget:2,governance:1' into weights normalized to sum to 1
+    
+    Components that are not named keep weight 0; an empty spec gives the
+    default profile.
+    """
+    if not spec:
+        return dict(DEFAULT_WEIGHTS)
+    
+    weights = dict.fromkeys(SCORE_COMPONENTS, 0.0)
+    for part in spec.split(','):
+        if not part.strip():
+            continue
+        name, sep, value = part.partition(':')
+        name = name.strip()
+        if name not in weights:
+            raise ValueError(f"Unknown score component '{name}'; expected one of {list(SCORE_COMPONENTS)}")
+        try:
+            weight = float(value) if sep else 1.0
+        except ValueError:
+            raise ValueError(f"Weight for '{name}' must be a number, got '{value}'")
+        if weight < 0 or not np.isfinite(weight):
+            raise ValueError(f"Weight for '{name}' must be a non-negative number")
+        weights[name] = weight
+    
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("At least one weight must be positive")
+    return {name: weight / total for name, weight in weights.items()}
+
+def raw_components(features: CountryFeatures) -> List[float]:
+    """Unnormalized score inputs of one country, in SCORE_COMPONENTS order"""
+    horizon = features.period[1] - features.period[0] + 1 if features.period else 0
+    return [
+        float(len(features.themes)),
+        float(len(features.sectors)),
+        float(np.log1p(features.budget)),
+        len(features.governance_roles) / len(GOVERNANCE_ROLES),
+        float(features.partner_count),
+        float(horizon)
+    ]
+
+class ReadinessScorer:
+    """Ranks countries by a weighted sum of normalized strategy features
+    
+    The raw country x component matrix is built once per data version from
+    the comparator's cached per-country features, and normalized for all
+    countries at once by dividing each column by its maximum (budgets are
+    log-scaled first). A ranking is then one matrix-vector product, and
+    finished rankings are memoized per (weight profile, data version).
+    """
+    
+    def __init__(self, comparator: StrategyComparator = None, max_profiles: int = 64):
+        self.comparator = comparator if comparator is not None else StrategyComparator()
+        self.max_profiles = max_profiles
+        
+        self._lock = threading.RLock()
+        self._matrix_version: Optional[str] = None
+        self._countries: List[str] = []
+        self._names: List[str] = []
+        self._normalized = np.zeros((0, len(SCORE_COMPONENTS)))
+        self._rankings: "OrderedDict[Tuple[Tuple[float, ...], Optional[str]], List[Dict[str, Any]]]" = OrderedDict()
+        
+        self.stats = {"hits": 0, "computed": 0, "matrix_builds": 0}
+    
+    def _feature_matrix(self, strategies: Mapping, version: Optional[str]) -> np.ndarray:
+        """Normalized country x component matrix, rebuilt only when the data version changes"""
+        if version is not None and version == self._matrix_version:
+            return self._normalized
+        
+        self.comparator.sync(strategies, version)
+        countries = sorted(strategies.keys())
+        features = [self.comparator.country_entry(strategies, code).features for code in countries]
+        raw = np.array([raw_components(f) for f in features], dtype=float).reshape(len(countries), len(SCORE_COMPONENTS))
+        
+        maxima = raw.max(axis=0) if len(countries) else np.ones(len(SCORE_COMPONENTS))
+        maxima[maxima <= 0] = 1.0
+        
+        self._countries = countries
+        self._names = [f.country_name or code for f, code in zip(features, countries)]
+        self._normalized = raw / maxima
+        self._matrix_version = version
+        self.stats["matrix_builds"] += 1
+        return self._normalized
+    
+    def rank(self, strategies: Mapping, weights: Dict[str, float] = None,
+             version: str = None) -> List[Dict[str, Any]]:
+        """Countries ranked by composite score (0-100), with per-component scores"""
+        weights = weights or DEFAULT_WEIGHTS
+        profile = tuple(round(float(weights.get(name, 0.0)), 6) for name in SCORE_COMPONENTS)
+        key = (profile, version)
+        
+        with self._lock:
+            if version is not None and key in self._rankings:
+                self._rankings.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._rankings[key]
+            
+            normalized = self._feature_matrix(strategies, version)
+            scores = normalized @ np.array(profile) * 100.0
+            order = np.lexsort((np.array(self._countries, dtype=str), -scores))
+            
+            ranking = [
+                {
+                    "rank": rank,
+                    "country_code": self._countries[i],
+                    "country_name": self._names[i],
+                    "score": round(float(scores[i]), 2),
+                    "components": {
+                        name: round(float(value) * 100.0, 2) for name, value in zip(SCORE_COMPONENTS, normalized[i])
+                    }
+                }
+                for rank, i in enumerate(order, start=1)
+            ]
+            self.stats["computed"] += 1
+            
+            if version is not None:
+                self._rankings[key] = ranking
+                while len(self._rankings) > self.max_profiles:
+                    self._rankings.popitem(last=False)
+        
+        return ranking
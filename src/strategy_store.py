@@ -0,0 +1,314 @@
+"""
+Strategy storage for African AI Strategies Portal
+Lazy, size-bounded access to processed strategy files
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Any, Optional, Iterator, Tuple
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+# Seconds a computed version token is trusted before every file is stat-ed again; 0 checks on each call
+DEFAULT_VERSION_TTL = 0.0
+
+@dataclass
+class CacheEntry:
+    """A parsed strategy together with the file state it was parsed from"""
+    strategy: Dict[str, Any]
+    mtime_ns: int
+    size: int
+
+class StrategySnapshot(Mapping):
+    """Read-only view of every strategy as of one data version
+    
+    The snapshot fixes the version token and the set of codes but pins no
+    documents: each lookup goes through the provider's LRU cache, so its
+    byte budget still bounds memory. Files were revalidated when the
+    version was taken, so a cached document is returned without another
+    stat, and one evicted since is parsed again. Documents are shared with
+    the provider cache (which replaces rather than mutates them on
+    reload), so consumers must treat them as read-only.
+    """
+    
+    def __init__(self, version: str, codes: List[str], load: Callable[[str], Optional[Dict[str, Any]]],
+                 revision: Callable[[str], Optional[Tuple[int, int]]] = None):
+        self.version = version
+        self._codes = tuple(codes)
+        self._members = frozenset(codes)
+        self._load = load
+        self._revision = revision
+    
+    def __getitem__(self, country_code: str) -> Dict[str, Any]:
+        strategy = self._load(country_code) if country_code in self._members else None
+        if strategy is None:
+            raise KeyError(country_code)
+        return strategy
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._codes)
+    
+    def __len__(self) -> int:
+        return len(self._codes)
+    
+    def __contains__(self, country_code) -> bool:
+        return country_code in self._members
+    
+    def revision(self, country_code: str) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the file a strategy is read from; changes whenever the document does"""
+        return self._revision(country_code) if self._revision is not None else None
+
+def document_key(strategies: Mapping, country_code: str) -> Any:
+    """Token that changes when a strategy changes: its file revision when the mapping tracks one, else the document"""
+    revision = getattr(strategies, 'revision', None)
+    key = revision(country_code) if revision is not None else None
+    return key if key is not None else strategies[country_code]
+
+class StrategyProvider(Mapping):
+    """Read-only mapping of country code to strategy, parsed on demand
+    
+    Only the index of available codes is built up front. Strategies are
+    parsed on first access and kept in an LRU cache bounded by file size,
+    and every access revalidates the cached copy against the file's mtime.
+    The version token stats every file, so a server can trust it for
+    version_ttl seconds; edits are then seen within that window.
+    """
+    
+    def __init__(self, processed_dir, max_bytes: int = DEFAULT_CACHE_BYTES,
+                 version_ttl: float = DEFAULT_VERSION_TTL):
+        self.processed_dir = Path(processed_dir)
+        self.max_bytes = max_bytes
+        self.version_ttl = version_ttl
+        
+        self._lock = threading.RLock()
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._cache_bytes = 0
+        self._index: Dict[str, Path] = {}
+        self._index_mtime_ns: Optional[int] = None
+        self._hashes: Dict[str, Tuple[int, int, str]] = {}
+        self._snapshot: Optional[StrategySnapshot] = None
+        self._version: Optional[Tuple[float, str]] = None
+        self._last_version: Optional[str] = None
+        self._listeners: List[Callable[[str], None]] = []
+        
+        # Counters for monitoring cache effectiveness
+        self.stats = {"hits": 0, "loads": 0, "evictions": 0, "snapshots": 0}
+    
+    def _refresh_index(self) -> Dict[str, Path]:
+        """Rescan the directory listing only when the directory itself changed"""
+        try:
+            mtime_ns = self.processed_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._index, self._index_mtime_ns = {}, None
+            return self._index
+        
+        if mtime_ns != self._index_mtime_ns:
+            index = {}
+            for strategy_file in sorted(self.processed_dir.glob("strategy_*.json")):
+                index[strategy_file.stem.split("_")[1]] = strategy_file
+            self._index, self._index_mtime_ns = index, mtime_ns
+            
+            for code in list(self._cache.keys()):
+                if code not in index:
+                    self._evict(code)
+        
+        return self._index
+    
+    def codes(self) -> List[str]:
+        """Country codes with a processed strategy, without loading any file"""
+        with self._lock:
+            return list(self._refresh_index().keys())
+    
+    def __getitem__(self, country_code: str) -> Dict[str, Any]:
+        strategy = self.get(country_code)
+        if strategy is None:
+            raise KeyError(country_code)
+        return strategy
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.codes())
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._refresh_index())
+    
+    def __contains__(self, country_code) -> bool:
+        with self._lock:
+            return country_code in self._refresh_index()
+    
+    def get(self, country_code: str, default: Any = None, revalidate: bool = True) -> Optional[Dict[str, Any]]:
+        """Get a strategy, parsing its file only if it is not cached or has changed
+        
+        With revalidate=False a cached copy is returned without checking the
+        file, for callers that have just validated it through version.
+        """
+        with self._lock:
+            entry = self._cache.get(country_code)
+            if entry is not None and not revalidate:
+                self._cache.move_to_end(country_code)
+                self.stats["hits"] += 1
+                return entry.strategy
+            
+            path = self._refresh_index().get(country_code)
+            if path is None:
+                return default
+            
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                self._evict(country_code)
+                self._version = None
+                return default
+            
+            if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+                self._cache.move_to_end(country_code)
+                self.stats["hits"] += 1
+                return entry.strategy
+            if entry is not None:
+                # The file changed since it was cached, so the version token has too
+                self._version = None
+            
+            try:
+                with open(path, 'r') as f:
+                    strategy = json.load(f)
+            except Exception as e:
+                logger.error(f"Error loading strategy file {path}: {e}")
+                return default
+            
+            self._evict(country_code)
+            self._cache[country_code] = CacheEntry(strategy, stat.st_mtime_ns, stat.st_size)
+            self._cache_bytes += stat.st_size
+            self.stats["loads"] += 1
+            
+            # Evict least recently used entries, always keeping the one just loaded
+            while self._cache_bytes > self.max_bytes and len(self._cache) > 1:
+                self._evict(next(iter(self._cache)))
+                self.stats["evictions"] += 1
+            
+            return strategy
+    
+    def _evict(self, country_code: str):
+        entry = self._cache.pop(country_code, None)
+        if entry is not None:
+            self._cache_bytes -= entry.size
+    
+    def invalidate(self, country_code: str = None):
+        """Drop one cached strategy, or everything including the index"""
+        with self._lock:
+            if country_code is None:
+                self._cache.clear()
+                self._cache_bytes = 0
+                self._index_mtime_ns = None
+            else:
+                self._evict(country_code)
+            self._version = None
+    
+    def content_hash(self, country_code: str) -> Optional[str]:
+        """SHA-256 of a strategy file's bytes, recomputed only when the file changes"""
+        with self._lock:
+            path = self._refresh_index().get(country_code)
+            if path is None:
+                return None
+            
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                self._hashes.pop(country_code, None)
+                return None
+            cached = self._hashes.get(country_code)
+            if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                return cached[2]
+            
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            self._hashes[country_code] = (stat.st_mtime_ns, stat.st_size, digest)
+            return digest
+    
+    @property
+    def cached_bytes(self) -> int:
+        return self._cache_bytes
+    
+    def revision(self, country_code: str) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of a strategy's file as it is now on disk"""
+        with self._lock:
+            path = self._refresh_index().get(country_code)
+            try:
+                stat = path.stat() if path is not None else None
+            except FileNotFoundError:
+                return None
+            return (stat.st_mtime_ns, stat.st_size) if stat is not None else None
+    
+    def _snapshot_revision(self, country_code: str) -> Optional[Tuple[int, int]]:
+        """Revision of the document a snapshot serves: the cached entry's, since snapshots skip revalidation"""
+        with self._lock:
+            entry = self._cache.get(country_code)
+            if entry is not None:
+                return entry.mtime_ns, entry.size
+        return self.revision(country_code)
+    
+    def add_listener(self, callback: Callable[[str], None]):
+        """Call callback(version) whenever a newly computed version token differs from the last one"""
+        with self._lock:
+            self._listeners.append(callback)
+    
+    @property
+    def version(self) -> str:
+        """Token that changes whenever any strategy file is added, removed or modified
+        
+        Computing it stats every file; the token is reused for version_ttl
+        seconds, and sooner recomputed if a load finds a changed file.
+        Listeners are told about each new token, outside the lock.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._version is not None and now - self._version[0] < self.version_ttl:
+                return self._version[1]
+            
+            digest = hashlib.sha1()
+            for code, path in self._refresh_index().items():
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                digest.update(f"{code}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+            self._version = (now, digest.hexdigest()[:16])
+            version = self._version[1]
+            changed = version != self._last_version
+            self._last_version = version
+            listeners = list(self._listeners) if changed else []
+        
+        for callback in listeners:
+            try:
+                callback(version)
+            except Exception as e:
+                logger.error(f"Strategy version listener failed: {e}")
+        return version
+    
+    def snapshot(self) -> StrategySnapshot:
+        """View of all strategies at the current version, rebuilt only when a file changed
+        
+        Building a new snapshot loads each file through the cache once, to
+        revalidate it and leave out unreadable ones; unchanged cached files
+        are not parsed again, and the snapshot keeps no documents itself.
+        The version is taken before the lock, so its listeners never run
+        while strategy reads are blocked.
+        """
+        version = self.version
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != version:
+                codes = [code for code in self.codes() if self.get(code) is not None]
+                self._snapshot = StrategySnapshot(
+                    version, codes,
+                    load=lambda code: self.get(code, revalidate=False),
+                    revision=self._snapshot_revision
+                )
+                self.stats["snapshots"] += 1
+            return self._snapshot
@@ -0,0 +1,111 @@
+"""
+Streaming JSON serializer for African AI Strategies Portal
+Incremental JSON encoding of large payloads from generators
+"""
+
+import json
+import dataclasses
+from collections.abc import Iterator
+from datetime import date
+from typing import Any, Iterable
+import logging
+
+import numpy as np
+from flask import Response, stream_with_context
+
+logger = logging.getLogger(__name__)
+
+# Bytes buffered before a chunk is handed to the server
+CHUNK_SIZE = 16 * 1024
+
+# Array elements encoded together in one piece
+BATCH_SIZE = 256
+
+def _default(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+# Same key order and escaping as Flask's jsonify outside debug mode
+_encoder = json.JSONEncoder(ensure_ascii=True, sort_keys=True, separators=(',', ':'), default=_default)
+
+def _batches(items: Iterable[Any], batch_size: int) -> Iterator[str]:
+    """Array elements encoded batch_size at a time; nested iterators are streamed in between"""
+    batch, first = [], True
+    for item in items:
+        if isinstance(item, (Iterator, np.ndarray)):
+            if batch:
+                yield ('' if first else ',') + _encoder.encode(batch)[1:-1]
+                batch, first = [], False
+            if not first:
+                yield ','
+            yield from iter_json(item, batch_size)
+            first = False
+            continue
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield ('' if first else ',') + _encoder.encode(batch)[1:-1]
+            batch, first = [], False
+    if batch:
+        yield ('' if first else ',') + _encoder.encode(batch)[1:-1]
+
+def iter_json(value: Any, batch_size: int = BATCH_SIZE) -> Iterator[str]:
+    """JSON text of a value in pieces, consuming generators, iterators and NumPy arrays as arrays
+    
+    Objects, arrays and iterators are walked; array elements that are not
+    themselves iterators are encoded batch_size at a time, so the largest
+    string built is one batch of nodes, links, cells or numbers rather
+    than the whole payload.
+    """
+    if isinstance(value, dict):
+        yield '{'
+        for i, key in enumerate(sorted(value)):
+            yield (',' if i else '') + _encoder.encode(str(key)) + ':'
+            yield from iter_json(value[key], batch_size)
+        yield '}'
+    elif isinstance(value, np.ndarray):
+        yield '['
+        for start in range(0, len(value), batch_size):
+            yield (',' if start else '') + _encoder.encode(value[start:start + batch_size].tolist())[1:-1]
+        yield ']'
+    elif isinstance(value, (list, tuple, Iterator)):
+        yield '['
+        yield from _batches(value, batch_size)
+        yield ']'
+    else:
+        yield _encoder.encode(value)
+
+def chunked(pieces: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """UTF-8 chunks of about chunk_size bytes"""
+    buffer, size = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield ''.join(buffer).encode('utf-8')
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+def _sent(first: bytes, rest: Iterator[bytes]) -> Iterator[bytes]:
+    yield first
+    try:
+        yield from rest
+    except Exception:
+        # The status is already sent; re-raising makes the server abort the response instead of
+        # ending it cleanly, so clients see a failed transfer rather than a short 200 body
+        logger.exception("Streamed JSON response failed after its first chunk")
+        raise
+
+def stream_json(payload: Any, status: int = 200, chunk_size: int = CHUNK_SIZE) -> Response:
+    """Streaming application/json response; generators in the payload are consumed as it is sent
+    
+    The first chunk is encoded before the response is returned, so a
+    payload that fails early (or is smaller than one chunk) raises here
+    and becomes an ordinary error response.
+    """
+    body = chunked(iter_json(payload), chunk_size)
+    first = next(body, b'')
+    return Response(stream_with_context(_sent(first, body)), status=status, mimetype='application/json')
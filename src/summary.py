@@ -0,0 +1,165 @@
+"""
+Dashboard summary for African AI Strategies Portal
+Materialized statistics maintained incrementally as strategies are written
+"""
+
+import heapq
+import threading
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Any, Iterable, Optional, Set, Tuple
+import logging
+
+from src.features import extract_strategy_themes, sector_names
+from src.strategy_store import document_key
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class SummaryContribution:
+    """What one strategy adds to the dashboard summary"""
+    status: str
+    country_name: str
+    themes: Set[str] = field(default_factory=set)
+    sectors: Set[str] = field(default_factory=set)
+    recent: Optional[Dict[str, Any]] = None
+
+def _retract(counts: Counter, items):
+    counts.subtract(items)
+    for item in items:
+        if counts[item] <= 0:
+            del counts[item]
+
+class DashboardSummary:
+    """Materialized dashboard record, maintained on every strategy write
+    
+    Statuses, themes and sectors are kept as reference counts, so a write
+    retracts the strategy's previous contribution and adds its new one
+    without touching other strategies; a theme disappears when its last
+    reference goes. The most recent publications are a bounded min-heap
+    of (date, country) that is only rebuilt when one of its members is
+    retracted. The finished record is rebuilt after each write, so reading
+    the dashboard is a single attribute access.
+    """
+    
+    def __init__(self, top_n: int = 5, top_items: int = 8,
+                 extract_themes: Callable[[Dict[str, Any]], Set[str]] = extract_strategy_themes):
+        self.top_n = top_n
+        self.top_items = top_items
+        self.extract_themes = extract_themes
+        
+        self._lock = threading.RLock()
+        self._contributions: Dict[str, SummaryContribution] = {}
+        self._revisions: Dict[str, Any] = {}
+        self._statuses: Counter = Counter()
+        self._themes: Counter = Counter()
+        self._sectors: Counter = Counter()
+        self._recent: List[Tuple[str, str]] = []
+        self.last_updated: Optional[str] = None
+        
+        self.stats = {"updates": 0, "heap_rebuilds": 0}
+        self.record: Dict[str, Any] = self._materialize()
+    
+    def _contribution(self, code: str, strategy: Dict[str, Any]) -> SummaryContribution:
+        themes = set(self.extract_themes(strategy))
+        themes.discard('')
+        recent = None
+        if strategy.get('publication_date'):
+            recent = {
+                "country": strategy.get('country_name', code),
+                "country_code": code,
+                "date": strategy['publication_date'],
+                "title": strategy.get('strategy_title', 'AI Strategy')
+            }
+        return SummaryContribution(strategy.get('status', 'unknown'), strategy.get('country_name', code),
+                                   themes, set(sector_names(strategy)), recent)
+    
+    def apply(self, country_code: str, strategy: Optional[Dict[str, Any]], updated_at: str = None):
+        """Replace one country's contribution (None removes it) and re-materialize the record"""
+        with self._lock:
+            self._apply(country_code, strategy, updated_at)
+            self.record = self._materialize()
+    
+    def apply_many(self, entries: Iterable[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]):
+        """Apply (country_code, strategy, updated_at) entries and materialize once"""
+        with self._lock:
+            for country_code, strategy, updated_at in entries:
+                self._apply(country_code, strategy, updated_at)
+            self.record = self._materialize()
+    
+    def _apply(self, country_code: str, strategy: Optional[Dict[str, Any]], updated_at: str = None):
+        previous = self._contributions.pop(country_code, None)
+        if previous is not None:
+            _retract(self._statuses, [previous.status])
+            _retract(self._themes, previous.themes)
+            _retract(self._sectors, previous.sectors)
+            if previous.recent and (previous.recent["date"], country_code) in self._recent:
+                self._rebuild_recent()
+        
+        if strategy is not None:
+            contribution = self._contribution(country_code, strategy)
+            self._contributions[country_code] = contribution
+            self._statuses[contribution.status] += 1
+            self._themes.update(contribution.themes)
+            self._sectors.update(contribution.sectors)
+            if contribution.recent:
+                entry = (contribution.recent["date"], country_code)
+                if len(self._recent) < self.top_n:
+                    heapq.heappush(self._recent, entry)
+                elif entry > self._recent[0]:
+                    heapq.heapreplace(self._recent, entry)
+        
+        if updated_at and (self.last_updated is None or updated_at > self.last_updated):
+            self.last_updated = updated_at
+        self.stats["updates"] += 1
+    
+    def _rebuild_recent(self):
+        """Refill the recent heap from the remaining contributions after one of its members left"""
+        entries = [(c.recent["date"], code) for code, c in self._contributions.items() if c.recent]
+        self._recent = heapq.nlargest(self.top_n, entries)
+        heapq.heapify(self._recent)
+        self.stats["heap_rebuilds"] += 1
+    
+    def sync(self, strategies: Mapping):
+        """Apply only the countries whose strategy changed since the last sync, by file revision where known"""
+        with self._lock:
+            changed = False
+            for code in sorted(set(self._revisions) - set(strategies.keys())):
+                self._apply(code, None)
+                del self._revisions[code]
+                changed = True
+            
+            for code in sorted(strategies.keys()):
+                key, previous = document_key(strategies, code), self._revisions.get(code)
+                if previous is None or (previous is not key and previous != key):
+                    self._apply(code, strategies[code])
+                    self._revisions[code] = key
+                    changed = True
+            
+            if changed:
+                self.record = self._materialize()
+    
+    def _top(self, counts: Counter) -> List[str]:
+        return [name for name, _ in heapq.nsmallest(self.top_items, counts.items(), key=lambda i: (-i[1], i[0]))]
+    
+    def _materialize(self) -> Dict[str, Any]:
+        recent = sorted(self._recent, reverse=True)
+        return {
+            "statistics": {
+                "total_countries": len(self._contributions),
+                "published_strategies": self._statuses.get('published', 0),
+                "draft_strategies": self._statuses.get('draft', 0),
+                "total_themes": len(self._themes),
+                "total_sectors": len(self._sectors)
+            },
+            "status_counts": dict(self._statuses),
+            "top_themes": self._top(self._themes),
+            "top_sectors": self._top(self._sectors),
+            "recent_updates": [self._contributions[code].recent for _, code in recent],
+            "country_status": [
+                {"country": c.country_name, "country_code": code, "status": c.status}
+                for code, c in sorted(self._contributions.items())
+            ],
+            "last_updated": self.last_updated
+        }
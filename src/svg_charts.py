@@ -0,0 +1,276 @@
+"""
+Static chart renderer for African AI Strategies Portal
+Server-side SVG snapshots of visualization engine outputs for embedding and no-JS clients
+"""
+
+import math
+import multiprocessing
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape, quoteattr
+from typing import Dict, List, Any, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+SVG_CHARTS = ("network", "heatmap", "timeline", "sectors")
+
+DEFAULT_SIZE = (960, 600)
+
+# Charts are drawn at sizes snapped to this grid, within these limits; the viewBox scales them for display
+SIZE_STEP = (160, 100)
+SIZE_LIMITS = ((320, 1920), (200, 1500))
+
+DATE_PREFIX = re.compile(r"(\d{4})(?:-(\d{2}))?(?:-(\d{2}))?")
+
+def snap_size(width: int, height: int) -> Tuple[int, int]:
+    """Nearest size on the rendering grid, so arbitrary requested sizes share a few snapshots"""
+    return tuple(
+        min(max(int(round(value / step)) * step, low), high)
+        for value, step, (low, high) in zip((width, height), SIZE_STEP, SIZE_LIMITS)
+    )
+
+def _svg(width: int, height: int, body: List[str]) -> str:
+    return "".join([
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="sans-serif" font-size="11">',
+        *body,
+        "</svg>"
+    ])
+
+def _text(x: float, y: float, text: Any, **attrs) -> str:
+    extra = "".join(f' {name.replace("_", "-")}={quoteattr(str(value))}' for name, value in attrs.items())
+    return f'<text x="{x:.1f}" y="{y:.1f}"{extra}>{escape(str(text))}</text>'
+
+def _empty(width: int, height: int, message: str) -> str:
+    return _svg(width, height, [_text(width / 2, height / 2, message, text_anchor="middle", fill="#6c757d")])
+
+def _year(date: str) -> Optional[float]:
+    """Fractional year of a date starting YYYY[-MM[-DD]]; None if it does not"""
+    match = DATE_PREFIX.match(str(date))
+    if not match:
+        return None
+    year, month, day = (int(part) if part else 1 for part in match.groups())
+    return year + (month - 1) / 12 + (day - 1) / 365
+
+def render_network(graph: Dict[str, Any], width: int, height: int) -> str:
+    """Network graph whose node coordinates are scaled from its layout canvas to width x height"""
+    if not graph["nodes"]:
+        return _empty(width, height, "No network data")
+    
+    layout = graph.get("metadata", {}).get("layout", {})
+    sx, sy = width / layout.get("width", width), height / layout.get("height", height)
+    nodes = [dict(node, x=node["x"] * sx, y=node["y"] * sy) for node in graph["nodes"]]
+    positions = {node["id"]: (node["x"], node["y"]) for node in nodes}
+    body = ['<g stroke="#999999" stroke-opacity="0.6">']
+    for link in graph["links"]:
+        if link["source"] in positions and link["target"] in positions:
+            (x1, y1), (x2, y2) = positions[link["source"]], positions[link["target"]]
+            body.append(f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" '
+                        f'stroke-width="{math.sqrt(link.get("value", 1)):.2f}"/>')
+    body.append('</g><g stroke="#ffffff" stroke-width="1.5">')
+    for node in nodes:
+        body.append(f'<circle cx="{node["x"]:.1f}" cy="{node["y"]:.1f}" r="{(node.get("size") or 10) / 2:.1f}" '
+                    f'fill={quoteattr(node.get("color") or "#6c757d")}><title>{escape(node["name"])}</title></circle>')
+    body.append('</g>')
+    for node in nodes:
+        if node["type"] != "theme":
+            body.append(_text(node["x"] + (node.get("size") or 10) / 2 + 3, node["y"] + 4, node["name"]))
+    return _svg(width, height, body)
+
+def render_heatmap(heatmap: Dict[str, Any], width: int, height: int) -> str:
+    """Country x theme heatmap from the sparse encoding"""
+    countries, themes = heatmap["countries"], heatmap["themes"]
+    if not countries or not themes:
+        return _empty(width, height, "No heatmap data")
+    
+    left, top, bottom = 110, 20, 110
+    cell_w = (width - left - 20) / len(themes)
+    cell_h = (height - top - bottom) / len(countries)
+    body = [f'<rect x="{left}" y="{top}" width="{cell_w * len(themes):.1f}" '
+            f'height="{cell_h * len(countries):.1f}" fill="#f7fbff"/>']
+    for row, col in zip(heatmap["rows"], heatmap["cols"]):
+        body.append(f'<rect x="{left + col * cell_w + 0.5:.1f}" y="{top + row * cell_h + 0.5:.1f}" '
+                    f'width="{max(cell_w - 1, 0.5):.1f}" height="{max(cell_h - 1, 0.5):.1f}" fill="#2171b5"/>')
+    for i, country in enumerate(countries):
+        body.append(_text(left - 6, top + (i + 0.5) * cell_h + 4, country, text_anchor="end"))
+    for j, theme in enumerate(themes):
+        x, y = left + (j + 0.5) * cell_w, top + cell_h * len(countries) + 8
+        body.append(_text(x, y, theme, text_anchor="end", transform=f"rotate(-45 {x:.1f} {y:.1f})"))
+    return _svg(width, height, body)
+
+def render_timeline(timeline: Dict[str, Any], width: int, height: int) -> str:
+    """Events on one row per country along a year axis"""
+    events = [event for event in timeline["events"] if _year(event["date"]) is not None]
+    if not events:
+        return _empty(width, height, "No timeline events")
+    
+    left, right, top, bottom = 110, 30, 20, 40
+    countries = list(dict.fromkeys(event["country"] for event in events))
+    start, end = _year(events[0]["date"]), _year(events[-1]["date"])
+    span = max(end - start, 1.0)
+    row_h = (height - top - bottom) / len(countries)
+    
+    def x_of(year: float) -> float:
+        return left + (year - start) / span * (width - left - right)
+    
+    axis_y = height - bottom
+    body = [f'<line x1="{left}" y1="{axis_y}" x2="{width - right}" y2="{axis_y}" stroke="#333333"/>']
+    for year in range(math.ceil(start), math.floor(start + span) + 1):
+        body.append(_text(x_of(year), axis_y + 16, year, text_anchor="middle"))
+    for i, country in enumerate(countries):
+        body.append(_text(left - 6, top + (i + 0.5) * row_h + 4, country, text_anchor="end"))
+    row_of = {country: i for i, country in enumerate(countries)}
+    for event in events:
+        y = top + (row_of[event["country"]] + 0.5) * row_h
+        body.append(f'<circle cx="{x_of(_year(event["date"])):.1f}" cy="{y:.1f}" r="6" '
+                    f'fill={quoteattr(event.get("color") or "#69b3a2")}>'
+                    f'<title>{escape(event["date"] + ": " + event["event"])}</title></circle>')
+    return _svg(width, height, body)
+
+def render_sectors(analysis: Dict[str, Any], width: int, height: int) -> str:
+    """Horizontal bars of how many strategies prioritise each sector"""
+    sectors = analysis["sectors"]
+    if not sectors:
+        return _empty(width, height, "No sector data")
+    
+    left, right, top = 180, 40, 10
+    bar_h = (height - 2 * top) / len(sectors)
+    most = max(sector["frequency"] for sector in sectors)
+    body = []
+    for i, sector in enumerate(sectors):
+        y = top + i * bar_h
+        bar_w = sector["frequency"] / most * (width - left - right)
+        body.append(f'<rect x="{left}" y="{y + bar_h * 0.1:.1f}" width="{bar_w:.1f}" height="{bar_h * 0.8:.1f}" '
+                    f'fill={quoteattr(sector["color"])}/>')
+        body.append(_text(left - 6, y + bar_h / 2 + 4, sector["name"], text_anchor="end"))
+        body.append(_text(left + bar_w + 4, y + bar_h / 2 + 4, sector["frequency"]))
+    return _svg(width, height, body)
+
+SVG_RENDERERS = {
+    "network": render_network,
+    "heatmap": render_heatmap,
+    "timeline": render_timeline,
+    "sectors": render_sectors
+}
+
+def render_chart(task: Tuple[str, Dict[str, Any], int, int]) -> str:
+    """Render one (chart, data, width, height) task"""
+    chart, data, width, height = task
+    return SVG_RENDERERS[chart](data, width, height)
+
+def chart_data(engine, chart: str) -> Dict[str, Any]:
+    """Engine output a chart is drawn from; none depends on the drawing size"""
+    if chart == "network":
+        return engine.generate_network_layout("overview")
+    if chart == "heatmap":
+        return engine.generate_theme_heatmap("sparse")
+    if chart == "timeline":
+        return engine.generate_timeline()
+    if chart == "sectors":
+        return engine.generate_sector_analysis()
+    raise ValueError(f"Unknown chart '{chart}'; expected one of {list(SVG_CHARTS)}")
+
+# Engines of a pool worker process, per data directory
+_worker_engines: Dict[str, Any] = {}
+
+def render_in_worker(task: Tuple[str, str, int, int]) -> Tuple[str, str]:
+    """Pool entry point: build one chart's data from the strategy files and render it; returns (svg, data version)"""
+    data_dir, chart, width, height = task
+    engine = _worker_engines.get(data_dir)
+    if engine is None:
+        from src.visualizer import VisualizationEngine
+        engine = _worker_engines[data_dir] = VisualizationEngine(data_dir=data_dir)
+    version = engine.data_version
+    return render_chart((chart, chart_data(engine, chart), width, height)), version
+
+class ChartSnapshots:
+    """Rendered SVG charts cached per (chart, size, data version)
+    
+    Sizes are snapped to a coarse grid, and chart data does not depend on
+    the size (network coordinates are scaled from one layout), so each
+    version costs one engine pass per chart. Snapshots of the current
+    version are kept in a bounded LRU and dropped when the version changes;
+    rendering happens outside the lock. prerender() renders every chart
+    for a version at once; with workers > 1 it builds the chart data and
+    SVG in spawned processes, which are safe to start from any thread.
+    """
+    
+    def __init__(self, engine, max_entries: int = 64):
+        self.engine = engine
+        self.max_entries = max_entries
+        
+        self._lock = threading.RLock()
+        self._version: Optional[str] = None
+        self._svgs: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        
+        self.stats = {"hits": 0, "renders": 0, "prerendered": 0}
+    
+    @property
+    def version(self) -> str:
+        return self.engine.data_version
+    
+    def chart_data(self, chart: str) -> Dict[str, Any]:
+        """Engine output a chart is drawn from"""
+        return chart_data(self.engine, chart)
+    
+    def _current(self, version: str):
+        if version != self._version:
+            self._svgs.clear()
+            self._version = version
+    
+    def _store(self, key: Tuple[str, int, int], svg: str):
+        self._svgs[key] = svg
+        self._svgs.move_to_end(key)
+        while len(self._svgs) > self.max_entries:
+            self._svgs.popitem(last=False)
+    
+    def render(self, chart: str, width: int = DEFAULT_SIZE[0], height: int = DEFAULT_SIZE[1]) -> Tuple[str, str]:
+        """SVG of a chart at the nearest grid size, and the data version it shows"""
+        if chart not in SVG_RENDERERS:
+            raise ValueError(f"Unknown chart '{chart}'; expected one of {list(SVG_CHARTS)}")
+        width, height = snap_size(width, height)
+        
+        with self._lock:
+            version = self.version
+            self._current(version)
+            key = (chart, width, height)
+            if key in self._svgs:
+                self._svgs.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._svgs[key], version
+        
+        svg = render_chart((chart, self.chart_data(chart), width, height))
+        with self._lock:
+            if self._version == version:
+                self._store(key, svg)
+            self.stats["renders"] += 1
+        return svg, version
+    
+    def prerender(self, sizes: List[Tuple[int, int]] = None, workers: int = None) -> Dict[str, Any]:
+        """Render every chart at each size for the current data version; workers > 1 uses a process pool"""
+        sizes = list(dict.fromkeys(snap_size(w, h) for w, h in sizes or [DEFAULT_SIZE]))
+        with self._lock:
+            version = self.version
+            self._current(version)
+            keys = [(chart, w, h) for chart in SVG_CHARTS for w, h in sizes if (chart, w, h) not in self._svgs]
+        
+        if workers is not None and workers > 1 and len(keys) > 1:
+            data_dir = str(self.engine.data_dir)
+            with ProcessPoolExecutor(max_workers=min(workers, len(keys)),
+                                     mp_context=multiprocessing.get_context("spawn")) as executor:
+                results = list(executor.map(render_in_worker, [(data_dir, chart, w, h) for chart, w, h in keys]))
+        else:
+            results = [(render_chart((chart, self.chart_data(chart), w, h)), version) for chart, w, h in keys]
+        
+        # Files may change while workers run; only snapshots of the version being served are kept
+        rendered = [(key, svg) for key, (svg, rendered_version) in zip(keys, results) if rendered_version == version]
+        with self._lock:
+            if self._version == version:
+                for key, svg in rendered:
+                    self._store(key, svg)
+            self.stats["prerendered"] += len(rendered)
+        logger.info(f"Pre-rendered {len(rendered)} charts for data version {version}")
+        return {"version": version, "rendered": len(rendered)}
@@ -0,0 +1,342 @@
+"""
+Text similarity engine for African AI Strategies Portal
+TF-IDF vectors over strategy visions, objectives and initiative descriptions
+"""
+
+import re
+import json
+import hashlib
+from typing import Dict, List, Any, Optional, Tuple, Iterable, Mapping
+from dataclasses import dataclass
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9]+")
+
+STOP_WORDS = frozenset([
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have",
+    "in", "into", "is", "it", "its", "of", "on", "or", "our", "that", "the", "their",
+    "this", "to", "was", "were", "will", "with", "all", "across", "through", "within"
+])
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens, dropping stop words"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+def strategy_text(strategy: Dict[str, Any]) -> str:
+    """Collect the free text of a strategy into a single document"""
+    parts = [strategy.get('vision', ''), strategy.get('mission', ''), strategy.get('executive_summary', '')]
+    parts.extend(str(obj) for obj in strategy.get('objectives', []))
+    
+    for pillar in strategy.get('strategic_pillars', []):
+        if isinstance(pillar, dict):
+            parts.append(pillar.get('name', ''))
+            parts.append(pillar.get('description', ''))
+    
+    for initiative in strategy.get('key_initiatives', []):
+        parts.append(initiative_text(initiative))
+    
+    return " ".join(part for part in parts if part)
+
+def initiative_text(initiative: Dict[str, Any]) -> str:
+    """Collect the free text of a single initiative"""
+    return f"{initiative.get('name', '')} {initiative.get('description', '')}".strip()
+
+@dataclass
+class SparseMatrix:
+    """Row-normalized TF-IDF matrix in CSR layout, with its CSC transpose as an inverted index"""
+    doc_ids: List[str]
+    rows: Dict[str, int]
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    idf: np.ndarray
+    # Postings of term t are postings_docs/postings_data[term_ptr[t]:term_ptr[t + 1]]
+    term_ptr: np.ndarray
+    postings_docs: np.ndarray
+    postings_data: np.ndarray
+
+class TfidfIndex:
+    """Incrementally maintained TF-IDF index over short text documents
+    
+    Documents are stored as sparse rows; scoring a query walks the inverted
+    index postings of its own terms only, so it costs the number of
+    postings touched plus one accumulator per document, never vocab or
+    nnz per query.
+    """
+    
+    def __init__(self):
+        # Vocabulary is append-only so term ids stay stable across updates
+        self.vocabulary: Dict[str, int] = {}
+        self._doc_terms: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._df = np.zeros(0, dtype=np.int64)
+        self._matrix: Optional[SparseMatrix] = None
+    
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+    
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_terms
+    
+    def add(self, doc_id: str, text: str):
+        """Add or replace a document"""
+        if doc_id in self._doc_terms:
+            self.remove(doc_id)
+        
+        term_ids = [self._term_id(token) for token in tokenize(text)]
+        if len(self.vocabulary) > len(self._df):
+            self._df = np.concatenate([self._df, np.zeros(len(self.vocabulary) - len(self._df), dtype=np.int64)])
+        
+        terms, counts = np.unique(np.asarray(term_ids, dtype=np.int64), return_counts=True)
+        self._df[terms] += 1
+        self._doc_terms[doc_id] = (terms, counts.astype(np.float64))
+        self._matrix = None
+    
+    def remove(self, doc_id: str):
+        """Remove a document if present"""
+        entry = self._doc_terms.pop(doc_id, None)
+        if entry is not None:
+            self._df[entry[0]] -= 1
+            self._matrix = None
+    
+    def _term_id(self, token: str) -> int:
+        term_id = self.vocabulary.get(token)
+        if term_id is None:
+            term_id = len(self.vocabulary)
+            self.vocabulary[token] = term_id
+        return term_id
+    
+    def matrix(self) -> SparseMatrix:
+        """Get the normalized TF-IDF matrix, rebuilding it only after changes"""
+        if self._matrix is None:
+            self._matrix = self._build_matrix()
+        return self._matrix
+    
+    def _build_matrix(self) -> SparseMatrix:
+        doc_ids = list(self._doc_terms.keys())
+        n_docs = len(doc_ids)
+        idf = np.log((1 + n_docs) / (1 + self._df)) + 1.0
+        
+        lengths = np.array([len(self._doc_terms[d][0]) for d in doc_ids], dtype=np.int64)
+        indptr = np.zeros(n_docs + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        
+        if n_docs and indptr[-1]:
+            indices = np.concatenate([self._doc_terms[d][0] for d in doc_ids])
+            counts = np.concatenate([self._doc_terms[d][1] for d in doc_ids])
+        else:
+            indices = np.zeros(0, dtype=np.int64)
+            counts = np.zeros(0, dtype=np.float64)
+        
+        # Sublinear term frequency, then L2-normalize every row
+        data = (1.0 + np.log(counts)) * idf[indices]
+        rows = np.repeat(np.arange(n_docs), lengths)
+        norms = np.sqrt(np.bincount(rows, weights=data ** 2, minlength=n_docs))
+        norms[norms == 0] = 1.0
+        data = data / norms[rows]
+        
+        order = np.argsort(indices, kind="stable")
+        term_ptr = np.zeros(len(idf) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(indices, minlength=len(idf)), out=term_ptr[1:])
+        
+        return SparseMatrix(
+            doc_ids=doc_ids,
+            rows={doc_id: row for row, doc_id in enumerate(doc_ids)},
+            indptr=indptr,
+            indices=indices,
+            data=data,
+            idf=idf,
+            term_ptr=term_ptr,
+            postings_docs=rows[order],
+            postings_data=data[order]
+        )
+    
+    def vectorize(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorize text against the current vocabulary, ignoring unknown terms"""
+        matrix = self.matrix()
+        term_ids = [self.vocabulary[token] for token in tokenize(text) if token in self.vocabulary]
+        terms, counts = np.unique(np.asarray(term_ids, dtype=np.int64), return_counts=True)
+        data = (1.0 + np.log(counts.astype(np.float64))) * matrix.idf[terms]
+        norm = np.sqrt(np.sum(data ** 2))
+        return terms, (data / norm if norm else data)
+    
+    def cosine_scores(self, queries: List[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        """Cosine similarity of each query vector against every document"""
+        matrix = self.matrix()
+        scores = np.zeros((len(queries), len(matrix.doc_ids)))
+        for row, (terms, weights) in enumerate(queries):
+            scores[row] = self._accumulate(matrix, terms, weights)
+        return scores
+    
+    def _accumulate(self, matrix: SparseMatrix, terms: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Scores of one sparse query: each query term's postings weighted and summed per document"""
+        starts, ends = matrix.term_ptr[terms], matrix.term_ptr[terms + 1]
+        lengths = ends - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.zeros(len(matrix.doc_ids))
+        
+        # Positions of every touched posting: each term's range laid end to end
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        positions = offsets + np.arange(total)
+        return np.bincount(matrix.postings_docs[positions],
+                           weights=matrix.postings_data[positions] * np.repeat(weights, lengths),
+                           minlength=len(matrix.doc_ids))
+    
+    def row_vector(self, doc_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the stored normalized vector for a document"""
+        matrix = self.matrix()
+        row = matrix.rows[doc_id]
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        return matrix.indices[start:end], matrix.data[start:end]
+    
+    def similarity_matrix(self, doc_ids: Optional[List[str]] = None) -> Tuple[List[str], np.ndarray]:
+        """Batch pairwise cosine similarity between the given documents"""
+        matrix = self.matrix()
+        doc_ids = matrix.doc_ids if doc_ids is None else [d for d in doc_ids if d in self._doc_terms]
+        scores = self.cosine_scores([self.row_vector(d) for d in doc_ids])
+        columns = [matrix.rows[d] for d in doc_ids]
+        return doc_ids, scores[:, columns]
+    
+    def nearest(self, doc_id: str, top_k: int = 5, exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """Nearest neighbours of a stored document by cosine similarity"""
+        return self._top_k(self.cosine_scores([self.row_vector(doc_id)])[0], top_k, set(exclude) | {doc_id})
+    
+    def query(self, text: str, top_k: int = 5) -> List[Tuple[str, float]]:
+        """Nearest documents to an arbitrary text query"""
+        return self._top_k(self.cosine_scores([self.vectorize(text)])[0], top_k, set())
+    
+    def _top_k(self, scores: np.ndarray, top_k: int, exclude: set) -> List[Tuple[str, float]]:
+        doc_ids = self.matrix().doc_ids
+        order = np.argsort(-scores, kind="stable")
+        results = []
+        for row in order:
+            if doc_ids[row] in exclude or scores[row] <= 0:
+                continue
+            results.append((doc_ids[row], float(scores[row])))
+            if len(results) >= top_k:
+                break
+        return results
+
+class StrategyTextIndex:
+    """TF-IDF indexes over strategies and their initiatives, refreshed per changed strategy"""
+    
+    def __init__(self):
+        self.strategy_index = TfidfIndex()
+        self.initiative_index = TfidfIndex()
+        self._fingerprints: Dict[str, str] = {}
+        self._content_keys: Dict[str, Optional[str]] = {}
+        self._initiatives: Dict[str, Dict[str, Any]] = {}
+        self._initiative_ids: Dict[str, List[str]] = {}
+    
+    def update_strategy(self, country_code: str, strategy: Dict[str, Any]) -> bool:
+        """Re-vectorize a strategy if its text changed; returns True if it was updated"""
+        initiatives = strategy.get('key_initiatives', [])
+        document = strategy_text(strategy)
+        initiative_docs = [initiative_text(initiative) for initiative in initiatives]
+        fingerprint = hashlib.sha1(json.dumps([document, initiative_docs]).encode()).hexdigest()
+        
+        if self._fingerprints.get(country_code) == fingerprint:
+            return False
+        
+        self.remove_strategy(country_code)
+        self.strategy_index.add(country_code, document)
+        
+        doc_ids = []
+        for i, (initiative, text) in enumerate(zip(initiatives, initiative_docs)):
+            doc_id = f"{country_code}:{i}"
+            self.initiative_index.add(doc_id, text)
+            self._initiatives[doc_id] = {
+                "id": doc_id,
+                "country": country_code,
+                "name": initiative.get('name', ''),
+                "description": initiative.get('description', '')
+            }
+            doc_ids.append(doc_id)
+        
+        self._initiative_ids[country_code] = doc_ids
+        self._fingerprints[country_code] = fingerprint
+        return True
+    
+    def remove_strategy(self, country_code: str):
+        """Drop a strategy and its initiatives from both indexes"""
+        self.strategy_index.remove(country_code)
+        for doc_id in self._initiative_ids.pop(country_code, []):
+            self.initiative_index.remove(doc_id)
+            self._initiatives.pop(doc_id, None)
+        self._fingerprints.pop(country_code, None)
+        self._content_keys.pop(country_code, None)
+    
+    def sync(self, strategies: Mapping[str, Dict[str, Any]]) -> int:
+        """Bring the index in line with a set of strategies; returns number of changes
+        
+        When the mapping offers content_hash (the strategy provider does),
+        strategies whose file is unchanged are skipped without loading or
+        re-serializing their text.
+        """
+        content_hash = getattr(strategies, 'content_hash', None)
+        changed = 0
+        for country_code in list(self._fingerprints.keys()):
+            if country_code not in strategies:
+                self.remove_strategy(country_code)
+                changed += 1
+        
+        for country_code in strategies.keys():
+            content_key = content_hash(country_code) if content_hash else None
+            if content_key is not None and self._content_keys.get(country_code) == content_key:
+                continue
+            if self.update_strategy(country_code, strategies[country_code]):
+                changed += 1
+            self._content_keys[country_code] = content_key
+        
+        if changed:
+            logger.debug(f"Text index refreshed for {changed} strategies")
+        return changed
+    
+    def similar_strategies(self, country_code: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Strategies whose free text is closest to the given country's"""
+        if country_code not in self.strategy_index:
+            return []
+        
+        return [
+            {"country": code, "score": round(score, 4)}
+            for code, score in self.strategy_index.nearest(country_code, top_k)
+        ]
+    
+    def similar_initiatives(self, initiative_id: str, top_k: int = 5,
+                            other_countries_only: bool = True) -> List[Dict[str, Any]]:
+        """Initiatives whose name and description are closest to the given one"""
+        if initiative_id not in self.initiative_index:
+            return []
+        
+        exclude = set()
+        if other_countries_only:
+            exclude = set(self._initiative_ids.get(self._initiatives[initiative_id]["country"], []))
+        
+        return [
+            dict(self._initiatives[doc_id], score=round(score, 4))
+            for doc_id, score in self.initiative_index.nearest(initiative_id, top_k, exclude)
+        ]
+    
+    def strategy_similarity_matrix(self, countries: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Pairwise cosine similarity between strategies"""
+        codes, matrix = self.strategy_index.similarity_matrix(countries)
+        return {
+            "countries": codes,
+            "matrix": np.round(matrix, 4).tolist()
+        }
+    
+    def search(self, text: str, top_k: int = 5) -> Dict[str, List[Dict[str, Any]]]:
+        """Free-text query against both strategies and initiatives"""
+        return {
+            "strategies": [
+                {"country": code, "score": round(score, 4)}
+                for code, score in self.strategy_index.query(text, top_k)
+            ],
+            "initiatives": [
+                dict(self._initiatives[doc_id], score=round(score, 4))
+                for doc_id, score in self.initiative_index.query(text, top_k)
+            ]
+        }
@@ -0,0 +1,169 @@
+"""
+Theme categorization engine for African AI Strategies Portal
+Clusters themes by co-occurrence and name similarity, seeded by known categories
+"""
+
+import re
+import hashlib
+import json
+from typing import Dict, List, Optional
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+OTHER_CATEGORY = "Other"
+
+NAME_STOP_WORDS = frozenset(["and", "for", "of", "the", "ai", "in"])
+
+SUFFIXES = ("ation", "ment", "ies", "ic", "y", "s")
+
+def theme_tokens(theme: str) -> List[str]:
+    """Lightly stemmed word tokens of a theme name"""
+    tokens = []
+    for word in re.findall(r"[a-z]+", theme.lower()):
+        if word in NAME_STOP_WORDS:
+            continue
+        for suffix in SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+                word = word[:-len(suffix)]
+                break
+        tokens.append(word)
+    return tokens
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+class ThemeCategorizer:
+    """Assigns themes to categories by seeded hierarchical clustering
+    
+    Every theme is embedded as its co-occurrence profile across countries
+    (from the theme x country incidence matrix) concatenated with a bag of
+    its name tokens. Known category themes act as seeds: clusters are merged
+    by average linkage on cosine similarity, clusters seeded with different
+    categories are never merged, and each theme takes the category of the
+    seed in its cluster. The resulting map is cached per input signature so
+    lookups are dictionary reads.
+    """
+    
+    def __init__(self, categories: Dict[str, List[str]], min_similarity: float = 0.3,
+                 cooccurrence_weight: float = 0.3):
+        self.categories = categories
+        self.min_similarity = min_similarity
+        self.cooccurrence_weight = cooccurrence_weight
+        
+        self._seed_category = {
+            theme.lower(): category
+            for category, themes in categories.items()
+            for theme in themes
+        }
+        self._signature: Optional[str] = None
+        self._theme_map: Dict[str, str] = {}
+    
+    def category_of(self, theme: str) -> str:
+        """O(1) lookup of a theme's category after fit()"""
+        return self._theme_map.get(theme, OTHER_CATEGORY)
+    
+    def fit(self, theme_countries: Dict[str, List[str]]) -> Dict[str, str]:
+        """Build (or reuse) the theme -> category map for a theme/country incidence"""
+        signature = hashlib.sha1(json.dumps(
+            [sorted((t, sorted(c)) for t, c in theme_countries.items()), self.categories,
+             self.min_similarity, self.cooccurrence_weight]
+        ).encode()).hexdigest()
+        
+        if signature != self._signature:
+            self._theme_map = self._cluster(theme_countries)
+            self._signature = signature
+        
+        return self._theme_map
+    
+    def categorize(self, theme_countries: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """Group themes by category, keeping the known category order"""
+        theme_map = self.fit(theme_countries)
+        categorized = {category: [] for category in self.categories.keys()}
+        for theme in theme_countries.keys():
+            categorized.setdefault(theme_map[theme], []).append(theme)
+        return categorized
+    
+    def _embed(self, themes: List[str], theme_countries: Dict[str, List[str]]) -> np.ndarray:
+        """Concatenate co-occurrence profiles and name token vectors"""
+        countries = sorted({c for cs in theme_countries.values() for c in cs})
+        country_index = {c: i for i, c in enumerate(countries)}
+        
+        incidence = np.zeros((len(themes), len(countries)))
+        for row, theme in enumerate(themes):
+            for country in theme_countries.get(theme, []):
+                incidence[row, country_index[country]] = 1.0
+        
+        # Second-order co-occurrence: themes are alike if they co-occur with the same themes
+        cooccurrence = _normalize_rows(incidence) @ _normalize_rows(incidence).T
+        
+        vocabulary: Dict[str, int] = {}
+        token_rows = [[vocabulary.setdefault(t, len(vocabulary)) for t in theme_tokens(theme)] for theme in themes]
+        names = np.zeros((len(themes), max(len(vocabulary), 1)))
+        for row, token_ids in enumerate(token_rows):
+            names[row, token_ids] = 1.0
+        
+        return np.hstack([
+            np.sqrt(self.cooccurrence_weight) * _normalize_rows(cooccurrence),
+            np.sqrt(1.0 - self.cooccurrence_weight) * _normalize_rows(names)
+        ])
+    
+    def _cluster(self, theme_countries: Dict[str, List[str]]) -> Dict[str, str]:
+        corpus_themes = sorted(theme_countries.keys())
+        seed_themes = [
+            theme for themes in self.categories.values() for theme in themes
+            if theme not in theme_countries
+        ]
+        themes = corpus_themes + seed_themes
+        n = len(themes)
+        if n == 0:
+            return {}
+        
+        embedding = self._embed(themes, theme_countries)
+        similarity = embedding @ embedding.T
+        np.fill_diagonal(similarity, -np.inf)
+        
+        category_names = list(self.categories.keys())
+        label_ids = {category: i for i, category in enumerate(category_names)}
+        labels = np.array([label_ids.get(self._seed_category.get(t.lower()), -1) for t in themes])
+        
+        # Clusters seeded with different categories must never merge
+        conflict = (labels[:, None] >= 0) & (labels[None, :] >= 0) & (labels[:, None] != labels[None, :])
+        similarity[conflict] = -np.inf
+        
+        sizes = np.ones(n)
+        members = {i: [i] for i in range(n)}
+        
+        while True:
+            best = int(np.argmax(similarity))
+            a, b = divmod(best, n)
+            if not np.isfinite(similarity[a, b]) or similarity[a, b] < self.min_similarity:
+                break
+            
+            # Average linkage (Lance-Williams update), merging b into a
+            merged = (sizes[a] * similarity[a] + sizes[b] * similarity[b]) / (sizes[a] + sizes[b])
+            sizes[a] += sizes[b]
+            members[a].extend(members.pop(b))
+            if labels[a] < 0:
+                labels[a] = labels[b]
+            
+            if labels[a] >= 0:
+                merged[(labels >= 0) & (labels != labels[a])] = -np.inf
+            merged[a] = -np.inf
+            similarity[a, :] = merged
+            similarity[:, a] = merged
+            similarity[b, :] = -np.inf
+            similarity[:, b] = -np.inf
+        
+        theme_map = {}
+        for root, indices in members.items():
+            category = category_names[labels[root]] if labels[root] >= 0 else OTHER_CATEGORY
+            for index in indices:
+                if index < len(corpus_themes):
+                    theme_map[themes[index]] = category
+        
+        logger.debug(f"Categorized {len(corpus_themes)} themes into {len(set(theme_map.values()))} categories")
+        return theme_map
@@ -0,0 +1,170 @@
+"""
+Timeline index for African AI Strategies Portal
+Date-sorted strategy events with incremental updates and windowed queries
+"""
+
+import re
+import heapq
+import threading
+from itertools import islice
+from bisect import bisect_left
+from collections.abc import Mapping
+from typing import Callable, Dict, List, Any, Iterable, Iterator, Optional, Tuple
+import logging
+
+from src.strategy_store import document_key
+
+logger = logging.getLogger(__name__)
+
+DATE_PATTERN = re.compile(r'^\d{4}(-\d{2}(-\d{2})?)?$')
+
+# Sorts after every character of an ISO date, so "2023" as an upper bound includes 2023-12-31
+DATE_SUFFIX_MAX = "\uffff"
+
+EventKey = Tuple[str, str, int]
+
+def validate_date(value: Optional[str]) -> Optional[str]:
+    """Accept YYYY, YYYY-MM or YYYY-MM-DD (or nothing); raise ValueError otherwise"""
+    if value in (None, ""):
+        return None
+    if not DATE_PATTERN.match(value):
+        raise ValueError(f"Invalid date '{value}'; expected YYYY, YYYY-MM or YYYY-MM-DD")
+    return value
+
+# Date-sorted event keys next to their events; the whole timeline and each country, type and pair keep one
+Bucket = Tuple[List[EventKey], List[Dict[str, Any]]]
+
+def _window_entries(keys: List[EventKey], events: List[Dict[str, Any]], low: int, high: int):
+    for i in range(low, high):
+        yield keys[i], events[i]
+
+def _insert(bucket: Bucket, key: EventKey, event: Dict[str, Any]):
+    keys, events = bucket
+    position = bisect_left(keys, key)
+    keys.insert(position, key)
+    events.insert(position, event)
+
+def _remove(bucket: Bucket, key: EventKey):
+    keys, events = bucket
+    position = bisect_left(keys, key)
+    del keys[position]
+    del events[position]
+
+class TimelineIndex:
+    """Timeline events kept sorted by date for range scans
+    
+    Events are stored in one list ordered by (date, country, sequence)
+    next to the list of those keys, and again per country, per event type
+    and per (country, type) pair. A date window is two bisections, so a
+    page of k events costs O(log n + k); country and type filters merge
+    the windows of the matching buckets instead of scanning the whole
+    timeline. When a strategy document changes, only its own events are
+    removed and re-inserted.
+    """
+    
+    def __init__(self, extract: Callable[[str, Dict[str, Any]], List[Dict[str, Any]]]):
+        self.extract = extract
+        
+        self._lock = threading.RLock()
+        self._keys: List[EventKey] = []
+        self._events: List[Dict[str, Any]] = []
+        self._by_country: Dict[str, Bucket] = {}
+        self._by_type: Dict[str, Bucket] = {}
+        self._by_country_type: Dict[Tuple[str, str], Bucket] = {}
+        self._revisions: Dict[str, Any] = {}
+        
+        self.stats = {"updates": 0}
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        """All events in date order (shared; do not mutate)"""
+        return self._events
+    
+    def update_country(self, country_code: str, strategy: Optional[Dict[str, Any]]):
+        """Replace one country's events; None removes them"""
+        with self._lock:
+            keys, events = self._by_country.pop(country_code, ([], []))
+            for key, event in zip(keys, events):
+                _remove((self._keys, self._events), key)
+                _remove(self._by_type[event["type"]], key)
+                if not self._by_type[event["type"]][0]:
+                    del self._by_type[event["type"]]
+                self._by_country_type.pop((country_code, event["type"]), None)
+            
+            if strategy is not None:
+                events = self.extract(country_code, strategy)
+                entries = sorted(((event["date"], country_code, seq), event) for seq, event in enumerate(events))
+                self._by_country[country_code] = ([k for k, _ in entries], [e for _, e in entries])
+                for key, event in entries:
+                    _insert((self._keys, self._events), key, event)
+                    _insert(self._by_type.setdefault(event["type"], ([], [])), key, event)
+                    # Entries arrive in key order, so appending keeps each pair's bucket sorted
+                    pair_keys, pair_events = self._by_country_type.setdefault((country_code, event["type"]), ([], []))
+                    pair_keys.append(key)
+                    pair_events.append(event)
+            self.stats["updates"] += 1
+    
+    def sync(self, strategies: Mapping):
+        """Re-index only the countries whose strategy changed since the last sync
+        
+        A strategy provider's file revisions mark unchanged strategies, so
+        their documents are not loaded; for a plain mapping the document
+        itself is compared.
+        """
+        with self._lock:
+            for code in sorted(set(self._revisions) - set(strategies.keys())):
+                self.update_country(code, None)
+                del self._revisions[code]
+            
+            for code in sorted(strategies.keys()):
+                key, previous = document_key(strategies, code), self._revisions.get(code)
+                if previous is None or (previous is not key and previous != key):
+                    self.update_country(code, strategies[code])
+                    self._revisions[code] = key
+    
+    def _window(self, keys: List[EventKey], start: Optional[str], end: Optional[str]) -> Tuple[int, int]:
+        low = bisect_left(keys, (start,)) if start else 0
+        high = bisect_left(keys, (end + DATE_SUFFIX_MAX,)) if end else len(keys)
+        return low, high
+    
+    def _merged(self, start: Optional[str], end: Optional[str],
+                buckets: Iterable[Optional[Bucket]]) -> Tuple[Iterator[Dict[str, Any]], int]:
+        """Date-ordered events of the given buckets in the window, and how many there are"""
+        streams, total = [], 0
+        for bucket in buckets:
+            keys, events = bucket if bucket is not None else ([], [])
+            low, high = self._window(keys, start, end)
+            streams.append(_window_entries(keys, events, low, high))
+            total += high - low
+        return (event for _, event in heapq.merge(*streams, key=lambda entry: entry[0])), total
+    
+    def query(self, start: str = None, end: str = None, countries: Iterable[str] = None,
+              types: Iterable[str] = None, offset: int = 0, limit: int = 100) -> Dict[str, Any]:
+        """One page of events dated within [start, end], optionally filtered by country and type
+        
+        Unfiltered pages are slices of the date window. Filtered pages merge
+        the windows of the per-country, per-type or per-pair buckets, whose
+        sizes give the total without visiting the events.
+        """
+        start, end = validate_date(start), validate_date(end)
+        with self._lock:
+            if countries is None and types is None:
+                low, high = self._window(self._keys, start, end)
+                page = self._events[min(low + offset, high):min(low + offset + limit, high)]
+                total = high - low
+            else:
+                if types is None:
+                    buckets = [self._by_country.get(code) for code in sorted(set(countries))]
+                elif countries is None:
+                    buckets = [self._by_type.get(kind) for kind in sorted(set(types))]
+                else:
+                    buckets = [self._by_country_type.get((code, kind))
+                               for code in sorted(set(countries)) for kind in sorted(set(types))]
+                events, total = self._merged(start, end, buckets)
+                page = list(islice(events, offset, offset + limit))
+        
+        next_offset = offset + limit if offset + limit < total else None
+        return {"events": page, "total": total, "offset": offset, "limit": limit, "next_offset": next_offset}
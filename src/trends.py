@@ -0,0 +1,166 @@
+"""
+Trend engine for African AI Strategies Portal
+Year-bucketed cubes of theme adoption, active initiatives and committed budget
+"""
+
+from collections.abc import Mapping
+from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
+import logging
+
+from src.features import extract_strategy_themes, sector_names, parse_budget, parse_year, parse_period, strategy_period
+
+logger = logging.getLogger(__name__)
+
+# measure -> (member axis, description)
+MEASURES = {
+    "theme_adoption": ("themes", "Strategies adopting each theme, by publication year"),
+    "sector_adoption": ("sectors", "Strategies prioritising each sector, by publication year"),
+    "strategies_published": ("countries", "Strategies published, by publication year"),
+    "active_initiatives": ("countries", "Initiatives running in each year"),
+    "budget_committed": ("countries", "Initiative budget (USD millions) committed in its start year")
+}
+
+def initiative_period(initiative: Dict[str, Any],
+                      fallback: Optional[Tuple[int, int]] = None) -> Optional[Tuple[int, int]]:
+    """(start, end) years of an initiative, falling back to its strategy's horizon"""
+    period = parse_period(initiative.get('timeline'))
+    return period if period is not None else fallback
+
+class TrendCube:
+    """Dense member x year arrays for every trend measure
+    
+    All strategies are flattened into (member, year, weight) coordinate
+    arrays and scattered into the cubes with np.add.at in one pass. Active
+    initiatives are accumulated as +1/-1 start/end markers and integrated
+    with a cumulative sum, so multi-year spans cost O(1) each. Queries are
+    array slices over the prebuilt cubes.
+    """
+    
+    def __init__(self, strategies: Mapping):
+        self.countries = sorted(strategies.keys())
+        
+        themes: Dict[str, int] = {}
+        sectors: Dict[str, int] = {}
+        # Coordinate lists per measure: member index, year, weight
+        coords: Dict[str, Tuple[List[int], List[int], List[float]]] = {
+            measure: ([], [], []) for measure in MEASURES
+        }
+        starts: List[Tuple[int, int]] = []
+        ends: List[Tuple[int, int]] = []
+        
+        def add(measure: str, member: int, year: int, weight: float = 1.0):
+            members, years, weights = coords[measure]
+            members.append(member)
+            years.append(year)
+            weights.append(weight)
+        
+        for row, code in enumerate(self.countries):
+            strategy = strategies[code]
+            published = parse_year(strategy.get('publication_date'))
+            if published is not None:
+                add("strategies_published", row, published)
+                for theme in sorted(extract_strategy_themes(strategy)):
+                    add("theme_adoption", themes.setdefault(theme, len(themes)), published)
+                for sector in sector_names(strategy):
+                    add("sector_adoption", sectors.setdefault(sector, len(sectors)), published)
+            
+            horizon = strategy_period(strategy)
+            for initiative in strategy.get('key_initiatives', []):
+                period = initiative_period(initiative, horizon)
+                if period is None:
+                    continue
+                starts.append((row, period[0]))
+                ends.append((row, period[1] + 1))
+                budget = parse_budget(initiative.get('budget'))
+                if budget:
+                    add("budget_committed", row, period[0], budget)
+        
+        all_years = [y for members, years, _ in coords.values() for y in years]
+        all_years += [y for _, y in starts] + [y - 1 for _, y in ends]
+        first, last = (min(all_years), max(all_years)) if all_years else (0, -1)
+        self.years = np.arange(first, last + 1)
+        
+        self.members = {
+            "themes": sorted(themes, key=themes.get),
+            "sectors": sorted(sectors, key=sectors.get),
+            "countries": self.countries
+        }
+        self._member_index = {
+            axis: {name: i for i, name in enumerate(names)} for axis, names in self.members.items()
+        }
+        
+        self.cubes: Dict[str, np.ndarray] = {}
+        for measure, (axis, _) in MEASURES.items():
+            if measure == "active_initiatives":
+                continue
+            members, years, weights = coords[measure]
+            dtype = float if measure == "budget_committed" else np.int64
+            cube = np.zeros((len(self.members[axis]), len(self.years)), dtype=dtype)
+            if members:
+                np.add.at(cube, (np.array(members), np.array(years) - first), np.array(weights, dtype=dtype))
+            self.cubes[measure] = cube
+        
+        # Running initiatives: +1 at start, -1 the year after the end, then integrate
+        markers = np.zeros((len(self.countries), len(self.years) + 1), dtype=np.int64)
+        if starts:
+            start_rows, start_years = np.array(starts).T
+            end_rows, end_years = np.array(ends).T
+            np.add.at(markers, (start_rows, start_years - first), 1)
+            np.add.at(markers, (end_rows, end_years - first), -1)
+        self.cubes["active_initiatives"] = np.cumsum(markers, axis=1)[:, :-1]
+        
+        logger.debug(f"Built trend cubes for {len(self.countries)} strategies over {len(self.years)} years")
+    
+    def _select(self, measure: str, members: List[str] = None, start_year: int = None,
+                end_year: int = None, cumulative: bool = False) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        if measure not in MEASURES:
+            raise ValueError(f"Unknown trend measure '{measure}'; expected one of {sorted(MEASURES)}")
+        
+        axis = MEASURES[measure][0]
+        cube = self.cubes[measure]
+        if cumulative:
+            # Accumulate over the full range so windows start from the running total
+            cube = np.cumsum(cube, axis=1)
+        
+        if members is None:
+            names = self.members[axis]
+            rows = np.arange(len(names))
+        else:
+            index = self._member_index[axis]
+            names = [m for m in members if m in index]
+            rows = np.array([index[m] for m in names], dtype=np.int64)
+        
+        lo = 0 if start_year is None else int(np.searchsorted(self.years, start_year, side='left'))
+        hi = len(self.years) if end_year is None else int(np.searchsorted(self.years, end_year, side='right'))
+        return names, self.years[lo:hi], cube[rows, lo:hi]
+    
+    def slice(self, measure: str, members: List[str] = None, start_year: int = None,
+              end_year: int = None, cumulative: bool = False) -> Dict[str, Any]:
+        """Per-member series of a measure over a year window"""
+        names, years, values = self._select(measure, members, start_year, end_year, cumulative)
+        return {
+            "measure": measure,
+            "years": years.tolist(),
+            "series": {name: row.tolist() for name, row in zip(names, values)}
+        }
+    
+    def rollup(self, measure: str, members: List[str] = None, start_year: int = None,
+               end_year: int = None, cumulative: bool = False) -> Dict[str, Any]:
+        """Series of a measure summed across members over a year window"""
+        names, years, values = self._select(measure, members, start_year, end_year, cumulative)
+        return {
+            "measure": measure,
+            "years": years.tolist(),
+            "members": names,
+            "values": values.sum(axis=0).tolist()
+        }
+    
+    def top_members(self, measure: str, year: int, limit: int = 10, cumulative: bool = False) -> List[Dict[str, Any]]:
+        """Members with the largest value of a measure in one year"""
+        names, years, values = self._select(measure, None, year, year, cumulative)
+        if len(years) == 0:
+            return []
+        column = values[:, 0]
+        order = np.lexsort((np.array(names, dtype=str), -column))[:limit]
+        return [{"name": names[i], "value": column[i].item()} for i in order if column[i] > 0]
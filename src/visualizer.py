@@ -3,22 +3,145 @@ Visualization engine for African AI Strategies Portal
 Generates interactive charts, mind maps, and network graphs
 """
 
-import json
-from typing import Dict, List, Any, Tuple
+import base64
+import functools
+import inspect
+import threading
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 import logging
-from collections import defaultdict, Counter
+from collections import OrderedDict, defaultdict, Counter
 import random
+import numpy as np
+
+from src.features import parse_budget, sector_names, strategy_budget
+from src.layout import ForceLayout
+from src.network import NetworkLOD, top_k_edges
+from src.strategy_store import StrategyProvider, StrategySnapshot
+from src.summary import DashboardSummary
+from src.timeline import TimelineIndex
 
 logger = logging.getLogger(__name__)
 
+HEATMAP_ENCODINGS = ("cells", "dense", "sparse")
+
+COMPARISON_METRICS = ("budget", "sectors", "initiatives", "themes", "partners")
+
+# Deepest mind map view served in one response
+MIND_MAP_MAX_DEPTH = 6
+
+# Generator outputs kept per snapshot version
+MEMO_MAX_ENTRIES = 256
+
+def annotate_tree(root: Dict[str, Any]) -> int:
+    """Give every node its path (child indices joined by '/') and subtree node_count, without recursion"""
+    root["path"] = ""
+    order, stack = [root], [root]
+    while stack:
+        node = stack.pop()
+        for i, child in enumerate(node.get("children", [])):
+            child["path"] = f"{node['path']}/{i}" if node["path"] else str(i)
+            order.append(child)
+            stack.append(child)
+    
+    # Parents precede their children in order, so reversing it visits children first
+    for node in reversed(order):
+        node["node_count"] = 1 + sum(child["node_count"] for child in node.get("children", []))
+    return root["node_count"]
+
+def find_tree_node(root: Dict[str, Any], path: str) -> Optional[Dict[str, Any]]:
+    """Node at a '/'-separated path of child indices; None if the path does not exist"""
+    node = root
+    for part in filter(None, path.split('/')):
+        children = node.get("children", [])
+        if not part.isdigit() or int(part) >= len(children):
+            return None
+        node = children[int(part)]
+    return node
+
+def truncate_tree(node: Dict[str, Any], depth: int) -> Dict[str, Any]:
+    """Copy of a subtree with at most depth levels; cut-off nodes keep child_count instead of children"""
+    copy = {key: value for key, value in node.items() if key != "children"}
+    children = node.get("children")
+    if children:
+        copy["child_count"] = len(children)
+        if depth > 1:
+            copy["children"] = [truncate_tree(child, depth - 1) for child in children]
+    return copy
+
+def _memo_key(value):
+    """Hashable form of an argument; lists and tuples become tuples, keeping their order"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_memo_key(item) for item in value)
+    return value
+
+def memoize_per_snapshot(method):
+    """Cache a generator's output per (arguments, snapshot version)
+    
+    Arguments are bound to the signature with defaults applied, so equal
+    calls share one entry however they are spelled. The memo is an LRU of
+    at most memo_max_entries outputs, dropped whole when the snapshot
+    version changes. Cached outputs are shared between callers and must
+    not be mutated.
+    """
+    signature = inspect.signature(method)
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        snapshot = self._load_all_strategies()
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__, tuple(_memo_key(value) for value in list(bound.arguments.values())[1:]))
+        
+        with self._memo_lock:
+            if snapshot.version != self._memo_version:
+                self._memo.clear()
+                self._memo_version = snapshot.version
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._memo[key]
+            self.stats["misses"] += 1
+        
+        # Computed outside the lock; concurrent misses on one key may both compute, and the last one is kept
+        result = method(self, *args, **kwargs)
+        with self._memo_lock:
+            if self._memo_version == snapshot.version:
+                self._memo[key] = result
+                while len(self._memo) > self.memo_max_entries:
+                    self._memo.popitem(last=False)
+        return result
+    
+    return wrapper
+
 class VisualizationEngine:
     """Generates various visualizations for AI strategy data"""
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", provider: StrategyProvider = None,
+                 memo_max_entries: int = MEMO_MAX_ENTRIES):
         self.data_dir = Path(data_dir)
         self.processed_dir = self.data_dir / "processed"
         
+        # Shared lazy strategy provider; repeated calls reuse parsed files
+        self.strategies = provider if provider is not None else StrategyProvider(self.processed_dir)
+        
+        # Generator outputs memoized for the current snapshot version
+        self.memo_max_entries = memo_max_entries
+        self._memo_lock = threading.Lock()
+        self._memo: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._memo_version = None
+        self.stats = {"hits": 0, "misses": 0, "mind_map_builds": 0, "subtree_hits": 0}
+        
+        # Date-sorted timeline events, synced incrementally per snapshot version
+        self._timeline = TimelineIndex(self._timeline_events)
+        self._timeline_version = None
+        
+        # Dashboard statistics maintained incrementally as strategies change
+        self._summary = DashboardSummary(extract_themes=self._extract_themes)
+        
+        # Per-country mind maps: (file content hash, full tree, subtree views by (path, depth))
+        self._mind_maps: Dict[str, Tuple[Optional[str], Dict[str, Any], Dict[Tuple[str, int], Dict[str, Any]]]] = {}
+        
         # Color schemes for visualizations
         self.color_schemes = {
             "countries": {
@@ -131,7 +254,7 @@ class VisualizationEngine:
         # Add metadata for visualization
         mind_map["metadata"] = {
             "country_code": country_data.get('country_code', ''),
-            "total_nodes": self._count_nodes(mind_map),
+            "total_nodes": annotate_tree(mind_map),
             "color_scheme": self.color_schemes["countries"].get(
                 country_data.get('country_code', ''), "#333333"
             )
@@ -139,15 +262,52 @@ class VisualizationEngine:
         
         return mind_map
     
-    def _count_nodes(self, node: Dict[str, Any]) -> int:
-        """Recursively count nodes in mind map"""
-        count = 1
-        if 'children' in node:
-            for child in node['children']:
-                count += self._count_nodes(child)
-        return count
+    def _country_mind_map(self, country_code: str):
+        """Cached (version, tree, views) entry of one country, rebuilt only when its file changes"""
+        version = self.strategies.content_hash(country_code)
+        entry = self._mind_maps.get(country_code)
+        if entry is not None and version is not None and entry[0] == version:
+            return entry
+        
+        country_data = self.strategies.get(country_code)
+        if country_data is None:
+            self._mind_maps.pop(country_code, None)
+            return None
+        
+        entry = (version, self.generate_mind_map(dict(country_data, country_code=country_code)), {})
+        self._mind_maps[country_code] = entry
+        self.stats["mind_map_builds"] += 1
+        return entry
     
-    def generate_network_graph(self) -> Dict[str, Any]:
+    def generate_country_mind_map(self, country_code: str) -> Dict[str, Any]:
+        """Generate mind map for one country, loading only that country's file"""
+        entry = self._country_mind_map(country_code)
+        return entry[1] if entry else None
+    
+    def get_mind_map(self, country_code: str, path: str = "", depth: int = 2) -> Optional[Dict[str, Any]]:
+        """Subtree of a country's mind map at a node path, cut to depth levels
+        
+        Nodes below the cut carry child_count so clients can fetch them on
+        demand. Returns None if the country or path does not exist.
+        """
+        entry = self._country_mind_map(country_code)
+        if entry is None:
+            return None
+        
+        _, tree, views = entry
+        key = (path.strip('/'), depth)
+        if key in views:
+            self.stats["subtree_hits"] += 1
+            return views[key]
+        
+        node = find_tree_node(tree, key[0])
+        if node is None:
+            return None
+        views[key] = truncate_tree(node, depth)
+        return views[key]
+    
+    @memoize_per_snapshot
+    def generate_network_graph(self, top_k: int = 5) -> Dict[str, Any]:
         """Generate network graph showing relationships between countries and themes"""
         
         # Load all strategies
@@ -181,7 +341,7 @@ class VisualizationEngine:
         for themes in country_themes.values():
             theme_counter.update(themes)
         
-        for theme in all_themes:
+        for theme in sorted(all_themes):
             nodes.append({
                 "id": f"theme_{theme}",
                 "name": theme,
@@ -201,19 +361,22 @@ class VisualizationEngine:
                     "type": "country_theme"
                 })
         
-        # Create links between countries with similar themes
-        countries = list(country_themes.keys())
-        for i, country1 in enumerate(countries):
-            for country2 in countries[i+1:]:
-                common_themes = country_themes[country1].intersection(country_themes[country2])
-                if len(common_themes) >= 2:  # At least 2 common themes
-                    links.append({
-                        "source": country1,
-                        "target": country2,
-                        "value": len(common_themes),
-                        "type": "country_similarity",
-                        "common_themes": list(common_themes)
-                    })
+        # Link each country to the top-k countries it shares most themes with
+        countries = sorted(country_themes)
+        theme_index = {theme: i for i, theme in enumerate(sorted(all_themes))}
+        incidence = np.zeros((len(countries), len(theme_index)))
+        for row, country in enumerate(countries):
+            incidence[row, [theme_index[theme] for theme in country_themes[country]]] = 1
+        
+        for i, j, shared in top_k_edges(incidence @ incidence.T, top_k):
+            country1, country2 = countries[i], countries[j]
+            links.append({
+                "source": country1,
+                "target": country2,
+                "value": int(shared),
+                "type": "country_similarity",
+                "common_themes": sorted(country_themes[country1] & country_themes[country2])
+            })
         
         return {
             "nodes": nodes,
@@ -225,45 +388,80 @@ class VisualizationEngine:
             }
         }
     
-    def generate_timeline(self) -> Dict[str, Any]:
-        """Generate timeline visualization of AI strategy development"""
+    @memoize_per_snapshot
+    def generate_network_layout(self, level: str = "full", width: int = 960, height: int = 700) -> Dict[str, Any]:
+        """Network graph (full, or the clustered overview) with node coordinates precomputed"""
+        graph = self.generate_network_overview() if level == "overview" else self.generate_network_graph()
+        layout = ForceLayout(width=width, height=height)
+        nodes, parameters = layout.layout(graph["nodes"], graph["links"])
         
-        strategies = self._load_all_strategies()
-        
-        timeline_events = []
+        return {
+            "nodes": nodes,
+            "links": graph["links"],
+            "metadata": dict(graph["metadata"], layout=parameters)
+        }
+    
+    @memoize_per_snapshot
+    def _network_lod(self, top_k: int = 5) -> NetworkLOD:
+        return NetworkLOD(self.generate_network_graph(top_k), top_k)
+    
+    def generate_network_overview(self, max_nodes: int = 150, max_edges: int = 600, top_k: int = 5) -> Dict[str, Any]:
+        """Low-zoom network: country communities collapsed into super-nodes, within node/edge budgets"""
+        return self._network_lod(top_k).overview(max_nodes, max_edges)
+    
+    def expand_network_cluster(self, cluster_id: str, max_nodes: int = 150, max_edges: int = 600,
+                               top_k: int = 5) -> Dict[str, Any]:
+        """Member countries and themes of one overview cluster; raises KeyError if unknown"""
+        return self._network_lod(top_k).expand(cluster_id, max_nodes, max_edges)
+    
+    def _timeline_events(self, country_code: str, strategy: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Timeline events of one strategy: publication and implementation phase starts"""
+        events = []
+        color = self.color_schemes["countries"].get(country_code, "#333333")
+        
+        # Strategy publication
+        if 'publication_date' in strategy:
+            events.append({
+                "date": strategy['publication_date'],
+                "country": strategy.get('country_name', country_code),
+                "country_code": country_code,
+                "event": "Strategy Published",
+                "title": strategy.get('strategy_title', 'AI Strategy'),
+                "type": "publication",
+                "color": color
+            })
         
-        for country_code, strategy in strategies.items():
-            # Strategy publication
-            if 'publication_date' in strategy:
-                timeline_events.append({
-                    "date": strategy['publication_date'],
-                    "country": strategy.get('country_name', country_code),
-                    "country_code": country_code,
-                    "event": "Strategy Published",
-                    "title": strategy.get('strategy_title', 'AI Strategy'),
-                    "type": "publication",
-                    "color": self.color_schemes["countries"].get(country_code, "#333333")
-                })
-            
-            # Key milestones from implementation timeline
-            if 'implementation_timeline' in strategy:
-                timeline = strategy['implementation_timeline']
-                for phase, details in timeline.items():
-                    if isinstance(details, dict) and 'period' in details:
-                        period = details['period']
-                        start_year = period.split('-')[0]
-                        timeline_events.append({
-                            "date": f"{start_year}-01-01",
-                            "country": strategy.get('country_name', country_code),
-                            "country_code": country_code,
-                            "event": f"{phase.title()} Phase",
-                            "title": details.get('focus', 'Implementation Phase'),
-                            "type": "milestone",
-                            "color": self.color_schemes["countries"].get(country_code, "#333333")
-                        })
+        # Key milestones from implementation timeline
+        if 'implementation_timeline' in strategy:
+            timeline = strategy['implementation_timeline']
+            for phase, details in timeline.items():
+                if isinstance(details, dict) and 'period' in details:
+                    period = details['period']
+                    start_year = period.split('-')[0]
+                    events.append({
+                        "date": f"{start_year}-01-01",
+                        "country": strategy.get('country_name', country_code),
+                        "country_code": country_code,
+                        "event": f"{phase.title()} Phase",
+                        "title": details.get('focus', 'Implementation Phase'),
+                        "type": "milestone",
+                        "color": color
+                    })
         
-        # Sort by date
-        timeline_events.sort(key=lambda x: x['date'])
+        return events
+    
+    def timeline_index(self) -> TimelineIndex:
+        """Date-sorted event index, brought up to date with the current snapshot"""
+        snapshot = self._load_all_strategies()
+        if snapshot.version != self._timeline_version:
+            self._timeline.sync(snapshot)
+            self._timeline_version = snapshot.version
+        return self._timeline
+    
+    @memoize_per_snapshot
+    def generate_timeline(self) -> Dict[str, Any]:
+        """Generate timeline visualization of AI strategy development"""
+        timeline_events = list(self.timeline_index().events)
         
         return {
             "events": timeline_events,
@@ -276,60 +474,115 @@ class VisualizationEngine:
             }
         }
     
-    def generate_comparison_chart(self, countries: List[str], metric: str = "budget") -> Dict[str, Any]:
-        """Generate comparison chart for specified countries and metric"""
-        
+    def query_timeline(self, start: str = None, end: str = None, countries: List[str] = None,
+                       types: List[str] = None, offset: int = 0, limit: int = 100) -> Dict[str, Any]:
+        """One page of timeline events in a date window; raises ValueError on malformed dates"""
+        page = self.timeline_index().query(start, end, countries, types, offset, limit)
+        return {
+            "events": page["events"],
+            "metadata": {
+                "total_events": page["total"],
+                "offset": page["offset"],
+                "limit": page["limit"],
+                "next_offset": page["next_offset"],
+                "date_range": {"start": start, "end": end}
+            }
+        }
+    
+    @memoize_per_snapshot
+    def _comparison_table(self) -> Tuple[List[str], List[str], List[str], np.ndarray]:
+        """Country codes, country names, budget labels and the country x COMPARISON_METRICS value table"""
         strategies = self._load_all_strategies()
+        countries = sorted(strategies.keys())
+        
+        table = np.zeros((len(countries), len(COMPARISON_METRICS)))
+        names, budget_labels = [], []
+        for i, country_code in enumerate(countries):
+            strategy = strategies[country_code]
+            names.append(strategy.get('country_name', country_code))
+            budget_labels.append(strategy.get('funding_strategy', {}).get('total_budget') or "Not specified")
+            table[i] = [
+                strategy_budget(strategy),
+                len(sector_names(strategy)),
+                len(strategy.get('key_initiatives', []) or []),
+                len(self._extract_themes(strategy)),
+                len([p for p in strategy.get('international_cooperation', []) or [] if p])
+            ]
         
-        chart_data = []
-        
-        for country_code in countries:
-            if country_code in strategies:
-                strategy = strategies[country_code]
-                
-                if metric == "budget":
-                    budget_str = strategy.get('funding_strategy', {}).get('total_budget', '0')
-                    # Extract numeric value (simplified)
-                    budget_value = self._extract_budget_value(budget_str)
-                    chart_data.append({
-                        "country": strategy.get('country_name', country_code),
-                        "country_code": country_code,
-                        "value": budget_value,
-                        "label": budget_str,
-                        "color": self.color_schemes["countries"].get(country_code, "#333333")
-                    })
-                
-                elif metric == "sectors":
-                    sectors_count = len(strategy.get('priority_sectors', []))
-                    chart_data.append({
-                        "country": strategy.get('country_name', country_code),
-                        "country_code": country_code,
-                        "value": sectors_count,
-                        "label": f"{sectors_count} sectors",
-                        "color": self.color_schemes["countries"].get(country_code, "#333333")
-                    })
-                
-                elif metric == "initiatives":
-                    initiatives_count = len(strategy.get('key_initiatives', []))
-                    chart_data.append({
-                        "country": strategy.get('country_name', country_code),
-                        "country_code": country_code,
-                        "value": initiatives_count,
-                        "label": f"{initiatives_count} initiatives",
-                        "color": self.color_schemes["countries"].get(country_code, "#333333")
-                    })
+        return countries, names, budget_labels, table
+    
+    def generate_comparison(self, countries: List[str], metrics: List[str] = None) -> Dict[str, Any]:
+        """Bar charts of several metrics for several countries from one pass over the comparison table
+        
+        Each chart carries every country's raw value and its value as a
+        fraction of the largest in the selection (0 when all are zero), so
+        the charts can be drawn side by side on a common scale.
+        """
+        metrics = list(dict.fromkeys(metrics)) if metrics else list(COMPARISON_METRICS)
+        unknown = [metric for metric in metrics if metric not in COMPARISON_METRICS]
+        if unknown:
+            raise ValueError(f"Unknown comparison metrics {unknown}; expected some of {list(COMPARISON_METRICS)}")
+        
+        # Only known codes reach the memo key, so arbitrary query strings cannot add entries
+        known = self._load_all_strategies()
+        requested = list(dict.fromkeys(countries))
+        selected = [code for code in requested if code in known]
+        return dict(self._comparison(selected, metrics), missing=[code for code in requested if code not in known])
+    
+    @memoize_per_snapshot
+    def _comparison(self, selected: List[str], metrics: List[str]) -> Dict[str, Any]:
+        codes, names, budget_labels, table = self._comparison_table()
+        row_of = {code: i for i, code in enumerate(codes)}
+        rows = np.array([row_of[code] for code in selected], dtype=np.intp)
+        columns = np.array([COMPARISON_METRICS.index(metric) for metric in metrics], dtype=np.intp)
+        
+        values = table[np.ix_(rows, columns)]
+        minima = values.min(axis=0) if len(rows) else np.zeros(len(metrics))
+        maxima = values.max(axis=0) if len(rows) else np.zeros(len(metrics))
+        normalized = np.divide(values, maxima, out=np.zeros_like(values), where=maxima > 0)
+        
+        charts = {}
+        for j, metric in enumerate(metrics):
+            data = []
+            for k, row in enumerate(rows):
+                value = float(values[k, j])
+                data.append({
+                    "country": names[row],
+                    "country_code": codes[row],
+                    "value": value if metric == "budget" else int(value),
+                    "normalized": round(float(normalized[k, j]), 4),
+                    "label": budget_labels[row] if metric == "budget" else f"{int(value)} {metric}",
+                    "color": self.color_schemes["countries"].get(codes[row], "#333333")
+                })
+            charts[metric] = {
+                "data": data,
+                "metric": metric,
+                "chart_type": "bar",
+                "metadata": {
+                    "countries_compared": len(data),
+                    "max_value": float(maxima[j]),
+                    "min_value": float(minima[j])
+                }
+            }
         
         return {
-            "data": chart_data,
-            "metric": metric,
-            "chart_type": "bar",
-            "metadata": {
-                "countries_compared": len(chart_data),
-                "max_value": max([d["value"] for d in chart_data]) if chart_data else 0,
-                "min_value": min([d["value"] for d in chart_data]) if chart_data else 0
-            }
+            "countries": selected,
+            "metrics": metrics,
+            "charts": charts
         }
     
+    def generate_comparison_chart(self, countries: List[str], metric: str = "budget") -> Dict[str, Any]:
+        """Generate comparison chart for specified countries and metric; an unknown metric gives an empty chart"""
+        if metric not in COMPARISON_METRICS:
+            return {
+                "data": [],
+                "metric": metric,
+                "chart_type": "bar",
+                "metadata": {"countries_compared": 0, "max_value": 0, "min_value": 0}
+            }
+        return self.generate_comparison(countries, [metric])["charts"][metric]
+    
+    @memoize_per_snapshot
     def generate_sector_analysis(self) -> Dict[str, Any]:
         """Generate sector-wise analysis across all countries"""
         
@@ -370,9 +623,9 @@ class VisualizationEngine:
             }
         }
     
-    def generate_theme_heatmap(self) -> Dict[str, Any]:
-        """Generate heatmap showing theme distribution across countries"""
-        
+    @memoize_per_snapshot
+    def _theme_matrix(self) -> Tuple[List[str], List[str], List[str], np.ndarray]:
+        """Country codes, country names, themes and the boolean country x theme matrix"""
         strategies = self._load_all_strategies()
         
         # Extract themes for each country
@@ -384,50 +637,83 @@ class VisualizationEngine:
             country_themes[country_code] = themes
             all_themes.update(themes)
         
-        # Create heatmap matrix
         countries = list(strategies.keys())
-        themes = sorted(list(all_themes))
+        themes = sorted(all_themes)
+        theme_index = {theme: j for j, theme in enumerate(themes)}
         
-        heatmap_data = []
+        matrix = np.zeros((len(countries), len(themes)), dtype=bool)
         for i, country in enumerate(countries):
-            for j, theme in enumerate(themes):
-                value = 1 if theme in country_themes[country] else 0
-                heatmap_data.append({
-                    "country": strategies[country].get('country_name', country),
-                    "country_code": country,
-                    "theme": theme,
-                    "value": value,
-                    "x": j,
-                    "y": i
-                })
+            matrix[i, [theme_index[theme] for theme in country_themes[country]]] = True
         
-        return {
-            "data": heatmap_data,
-            "countries": [strategies[c].get('country_name', c) for c in countries],
+        names = [strategies[c].get('country_name', c) for c in countries]
+        return countries, names, themes, matrix
+    
+    @memoize_per_snapshot
+    def generate_theme_heatmap(self, encoding: str = "cells") -> Dict[str, Any]:
+        """Generate heatmap showing theme distribution across countries
+        
+        encoding="cells" lists one object per cell; "dense" packs the
+        row-major 0/1 matrix into base64 bits (most significant bit first);
+        "sparse" lists the row and column indices of the non-zero cells.
+        """
+        heatmap = self.stream_theme_heatmap(encoding)
+        if encoding == "sparse":
+            heatmap["rows"], heatmap["cols"] = heatmap["rows"].tolist(), heatmap["cols"].tolist()
+        elif encoding == "cells":
+            heatmap["data"] = list(heatmap["data"])
+        return heatmap
+    
+    def stream_theme_heatmap(self, encoding: str = "cells") -> Dict[str, Any]:
+        """Heatmap whose cells are a generator and sparse indices NumPy arrays, for streaming responses
+        
+        Built from the memoized theme matrix, so a streamed response holds
+        neither the cell objects nor index lists in memory at once.
+        """
+        if encoding not in HEATMAP_ENCODINGS:
+            raise ValueError(f"Unknown heatmap encoding '{encoding}'; expected one of {list(HEATMAP_ENCODINGS)}")
+        
+        countries, names, themes, matrix = self._theme_matrix()
+        heatmap = {
+            "encoding": encoding,
+            "countries": names,
+            "country_codes": countries,
             "themes": themes,
             "metadata": {
                 "matrix_size": f"{len(countries)}x{len(themes)}",
-                "total_cells": len(heatmap_data),
-                "coverage_percentage": (sum([d["value"] for d in heatmap_data]) / len(heatmap_data)) * 100
+                "total_cells": int(matrix.size),
+                "non_zero_cells": int(matrix.sum()),
+                "coverage_percentage": float(matrix.mean() * 100) if matrix.size else 0.0
             }
         }
+        
+        if encoding == "dense":
+            heatmap["shape"] = list(matrix.shape)
+            heatmap["bits"] = base64.b64encode(np.packbits(matrix, axis=None).tobytes()).decode('ascii')
+        elif encoding == "sparse":
+            heatmap["rows"], heatmap["cols"] = np.nonzero(matrix)
+        else:
+            heatmap["data"] = (
+                {
+                    "country": names[i],
+                    "country_code": country,
+                    "theme": theme,
+                    "value": int(matrix[i, j]),
+                    "x": j,
+                    "y": i
+                }
+                for i, country in enumerate(countries) for j, theme in enumerate(themes)
+            )
+        
+        return heatmap
     
-    def _load_all_strategies(self) -> Dict[str, Dict[str, Any]]:
-        """Load all processed strategy data"""
-        strategies = {}
-        
-        if not self.processed_dir.exists():
-            return strategies
-        
-        for strategy_file in self.processed_dir.glob("strategy_*.json"):
-            try:
-                country_code = strategy_file.stem.split("_")[1]
-                with open(strategy_file, 'r') as f:
-                    strategies[country_code] = json.load(f)
-            except Exception as e:
-                logger.error(f"Error loading strategy file {strategy_file}: {e}")
-        
-        return strategies
+    @property
+    def data_version(self) -> str:
+        """Version of the strategy snapshot the generators currently read"""
+        return self._load_all_strategies().version
+    
+    def _load_all_strategies(self) -> StrategySnapshot:
+        """Get the shared snapshot of all strategies, loading only files changed since the last one"""
+        return self.strategies.snapshot()
     
     def _extract_themes(self, strategy: Dict[str, Any]) -> set:
         """Extract themes from strategy data"""
@@ -457,77 +743,15 @@ class VisualizationEngine:
     
     def _extract_budget_value(self, budget_str: str) -> float:
         """Extract numeric budget value from string"""
-        if not budget_str or budget_str == "Not specified":
-            return 0
-        
-        # Simple extraction (would need more sophisticated parsing in real implementation)
-        budget_str = budget_str.upper().replace('USD', '').replace('$', '').strip()
-        
-        try:
-            if 'MILLION' in budget_str or 'M' in budget_str:
-                number = float(''.join(filter(str.isdigit, budget_str.split('M')[0])))
-                return number
-            elif 'BILLION' in budget_str or 'B' in budget_str:
-                number = float(''.join(filter(str.isdigit, budget_str.split('B')[0])))
-                return number * 1000
-            else:
-                return float(''.join(filter(str.isdigit, budget_str)))
-        except:
-            return 0
+        return parse_budget(budget_str)
     
+    @memoize_per_snapshot
     def generate_dashboard_summary(self) -> Dict[str, Any]:
         """Generate summary data for main dashboard"""
+        self._summary.sync(self._load_all_strategies())
+        record = self._summary.record
         
-        strategies = self._load_all_strategies()
-        
-        # Basic statistics
-        total_countries = len(strategies)
-        published_count = sum(1 for s in strategies.values() if s.get('status') == 'published')
-        draft_count = sum(1 for s in strategies.values() if s.get('status') == 'draft')
-        
-        # Theme analysis
-        all_themes = set()
-        for strategy in strategies.values():
-            all_themes.update(self._extract_themes(strategy))
-        
-        # Sector analysis
-        all_sectors = set()
-        for strategy in strategies.values():
-            if 'priority_sectors' in strategy:
-                for sector in strategy['priority_sectors']:
-                    sector_name = sector.get('name', str(sector)) if isinstance(sector, dict) else str(sector)
-                    all_sectors.add(sector_name)
-        
-        # Recent updates
-        recent_strategies = []
-        for country_code, strategy in strategies.items():
-            if 'publication_date' in strategy:
-                recent_strategies.append({
-                    "country": strategy.get('country_name', country_code),
-                    "date": strategy['publication_date'],
-                    "title": strategy.get('strategy_title', 'AI Strategy')
-                })
-        
-        recent_strategies.sort(key=lambda x: x['date'], reverse=True)
-        
-        return {
-            "statistics": {
-                "total_countries": total_countries,
-                "published_strategies": published_count,
-                "draft_strategies": draft_count,
-                "total_themes": len(all_themes),
-                "total_sectors": len(all_sectors)
-            },
-            "top_themes": list(all_themes)[:8],
-            "top_sectors": list(all_sectors)[:8],
-            "recent_updates": recent_strategies[:5],
-            "country_status": [
-                {
-                    "country": strategy.get('country_name', code),
-                    "country_code": code,
-                    "status": strategy.get('status', 'unknown'),
-                    "color": self.color_schemes["countries"].get(code, "#333333")
-                }
-                for code, strategy in strategies.items()
-            ]
-        }
+        return dict(record, country_status=[
+            dict(country, color=self.color_schemes["countries"].get(country["country_code"], "#333333"))
+            for country in record["country_status"]
+        ])
@@ -72,8 +72,7 @@ async function loadInitialData() {
         currentData.countries = await countriesResponse.json();
         
         // Load themes data
-        const themesResponse = await fetch('/api/themes');
-        currentData.themes = await themesResponse.json();
+        currentData.themes = await fetchAnalysis('/api/themes');
         
         hideLoading();
         
@@ -84,7 +83,7 @@ async function loadInitialData() {
 }
 
 // Visualization Functions
-function createMindMap(containerId, data) {
+function createMindMap(containerId, data, options = {}) {
     const container = d3.select(`#${containerId}`);
     const width = container.node().getBoundingClientRect().width;
     const height = 600;
@@ -128,7 +127,18 @@ function createMindMap(containerId, data) {
     
     node.append('circle')
         .attr('r', d => d.data.size || 5)
-        .attr('fill', d => getNodeColor(d.data.type));
+        .attr('fill', d => getNodeColor(d.data.type))
+        .attr('stroke', d => isCollapsed(d.data) ? '#343a40' : null);
+    
+    // Depth-limited trees mark cut-off nodes with child_count: load their children on click
+    if (options.loadChildren) {
+        node.filter(d => isCollapsed(d.data))
+            .style('cursor', 'pointer')
+            .on('click', async (event, d) => {
+                d.data.children = await options.loadChildren(d.data);
+                createMindMap(containerId, data, options);
+            });
+    }
     
     node.append('text')
         .attr('class', 'mind-map-text')
@@ -144,7 +154,11 @@ function createMindMap(containerId, data) {
     visualizations[containerId] = { svg, data };
 }
 
-function createNetworkGraph(containerId, data) {
+function isCollapsed(node) {
+    return node.child_count > 0 && !node.children;
+}
+
+function createNetworkGraph(containerId, data, options = {}) {
     const container = d3.select(`#${containerId}`);
     const width = container.node().getBoundingClientRect().width;
     const height = 700;
@@ -156,6 +170,12 @@ function createNetworkGraph(containerId, data) {
         .attr('width', width)
         .attr('height', height);
     
+    // Pre-laid-out graphs carry server-computed positions: draw them without simulating
+    if (data.metadata && data.metadata.layout) {
+        drawPrelaidNetwork(containerId, svg, data, width, height, options);
+        return;
+    }
+    
     // Create force simulation
     const simulation = d3.forceSimulation(data.nodes)
         .force('link', d3.forceLink(data.links).id(d => d.id).distance(100))
@@ -198,6 +218,10 @@ function createNetworkGraph(containerId, data) {
         showTooltip(event, d);
     }).on('mouseout', hideTooltip);
     
+    if (options.onNodeClick) {
+        node.on('click', (event, d) => options.onNodeClick(d));
+    }
+    
     // Update positions on simulation tick
     simulation.on('tick', () => {
         link
@@ -237,6 +261,62 @@ function createNetworkGraph(containerId, data) {
     visualizations[containerId] = { svg, simulation, data };
 }
 
+function drawPrelaidNetwork(containerId, svg, data, width, height, options = {}) {
+    const layout = data.metadata.layout;
+    const xScale = d3.scaleLinear().domain([0, layout.width]).range([0, width]);
+    const yScale = d3.scaleLinear().domain([0, layout.height]).range([0, height]);
+    
+    const nodeById = new Map(data.nodes.map(d => [d.id, d]));
+    const links = data.links
+        .filter(d => nodeById.has(d.source) && nodeById.has(d.target))
+        .map(d => ({...d, source: nodeById.get(d.source), target: nodeById.get(d.target)}));
+    
+    // Add links
+    const link = svg.append('g')
+        .selectAll('line')
+        .data(links)
+        .enter().append('line')
+        .attr('class', 'network-link')
+        .attr('stroke-width', d => Math.sqrt(d.value))
+        .attr('x1', d => xScale(d.source.x))
+        .attr('y1', d => yScale(d.source.y))
+        .attr('x2', d => xScale(d.target.x))
+        .attr('y2', d => yScale(d.target.y));
+    
+    // Add nodes
+    const node = svg.append('g')
+        .selectAll('circle')
+        .data(data.nodes)
+        .enter().append('circle')
+        .attr('class', 'network-node')
+        .attr('r', d => d.size || 10)
+        .attr('fill', d => d.color || '#69b3a2')
+        .attr('cx', d => xScale(d.x))
+        .attr('cy', d => yScale(d.y));
+    
+    // Add labels
+    svg.append('g')
+        .selectAll('text')
+        .data(data.nodes)
+        .enter().append('text')
+        .attr('class', 'network-text')
+        .text(d => d.name)
+        .attr('x', d => xScale(d.x) + 12)
+        .attr('y', d => yScale(d.y) + 3);
+    
+    // Add tooltips
+    node.on('mouseover', function(event, d) {
+        showTooltip(event, d);
+    }).on('mouseout', hideTooltip);
+    
+    if (options.onNodeClick) {
+        node.on('click', (event, d) => options.onNodeClick(d));
+    }
+    
+    // Store visualization reference
+    visualizations[containerId] = { svg, simulation: null, data };
+}
+
 function createTimeline(containerId, data) {
     const container = d3.select(`#${containerId}`);
     const width = container.node().getBoundingClientRect().width;
@@ -330,9 +410,17 @@ function createHeatmap(containerId, data) {
         .interpolator(d3.interpolateBlues)
         .domain([0, 1]);
     
+    // Sparse payloads list only non-zero cells: paint the zero background once
+    if (data.encoding === 'sparse') {
+        g.append('rect')
+            .attr('width', chartWidth)
+            .attr('height', chartHeight)
+            .attr('fill', colorScale(0));
+    }
+    
     // Add cells
     g.selectAll('.heatmap-cell')
-        .data(data.data)
+        .data(heatmapCells(data))
         .enter().append('rect')
         .attr('class', 'heatmap-cell')
         .attr('x', d => xScale(d.theme))
@@ -360,6 +448,126 @@ function createHeatmap(containerId, data) {
     visualizations[containerId] = { svg, data };
 }
 
+// Cell objects for any heatmap encoding: verbose cells, dense packed bits, or sparse coordinates
+function heatmapCells(data) {
+    const cell = (row, col, value) => ({
+        country: data.countries[row],
+        country_code: data.country_codes[row],
+        theme: data.themes[col],
+        value: value,
+        x: col,
+        y: row
+    });
+    
+    if (data.encoding === 'dense') {
+        const bytes = atob(data.bits);
+        const [rows, cols] = data.shape;
+        const cells = [];
+        for (let index = 0; index < rows * cols; index++) {
+            const bit = (bytes.charCodeAt(index >> 3) >> (7 - (index & 7))) & 1;
+            cells.push(cell(Math.floor(index / cols), index % cols, bit));
+        }
+        return cells;
+    }
+    if (data.encoding === 'sparse') {
+        return data.rows.map((row, i) => cell(row, data.cols[i], 1));
+    }
+    return data.data;
+}
+
+// Choropleth map of strategy status; options.loadResolution(zoom) swaps in finer geometry when zooming in
+function createChoroplethMap(containerId, topology, options = {}) {
+    const container = d3.select(`#${containerId}`);
+    const width = container.node().getBoundingClientRect().width;
+    const height = options.height || 480;
+    
+    container.selectAll('*').remove();
+    
+    const svg = container.append('svg')
+        .attr('width', width)
+        .attr('height', height);
+    const g = svg.append('g');
+    
+    const statusColors = {published: '#198754', draft: '#ffc107', unknown: '#0dcaf0'};
+    let features = topologyFeatures(topology);
+    const projection = d3.geoMercator().fitSize([width, height], {type: 'FeatureCollection', features});
+    const path = d3.geoPath(projection);
+    
+    function draw() {
+        g.selectAll('.map-country')
+            .data(features, d => d.id)
+            .join('path')
+            .attr('class', 'map-country')
+            .attr('d', path)
+            .attr('fill', d => d.properties.has_strategy ? (statusColors[d.properties.status] || '#6c757d') : '#e9ecef')
+            .attr('stroke', '#ffffff')
+            .attr('stroke-width', 0.5)
+            .on('mouseover', (event, d) => showTooltip(event, {
+                name: d.properties.name,
+                description: d.properties.has_strategy
+                    ? `${d.properties.status}, ${d.properties.theme_count} themes, score ${d.properties.score}`
+                    : 'No AI strategy recorded'
+            }))
+            .on('mouseout', hideTooltip)
+            .on('click', (event, d) => {
+                if (d.properties.has_strategy) window.location.href = `/country/${d.id}`;
+            });
+    }
+    draw();
+    
+    // Map zoom levels start at 2 for the whole continent and add one per doubling
+    let resolution = topology.metadata ? topology.metadata.resolution : null;
+    svg.call(d3.zoom()
+        .scaleExtent([1, 16])
+        .on('zoom', event => {
+            g.attr('transform', event.transform);
+            g.selectAll('.map-country').attr('stroke-width', 0.5 / event.transform.k);
+        })
+        .on('end', async event => {
+            if (!options.loadResolution) return;
+            const finer = await options.loadResolution(2 + Math.log2(event.transform.k));
+            if (finer && finer.metadata.resolution !== resolution) {
+                resolution = finer.metadata.resolution;
+                features = topologyFeatures(finer);
+                draw();
+            }
+        }));
+    
+    visualizations[containerId] = { svg, data: topology };
+}
+
+// GeoJSON features from a quantized, delta-encoded topology
+function topologyFeatures(topology) {
+    const [sx, sy] = topology.transform.scale;
+    const [tx, ty] = topology.transform.translate;
+    const arcs = topology.arcs.map(arc => {
+        let x = 0, y = 0;
+        return arc.map(([dx, dy]) => [(x += dx) * sx + tx, (y += dy) * sy + ty]);
+    });
+    
+    const ring = refs => {
+        const points = [];
+        refs.forEach(ref => {
+            const arc = ref >= 0 ? arcs[ref] : arcs[~ref].slice().reverse();
+            arc.forEach((point, i) => { if (i > 0 || points.length === 0) points.push(point); });
+        });
+        // Boundaries keep the shapefile winding (clockwise exteriors), which is what d3-geo expects
+        return points;
+    };
+    
+    return topology.objects.countries.geometries.map(geometry => ({
+        type: 'Feature',
+        id: geometry.id,
+        properties: geometry.properties,
+        geometry: {
+            type: geometry.type,
+            coordinates: geometry.type === 'Polygon'
+                ? geometry.arcs.map(ring)
+                : geometry.arcs.map(polygon => polygon.map(ring))
+        }
+    }));
+}
+
 // Utility Functions
 function getNodeColor(type) {
     const colors = {
@@ -437,6 +645,24 @@ function debounce(func, wait) {
     };
 }
 
+// JSON from an analysis endpoint; a 202 means the analysis was queued, so poll its job and fetch again
+async function fetchAnalysis(url, interval = 1000) {
+    let response = await fetch(url);
+    while (response.status === 202) {
+        const job = await response.json();
+        let status = job.status;
+        while (status === 'pending' || status === 'running') {
+            await new Promise(resolve => setTimeout(resolve, interval));
+            status = (await (await fetch(job.status_url)).json()).status;
+        }
+        if (status !== 'succeeded') {
+            throw new Error(`Analysis job ${job.job_id} ${status}`);
+        }
+        response = await fetch(url);
+    }
+    return response.json();
+}
+
 // Search functionality
 async function handleSearch(event) {
     const query = event.target.value.trim();
@@ -591,9 +817,11 @@ window.AIStrategiesPortal = {
     createNetworkGraph,
     createTimeline,
     createHeatmap,
+    createChoroplethMap,
     showTooltip,
     hideTooltip,
     showLoading,
     hideLoading,
-    showError
+    showError,
+    fetchAnalysis
 };
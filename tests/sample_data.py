@@ -0,0 +1,175 @@
+"""
+Sample processed strategies shared by the analysis and visualization tests
+"""
+
+import json
+import tempfile
+import unittest
+from functools import cached_property
+from pathlib import Path
+
+from src.analyzer import CrossCuttingAnalyzer
+from src.strategy_store import StrategyProvider
+from src.visualizer import VisualizationEngine
+
+SAMPLE_STRATEGIES = {
+    "KE": {
+        "country_code": "KE",
+        "country_name": "Kenya",
+        "strategy_title": "Kenya National Artificial Intelligence Strategy 2022-2027",
+        "publication_date": "2022-03-15",
+        "status": "published",
+        "vision": "To be a globally competitive AI-driven economy that harnesses artificial intelligence for sustainable development",
+        "objectives": [
+            "Develop AI capabilities and infrastructure",
+            "Build AI talent and skills",
+            "Ensure ethical and responsible AI development"
+        ],
+        "strategic_pillars": [
+            {"name": "Human Capital Development", "description": "Build AI skills across all sectors",
+             "key_actions": ["Integrate AI in education curriculum", "Establish AI training programs"]}
+        ],
+        "priority_sectors": [
+            {"name": "Agriculture", "ai_applications": ["Precision farming"], "expected_impact": "Higher yields"},
+            {"name": "Healthcare", "ai_applications": ["Medical diagnosis"], "expected_impact": "Better access"},
+            {"name": "Financial Services", "ai_applications": ["Credit scoring"], "expected_impact": "Inclusion"}
+        ],
+        "key_initiatives": [
+            {"name": "Digital Skills for All Program", "description": "Train 100,000 Kenyans in AI and digital skills",
+             "budget": "USD 30 million", "timeline": {"start": "2022", "end": "2027"},
+             "partners": ["Technical institutions", "Private sector"]},
+            {"name": "AI for Agriculture Platform", "description": "Deploy AI solutions for smallholder farmers",
+             "budget": "USD 20 million", "timeline": {"start": "2023", "end": "2026"},
+             "partners": ["Farmer cooperatives"]}
+        ],
+        "governance_structure": {
+            "lead_agency": "Ministry of ICT, Innovation and Youth Affairs",
+            "coordinating_body": "National AI Steering Committee"
+        },
+        "funding_strategy": {"total_budget": "USD 200 million over 5 years"},
+        "implementation_timeline": {
+            "phase1": {"period": "2022-2024", "focus": "Foundation building"},
+            "phase2": {"period": "2025-2027", "focus": "Scale and expansion"}
+        },
+        "themes": ["Digital Economy", "Innovation", "Skills Development", "Ethics"],
+        "international_cooperation": ["African Union", "EAC", "World Bank"]
+    },
+    "NG": {
+        "country_code": "NG",
+        "country_name": "Nigeria",
+        "strategy_title": "National Artificial Intelligence Strategy for Nigeria",
+        "publication_date": "2021-11-20",
+        "status": "published",
+        "vision": "To position Nigeria as a leading AI nation in Africa and globally competitive in the AI value chain",
+        "objectives": [
+            "Build AI research and development capacity",
+            "Develop AI talent pipeline",
+            "Establish AI governance and ethics framework"
+        ],
+        "priority_sectors": ["Agriculture", "Healthcare", "Financial Services", "Oil and Gas"],
+        "key_initiatives": [
+            {"name": "National AI Research Institute", "description": "Establish premier AI research facility",
+             "budget": "USD 100M", "timeline": {"start": "2022", "end": "2026"}},
+            {"name": "AI for Agriculture Program", "description": "Deploy AI solutions for smallholder farmers",
+             "budget": "USD 25M", "timeline": {"start": "2022", "end": "2025"},
+             "partners": ["Farmer cooperatives", "Tech companies"]}
+        ],
+        "governance_structure": {
+            "lead_agency": "Federal Ministry of Communications and Digital Economy",
+            "coordinating_body": "National AI Advisory Council"
+        },
+        "timeline": {"short_term": "2022-2024", "medium_term": "2025-2027", "long_term": "2028-2030"},
+        "themes": ["Research Excellence", "Skills Development", "Digital Transformation", "Innovation"],
+        "international_cooperation": ["African Union", "ECOWAS", "World Bank"]
+    },
+    "ZA": {
+        "country_code": "ZA",
+        "country_name": "South Africa",
+        "strategy_title": "South Africa's National Artificial Intelligence Strategy",
+        "publication_date": "2021-04-15",
+        "status": "published",
+        "vision": "To leverage AI for inclusive economic growth, social development, and improved quality of life",
+        "objectives": [
+            "Develop AI capabilities and infrastructure",
+            "Build human capital for AI",
+            "Ensure responsible AI development"
+        ],
+        "priority_sectors": ["Mining", "Agriculture", "Healthcare", "Financial Services"],
+        "key_initiatives": [
+            {"name": "AI Skills Development Program", "description": "Train 50,000 professionals in AI technologies",
+             "budget": "USD 40M", "timeline": {"start": "2022", "end": "2026"},
+             "partners": ["Universities"]}
+        ],
+        "governance_structure": {
+            "lead_agency": "Department of Science and Innovation",
+            "coordinating_body": "National AI Council"
+        },
+        "timeline": {"phase1": "2021-2023", "phase2": "2024-2026", "phase3": "2027-2030"},
+        "themes": ["Innovation", "Skills Development", "Responsible AI", "Economic Growth"],
+        "international_cooperation": ["BRICS", "African Union", "SADC"]
+    },
+    "RW": {
+        "country_code": "RW",
+        "country_name": "Rwanda",
+        "strategy_title": "Rwanda National AI Policy",
+        "publication_date": "2023-04-20",
+        "status": "published",
+        "vision": "Harness AI for inclusive and sustainable socio-economic transformation",
+        "objectives": ["Build AI skills for the future", "Strengthen data infrastructure"],
+        "priority_sectors": ["Healthcare", "Education", "Agriculture"],
+        "key_initiatives": [
+            {"name": "AI Talent Academy", "description": "Train young Rwandans in AI and data science skills",
+             "budget": "USD 10M", "timeline": {"start": "2023", "end": "2028"}}
+        ],
+        "governance_structure": {"lead_agency": "Ministry of ICT and Innovation"},
+        "themes": ["Skills Development", "Data Governance", "Innovation"],
+        "international_cooperation": ["African Union", "EAC"]
+    },
+    "MA": {
+        "country_code": "MA",
+        "country_name": "Morocco",
+        "strategy_title": "Morocco Digital 2030 AI Roadmap",
+        "publication_date": "2024-01-10",
+        "status": "draft",
+        "vision": "Make Morocco a regional hub for trustworthy AI",
+        "objectives": ["Promote AI innovation in industry"],
+        "priority_sectors": ["Manufacturing", "Tourism"],
+        "key_initiatives": [],
+        "themes": ["Innovation", "Ethics"],
+        "international_cooperation": ["African Union", "AMU"]
+    }
+}
+
+def write_sample_strategies(data_dir, codes=None):
+    """Write sample strategies as processed JSON files under data_dir"""
+    processed_dir = Path(data_dir) / "processed"
+    processed_dir.mkdir(parents=True, exist_ok=True)
+    for code, strategy in SAMPLE_STRATEGIES.items():
+        if codes is None or code in codes:
+            with open(processed_dir / f"strategy_{code}.json", "w") as f:
+                json.dump(strategy, f, indent=2)
+    return processed_dir
+
+class SampleDataTestCase(unittest.TestCase):
+    """Test case with the sample strategies written to a fresh temporary data directory
+    
+    The analyzer, provider and visualization engine over that directory are
+    created on first use; a test class may assign its own in setUp instead.
+    """
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.processed_dir = write_sample_strategies(self.tmp.name)
+    
+    @cached_property
+    def analyzer(self) -> CrossCuttingAnalyzer:
+        return CrossCuttingAnalyzer(data_dir=self.tmp.name)
+    
+    @cached_property
+    def provider(self) -> StrategyProvider:
+        return StrategyProvider(self.processed_dir)
+    
+    @cached_property
+    def engine(self) -> VisualizationEngine:
+        return VisualizationEngine(data_dir=self.tmp.name, provider=self.provider)
@@ -0,0 +1,476 @@
+import unittest
+import json
+import time
+import numpy as np
+from pathlib import Path
+from unittest import mock
+
+from src import analyzer as analyzer_module
+from src.analyzer import ANALYSIS_MODULES, CrossCuttingAnalyzer
+from src.dedup import InitiativeDeduplicator
+from src.itemsets import ItemsetMiner
+from src.jobs import JobRunner, JobStore
+from src.scoring import parse_weights
+from src.text_similarity import TfidfIndex, tokenize
+from src.theme_clustering import ThemeCategorizer
+from src.trends import TrendCube
+from tests.sample_data import SAMPLE_STRATEGIES, SampleDataTestCase
+
+class TestTextSimilarity(SampleDataTestCase):
+    def test_tokenize_drops_stop_words(self):
+        """Test that tokenization lowercases and drops stop words and bare numbers"""
+        self.assertEqual(tokenize("Build the AI Skills of 2030"), ["build", "ai", "skills"])
+    
+    def test_batch_scores_match_pairwise_cosine(self):
+        """Test that batched cosine scores are symmetric with unit self-similarity"""
+        index = TfidfIndex()
+        texts = {"a": "ai skills training", "b": "skills training for farmers", "c": "mining policy"}
+        for doc_id, text in texts.items():
+            index.add(doc_id, text)
+        
+        doc_ids, matrix = index.similarity_matrix()
+        self.assertEqual(doc_ids, ["a", "b", "c"])
+        for i in range(3):
+            self.assertAlmostEqual(matrix[i, i], 1.0)
+        self.assertGreater(matrix[0, 1], matrix[0, 2])
+        self.assertAlmostEqual(matrix[0, 1], matrix[1, 0])
+    
+    def test_scores_match_dense_product(self):
+        """Test that inverted-index scoring equals the dense TF-IDF product, including unseen terms"""
+        index = TfidfIndex()
+        for code, strategy in SAMPLE_STRATEGIES.items():
+            index.add(code, strategy.get("vision", ""))
+        matrix = index.matrix()
+        dense = np.zeros((len(matrix.doc_ids), len(matrix.idf)))
+        for row in range(len(matrix.doc_ids)):
+            span = slice(matrix.indptr[row], matrix.indptr[row + 1])
+            dense[row, matrix.indices[span]] = matrix.data[span]
+        
+        queries = [index.vectorize("AI skills for agriculture"), index.vectorize("zebra"), index.row_vector("KE")]
+        for query, scores in zip(queries, index.cosine_scores(queries)):
+            expected = np.zeros(len(matrix.idf))
+            expected[query[0]] = query[1]
+            np.testing.assert_allclose(scores, dense @ expected)
+    
+    def test_similar_initiatives_across_countries(self):
+        """Test that matching initiatives in other countries are found"""
+        results = self.analyzer.find_similar_initiatives("KE", 1, top_k=1)
+        self.assertEqual(results[0]["country"], "NG")
+        self.assertEqual(results[0]["name"], "AI for Agriculture Program")
+    
+    def test_similar_strategies_excludes_self(self):
+        """Test nearest-neighbour strategies never include the queried country"""
+        results = self.analyzer.find_similar_strategies("KE", top_k=3)
+        self.assertEqual(len(results), 3)
+        self.assertNotIn("KE", [r["country"] for r in results])
+    
+    def test_index_updates_incrementally(self):
+        """Test that only changed strategies are re-vectorized"""
+        self.analyzer.text_similarity_matrix()
+        index = self.analyzer.text_index
+        with mock.patch('src.text_similarity.strategy_text', side_effect=AssertionError):
+            self.assertEqual(index.sync(self.analyzer.strategies), 0)
+        
+        changed = dict(SAMPLE_STRATEGIES["MA"], vision="Precision farming for smallholder farmers")
+        self.assertTrue(index.update_strategy("MA", changed))
+        self.assertFalse(index.update_strategy("MA", changed))
+
+class TestParallelAnalysis(SampleDataTestCase):
+    def test_parallel_matches_serial(self):
+        """Test that the process pool path gives results identical to the serial path"""
+        serial = self.analyzer.analyze_cross_cutting_themes(workers=1, force=True)
+        parallel = self.analyzer.analyze_cross_cutting_themes(workers=2, chunk_size=2, force=True)
+        self.assertEqual(json.dumps(serial), json.dumps(parallel))
+    
+    def test_theme_frequency_counts(self):
+        """Test that merged shard counts give the per-theme country lists"""
+        analysis = self.analyzer.analyze_cross_cutting_themes(chunk_size=1)
+        self.assertEqual(sorted(analysis["theme_analysis"]["Skills Development"]["countries"]), ["KE", "NG", "RW", "ZA"])
+        self.assertEqual(analysis["theme_analysis"]["Agriculture"]["frequency"], 4)
+    
+    def test_chunk_size_must_be_positive(self):
+        """Test that empty shards are rejected up front rather than failing mid-merge"""
+        with self.assertRaises(ValueError):
+            self.analyzer.analyze_cross_cutting_themes(chunk_size=0, force=True)
+        with self.assertRaises(ValueError):
+            CrossCuttingAnalyzer(data_dir=self.tmp.name, chunk_size=-1)
+
+class TestPersistedAnalysis(SampleDataTestCase):
+    def test_fresh_analyzer_reads_stored_analysis(self):
+        """Test that a new analyzer serves stored results without recomputing"""
+        first = CrossCuttingAnalyzer(data_dir=self.tmp.name).analyze_cross_cutting_themes()
+        
+        restarted = CrossCuttingAnalyzer(data_dir=self.tmp.name)
+        with mock.patch.object(restarted, '_count_features', side_effect=AssertionError("recomputed")):
+            self.assertEqual(restarted.analyze_cross_cutting_themes(), first)
+            self.assertEqual(len(restarted.get_all_themes()), first["total_themes"])
+    
+    def test_changed_strategy_invalidates_fingerprint(self):
+        """Test that editing a strategy file forces recomputation"""
+        analyzer = CrossCuttingAnalyzer(data_dir=self.tmp.name)
+        first = analyzer.analyze_cross_cutting_themes()
+        
+        with open(self.processed_dir / "strategy_MA.json", "w") as f:
+            json.dump(dict(SAMPLE_STRATEGIES["MA"], themes=["Innovation", "Ethics", "Tourism AI"]), f)
+        
+        self.assertIsNone(analyzer.load_analysis())
+        second = analyzer.analyze_cross_cutting_themes()
+        self.assertNotEqual(first["fingerprint"], second["fingerprint"])
+        self.assertIn("Tourism AI", second["theme_analysis"])
+    
+    def test_subset_run_keeps_full_analysis(self):
+        """Test that analysing a subset stores it separately instead of replacing the full analysis"""
+        full = self.analyzer.analyze_cross_cutting_themes()
+        subset = self.analyzer.analyze_cross_cutting_themes(countries=["KE", "NG"])
+        self.assertNotEqual(subset["fingerprint"], full["fingerprint"])
+        
+        restarted = CrossCuttingAnalyzer(data_dir=self.tmp.name)
+        self.assertEqual(restarted.load_analysis(), full)
+        self.assertEqual(restarted.load_analysis(subset["fingerprint"]), subset)
+    
+    def test_subset_order_shares_one_stored_analysis(self):
+        """Test that the same subset in another order reuses the stored analysis"""
+        first = self.analyzer.analyze_cross_cutting_themes(countries=["NG", "KE"])
+        with mock.patch.object(self.analyzer, "_count_features", side_effect=AssertionError):
+            second = self.analyzer.analyze_cross_cutting_themes(countries=["KE", "NG", "KE"])
+        self.assertEqual(second, first)
+        self.assertEqual(first["countries_analyzed"], ["KE", "NG"])
+    
+    def test_code_version_covers_text_similarity(self):
+        """Test that the tokenizer used by deduplication is part of the analysis code version"""
+        self.assertIn("text_similarity.py", ANALYSIS_MODULES)
+        for module_name in ANALYSIS_MODULES:
+            self.assertTrue((Path(analyzer_module.__file__).parent / module_name).exists())
+
+class TestThemeCategorization(SampleDataTestCase):
+    def test_related_names_join_seeded_categories(self):
+        """Test that themes sharing seed vocabulary are no longer filed under Other"""
+        categorized = self.analyzer.analyze_cross_cutting_themes()["categorized_themes"]
+        self.assertIn("Digital Economy", categorized["Strategic Focus"])
+        self.assertIn("Data Governance", categorized["Governance"])
+        self.assertIn("Tourism", categorized["Sectoral Applications"])
+    
+    def test_theme_map_is_cached(self):
+        """Test that the theme map is reused for the same incidence and read per theme"""
+        categorizer = ThemeCategorizer(self.analyzer.theme_categories)
+        incidence = {"Healthcare": ["KE", "NG"], "Health Systems": ["KE", "NG"], "Ethics": ["KE"]}
+        categorizer.fit(incidence)
+        
+        with mock.patch.object(categorizer, '_cluster', side_effect=AssertionError("reclustered")):
+            categorizer.fit(dict(incidence))
+        self.assertEqual(categorizer.category_of("Health Systems"), "Sectoral Applications")
+        self.assertEqual(categorizer.category_of("Unknown Theme"), "Other")
+
+class TestCollaborationGroups(SampleDataTestCase):
+    def test_miner_support_and_lift(self):
+        """Test that shared theme sets get the right countries, support and lift"""
+        miner = ItemsetMiner({
+            "A": {"Agriculture", "Skills Development", "Financial Services"},
+            "B": {"Agriculture", "Skills Development", "Financial Services", "Mining"},
+            "C": {"Agriculture", "Skills Development"},
+            "D": {"Mining"}
+        })
+        itemsets = miner.mine(min_support=0.5, max_size=3)
+        
+        top = itemsets[0]
+        self.assertEqual(sorted(top.items), ["Agriculture", "Financial Services", "Skills Development"])
+        self.assertEqual(top.countries, ["A", "B"])
+        self.assertAlmostEqual(top.support, 0.5)
+        self.assertAlmostEqual(top.lift, 0.5 / (0.75 * 0.75 * 0.5))
+        self.assertTrue(all(len(i.items) <= 3 for i in itemsets))
+    
+    def test_analysis_reports_groups(self):
+        """Test that cross-cutting analysis includes multi-theme collaboration groups"""
+        groups = self.analyzer.find_collaboration_groups(min_support=0.6, max_size=3)
+        
+        labels = [group["label"] for group in groups]
+        self.assertIn("Agriculture + Healthcare + Innovation", labels)
+
+class TestTrendCube(SampleDataTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cube = TrendCube(SAMPLE_STRATEGIES)
+    
+    def test_cumulative_theme_adoption(self):
+        """Test that theme adoption accumulates by publication year"""
+        trend = self.cube.slice("theme_adoption", ["Innovation"], 2021, 2024, cumulative=True)
+        self.assertEqual(trend["years"], [2021, 2022, 2023, 2024])
+        self.assertEqual(trend["series"]["Innovation"], [2, 3, 4, 5])
+    
+    def test_active_initiatives_span_timelines(self):
+        """Test that initiatives count in every year between their start and end"""
+        kenya = self.cube.slice("active_initiatives", ["KE"], 2021, 2028)["series"]["KE"]
+        self.assertEqual(kenya, [0, 1, 2, 2, 2, 2, 1, 0])
+        
+        total = self.cube.rollup("active_initiatives", start_year=2023, end_year=2023)
+        self.assertEqual(total["values"], [6])
+    
+    def test_cumulative_budget_rollup(self):
+        """Test that committed initiative budgets roll up across countries"""
+        budget = self.cube.rollup("budget_committed", cumulative=True)
+        self.assertAlmostEqual(budget["values"][-1], 225.0)
+        self.assertAlmostEqual(budget["values"][budget["years"].index(2022)], 195.0)
+    
+    def test_analyzer_reuses_cube_until_data_changes(self):
+        """Test that the self.analyzer serves trend queries from a cached cube"""
+        cube = self.analyzer.get_trend_cube()
+        self.assertIs(self.analyzer.get_trend_cube(), cube)
+        
+        with open(self.processed_dir / "strategy_MA.json", "w") as f:
+            json.dump(dict(SAMPLE_STRATEGIES["MA"], publication_date="2025-02-01"), f)
+        self.assertIsNot(self.analyzer.get_trend_cube(), cube)
+        trend = self.analyzer.get_trends("strategies_published", ["MA"], 2024, 2025)
+        self.assertEqual(trend["series"]["MA"], [0, 1])
+
+class TestStrategyComparison(SampleDataTestCase):
+    def test_n_way_commonality_and_uniques(self):
+        """Test that one comparison yields common, unique and pairwise features"""
+        result = self.analyzer.compare_strategies(["ZA", "KE", "RW", "NG"])
+        
+        self.assertEqual(result.countries, ["KE", "NG", "RW", "ZA"])
+        self.assertEqual(result.common_themes, ["Agriculture", "Healthcare", "Innovation", "Skills Development"])
+        self.assertEqual(result.similarities["Priority Sectors"], ["Agriculture", "Healthcare"])
+        self.assertEqual(result.similarities["International Cooperation"], ["African Union"])
+        self.assertEqual(result.unique_features["NG"]["sectors"], ["Oil and Gas"])
+        self.assertEqual(result.unique_features["ZA"]["sectors"], ["Mining"])
+        self.assertEqual(len(result.pairwise), 6)
+    
+    def test_differences_read_existing_fields(self):
+        """Test that budget, timeline and governance come from the strategy documents"""
+        differences = self.analyzer.compare_strategies(["KE", "NG"]).differences
+        self.assertEqual(differences["KE"]["budget"], "USD 200 million over 5 years")
+        self.assertEqual(differences["KE"]["timeline"], "2022-2027")
+        self.assertEqual(differences["NG"]["timeline"], "2022-2030")
+        self.assertEqual(differences["NG"]["governance"], "Federal Ministry of Communications and Digital Economy")
+        self.assertAlmostEqual(differences["NG"]["budget_usd_millions"], 125.0)
+    
+    def test_results_memoized_per_country_set_and_version(self):
+        """Test that repeated comparisons are served from the memo until data changes"""
+        comparator = self.analyzer.comparator
+        first = self.analyzer.compare_strategies(["KE", "NG", "ZA"])
+        self.assertIs(self.analyzer.compare_strategies(["ZA", "KE", "NG"]), first)
+        self.assertEqual(comparator.stats["extracted"], 3)
+        
+        with open(self.processed_dir / "strategy_NG.json", "w") as f:
+            json.dump(dict(SAMPLE_STRATEGIES["NG"], priority_sectors=["Agriculture", "Healthcare"]), f)
+        second = self.analyzer.compare_strategies(["KE", "NG", "ZA"])
+        self.assertIsNot(second, first)
+        self.assertEqual(comparator.stats["extracted"], 4)
+        self.assertEqual(second.unique_features["NG"]["sectors"], [])
+    
+    def test_removed_country_leaves_vocabulary(self):
+        """Test that a deleted strategy is forgotten and its values dropped from the bitset vocabulary"""
+        comparator = self.analyzer.comparator
+        self.analyzer.compare_strategies(["KE", "NG", "ZA"])
+        sectors = comparator.bitsets.size("sectors")
+        
+        (self.processed_dir / "strategy_NG.json").unlink()
+        result = self.analyzer.compare_strategies(["KE", "ZA"])
+        self.assertEqual(comparator.stats["compactions"], 1)
+        self.assertLess(comparator.bitsets.size("sectors"), sectors)
+        self.assertNotIn("NG", comparator._countries)
+        self.assertEqual(result.unique_features["ZA"]["sectors"], ["Mining"])
+
+class TestReadinessScoring(SampleDataTestCase):
+    def test_parse_weights(self):
+        """Test that weight specs are validated and normalized"""
+        self.assertEqual(parse_weights("budget:3,governance:1")["budget"], 0.75)
+        self.assertEqual(parse_weights("partners")["partners"], 1.0)
+        self.assertAlmostEqual(sum(parse_weights(None).values()), 1.0)
+        for spec in ("funding:1", "budget:abc", "budget:-1", "budget:0"):
+            with self.assertRaises(ValueError):
+                parse_weights(spec)
+    
+    def test_budget_only_profile_orders_by_budget(self):
+        """Test that a single-component profile ranks by that component"""
+        ranking = self.analyzer.rank_countries(parse_weights("budget:1"))
+        self.assertEqual([r["country_code"] for r in ranking], ["KE", "NG", "ZA", "RW", "MA"])
+        self.assertEqual(ranking[0]["score"], 100.0)
+        self.assertEqual(ranking[-1]["score"], 0.0)
+    
+    def test_rankings_cached_per_profile_and_version(self):
+        """Test that rankings are memoized until weights or data change"""
+        scorer = self.analyzer.scorer
+        first = self.analyzer.rank_countries()
+        self.assertIs(self.analyzer.rank_countries(), first)
+        self.analyzer.rank_countries(parse_weights("timeline:1"))
+        self.assertEqual(scorer.stats["matrix_builds"], 1)
+        
+        with open(self.processed_dir / "strategy_MA.json", "w") as f:
+            json.dump(dict(SAMPLE_STRATEGIES["MA"], budget="USD 5 billion"), f)
+        ranking = self.analyzer.rank_countries(parse_weights("budget:1"))
+        self.assertEqual(ranking[0]["country_code"], "MA")
+        self.assertEqual(scorer.stats["matrix_builds"], 2)
+
+class TestRegionalRollup(SampleDataTestCase):
+    def test_bloc_aggregates(self):
+        """Test that RECs and the continent aggregate their member strategies"""
+        rollup = self.analyzer.get_regional_rollup()
+        
+        eac = rollup.region_summary("EAC")
+        self.assertEqual(eac["countries"], ["KE", "RW"])
+        self.assertAlmostEqual(eac["total_budget_usd_millions"], 210.0)
+        self.assertEqual(eac["top_themes"][0], {"name": "Agriculture", "count": 2})
+        
+        au = rollup.region_summary("AU")
+        self.assertEqual(au["strategy_count"], 5)
+        self.assertEqual(au["status_counts"], {"published": 4, "draft": 1})
+        self.assertEqual([s["code"] for s in rollup.summaries()], ["AMU", "EAC", "ECOWAS", "SADC", "AU"])
+    
+    def test_incremental_update_touches_one_country(self):
+        """Test that a changed strategy only replaces its own contribution"""
+        rollup = self.analyzer.get_regional_rollup()
+        updates = rollup.stats["updates"]
+        
+        with open(self.processed_dir / "strategy_RW.json", "w") as f:
+            json.dump(dict(SAMPLE_STRATEGIES["RW"], status="draft", budget="USD 50 million"), f)
+        rollup = self.analyzer.get_regional_rollup()
+        
+        self.assertEqual(rollup.stats["updates"], updates + 1)
+        eac = rollup.region_summary("EAC")
+        self.assertAlmostEqual(eac["total_budget_usd_millions"], 250.0)
+        self.assertEqual(eac["status_counts"], {"published": 1, "draft": 1})
+        self.assertEqual(rollup.region_summary("AU")["status_counts"], {"published": 3, "draft": 2})
+
+class TestInitiativeDeduplication(SampleDataTestCase):
+    def test_lsh_links_near_duplicates_only(self):
+        """Test that reworded initiatives cluster while unrelated ones stay apart"""
+        dedup = InitiativeDeduplicator()
+        dedup.sync(SAMPLE_STRATEGIES)
+        
+        self.assertEqual(dedup.cluster_of("NG:1"), dedup.cluster_of("KE:1"))
+        self.assertEqual(dedup.cluster_of("KE:1"), "KE:1")
+        self.assertEqual(dedup.cluster_of("ZA:0"), "ZA:0")
+        
+        clusters = dedup.clusters()
+        self.assertEqual(len(clusters), 1)
+        self.assertEqual(clusters[0]["countries"], ["KE", "NG"])
+        # Only bucket mates are compared, not every pair
+        self.assertLess(dedup.stats["comparisons"], len(dedup) * (len(dedup) - 1) // 2)
+    
+    def test_unchanged_corpus_loads_nothing(self):
+        """Test that syncing against an unchanged provider skips every document"""
+        dedup = InitiativeDeduplicator()
+        self.assertEqual(dedup.sync(self.provider), len(SAMPLE_STRATEGIES))
+        loads = self.provider.stats["loads"] + self.provider.stats["hits"]
+        
+        self.assertEqual(dedup.sync(self.provider), 0)
+        self.assertEqual(self.provider.stats["loads"] + self.provider.stats["hits"], loads)
+    
+    def test_removed_strategy_leaves_cluster(self):
+        """Test that clusters follow strategy updates"""
+        dedup = InitiativeDeduplicator()
+        dedup.sync(SAMPLE_STRATEGIES)
+        dedup.sync({code: s for code, s in SAMPLE_STRATEGIES.items() if code != "KE"})
+        self.assertEqual(dedup.clusters(), [])
+        self.assertEqual(dedup.cluster_of("NG:1"), "NG:1")
+    
+    def test_theme_initiatives_collapse_duplicates(self):
+        """Test that analysis lists a duplicated programme once with all its countries"""
+        analysis = self.analyzer.analyze_cross_cutting_themes()
+        
+        agriculture = analysis["theme_analysis"]["Agriculture"]
+        platforms = [i for i in agriculture["key_initiatives"] if i["cluster_id"] == "KE:1"]
+        self.assertEqual(len(platforms), 1)
+        self.assertEqual(platforms[0]["countries"], ["KE", "NG"])
+
+class TestJobRunner(SampleDataTestCase):
+    def setUp(self):
+        super().setUp()
+        self.store = JobStore(f"{self.tmp.name}/strategies.db")
+        self.runner = JobRunner(self.store, {
+            "analysis": lambda params, context: self.analyzer.analyze_cross_cutting_themes(
+                force=True, progress=context.progress)["total_themes"]
+        })
+    
+    def tearDown(self):
+        self.runner.stop()
+    
+    def test_identical_pending_jobs_are_deduplicated(self):
+        """Test that resubmitting active work returns the existing job"""
+        first = self.runner.submit("analysis", {"countries": ["KE", "NG"]})
+        self.assertEqual(self.runner.submit("analysis", {"countries": ["KE", "NG"]}), first)
+        self.assertNotEqual(self.runner.submit("analysis", {"countries": ["KE"]}), first)
+        
+        self.assertEqual(self.runner.run_pending(), 2)
+        self.assertNotEqual(self.runner.submit("analysis", {"countries": ["KE", "NG"]}), first)
+    
+    def test_job_records_progress_and_result(self):
+        """Test that analyzer stages report progress and the result is stored"""
+        stages = []
+        self.runner.register("traced", lambda params, context: self.analyzer.analyze_cross_cutting_themes(
+            force=True, progress=lambda f, stage: (stages.append(stage), context.progress(f, stage))
+        )["total_themes"])
+        job_id = self.runner.submit("traced")
+        self.runner.run_pending()
+        
+        job = self.store.get(job_id)
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual(job["progress"], 1.0)
+        self.assertEqual(job["stage"], "done")
+        self.assertGreater(job["result"], 0)
+        self.assertEqual(stages[0], "fingerprint")
+        self.assertIn("counting", stages)
+    
+    def test_cancellation(self):
+        """Test that pending jobs cancel immediately and running jobs stop at the next progress report"""
+        pending = self.runner.submit("analysis")
+        self.assertTrue(self.store.cancel(pending))
+        self.assertEqual(self.store.get(pending)["status"], "cancelled")
+        
+        def cancels_itself(params, context):
+            self.store.cancel(context.job_id)
+            context.progress(0.5, "working")
+            return "unreachable"
+        
+        self.runner.register("self_cancel", cancels_itself)
+        running = self.runner.submit("self_cancel")
+        self.runner.run_pending()
+        self.assertEqual(self.store.get(running)["status"], "cancelled")
+        self.assertFalse(self.store.cancel(running))
+    
+    def test_failures_are_recorded(self):
+        """Test that handler exceptions mark the job failed with the error"""
+        self.runner.register("broken", lambda params, context: 1 / 0)
+        job_id = self.runner.submit("broken")
+        self.runner.run_pending()
+        job = self.store.get(job_id)
+        self.assertEqual(job["status"], "failed")
+        self.assertIn("division by zero", job["error"])
+    
+    def test_dead_worker_job_is_recovered(self):
+        """Test that a job left running by a crashed worker is failed and no longer absorbs resubmissions"""
+        job_id = self.runner.submit("analysis")
+        self.assertEqual(self.store.claim_next()["job_id"], job_id)
+        self.assertEqual(self.store.recover_stale(), 0)
+        
+        # The claiming worker died: its heartbeat stopped long ago
+        with self.store._connect() as conn:
+            conn.execute("UPDATE jobs SET heartbeat_at = '2000-01-01T00:00:00' WHERE job_id = ?", (job_id,))
+        self.assertEqual(self.runner.submit("analysis"), job_id)
+        
+        self.runner.start()
+        job = self.store.get(job_id)
+        self.assertEqual(job["status"], "failed")
+        self.assertIn("stopped responding", job["error"])
+        
+        resubmitted = self.runner.submit("analysis")
+        self.assertNotEqual(resubmitted, job_id)
+        for _ in range(200):
+            if self.store.get(resubmitted)["status"] == "succeeded":
+                break
+            time.sleep(0.05)
+        self.assertEqual(self.store.get(resubmitted)["status"], "succeeded")
+    
+    def test_background_worker_runs_jobs(self):
+        """Test that worker threads pick up submitted jobs"""
+        self.runner.start()
+        job_id = self.runner.submit("analysis")
+        for _ in range(200):
+            if self.store.get(job_id)["status"] == "succeeded":
+                break
+            time.sleep(0.05)
+        self.assertEqual(self.store.get(job_id)["status"], "succeeded")
+
+if __name__ == '__main__':
+    unittest.main()
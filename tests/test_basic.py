@@ -1,7 +1,14 @@
 import unittest
+import json
+import os
+import tempfile
+import numpy as np
+from unittest import mock
+from src.analyzer import CrossCuttingAnalyzer
 from src.models import StrategyDatabase
 from src.data_collector import DataCollector
 from app import app
+from tests.sample_data import write_sample_strategies
 
 class TestBasicFunctionality(unittest.TestCase):
     def setUp(self):
@@ -13,6 +20,28 @@ class TestBasicFunctionality(unittest.TestCase):
         """Test that database can be initialized"""
         self.assertIsNotNone(self.db)
 
+    def test_save_strategy_updates_dashboard_summary(self):
+        """Test that writes maintain the materialized summary the dashboard reads"""
+        from dataclasses import replace
+        from src.models import AIStrategy
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            db = StrategyDatabase(db_path=f"{tmp}/strategies.db")
+            before = db.get_dashboard_summary()["statistics"]
+            
+            kenya = AIStrategy(**db.get_country_strategy("KE"))
+            db.save_strategy(replace(kenya, country_code="UG", country_name="Uganda", status="draft",
+                                     publication_date="2030-01-01"))
+            summary = db.get_dashboard_summary()
+            self.assertEqual(summary["statistics"]["total_countries"], before["total_countries"] + 1)
+            self.assertEqual(summary["statistics"]["draft_strategies"], before["draft_strategies"] + 1)
+            self.assertEqual(summary["recent_updates"][0]["country_code"], "UG")
+            
+            with mock.patch('app._database', db):
+                response = self.app.get('/')
+                self.assertEqual(response.status_code, 200)
+                self.assertIn(b'Uganda', response.data)
+
     def test_data_collector_initialization(self):
         """Test that data collector can be initialized"""
         self.assertIsNotNone(self.collector)
@@ -75,5 +104,329 @@ class TestBasicFunctionality(unittest.TestCase):
         response = self.app.get('/static/css/style.css')
         self.assertIn(response.status_code, [200, 404])  # 404 is ok if file doesn't exist yet
 
+    def test_rankings_endpoint(self):
+        """Test that rankings honour the weights parameter and reject bad weights"""
+        with tempfile.TemporaryDirectory() as tmp:
+            write_sample_strategies(tmp)
+            with mock.patch('app._analyzer', CrossCuttingAnalyzer(data_dir=tmp)):
+                response = self.app.get('/api/rankings?weights=budget:1')
+                self.assertEqual(response.status_code, 200)
+                rankings = response.get_json()["rankings"]
+                self.assertEqual(rankings[0]["country_code"], "KE")
+                self.assertEqual(rankings[0]["rank"], 1)
+                
+                response = self.app.get('/api/rankings?weights=unknown:1')
+                self.assertEqual(response.status_code, 400)
+
+    def test_network_layout_endpoint(self):
+        """Test the pre-laid-out network graph and the clustered overview endpoints"""
+        with tempfile.TemporaryDirectory() as tmp:
+            write_sample_strategies(tmp)
+            analyzer = CrossCuttingAnalyzer(data_dir=tmp)
+            with mock.patch('app._analyzer', analyzer), mock.patch('app._visualizer', None):
+                response = self.app.get('/api/network-graph/layout')
+                self.assertEqual(response.status_code, 200)
+                data = response.get_json()
+                self.assertIn("layout", data["metadata"])
+                self.assertTrue(all("x" in node and "y" in node for node in data["nodes"]))
+                
+                overview = self.app.get('/api/network-graph/overview?max_nodes=10').get_json()
+                self.assertLessEqual(len(overview["nodes"]), 10)
+                cluster = next(n for n in overview["nodes"] if n["type"] == "cluster")
+                response = self.app.get(f'/api/network-graph/clusters/{cluster["id"]}')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.get_json()["metadata"]["members"], cluster["members"])
+                self.assertEqual(self.app.get('/api/network-graph/clusters/unknown').status_code, 404)
+
+    def test_heatmap_encoding_parameter(self):
+        """Test that the heatmap encoding is selected by query parameter"""
+        with tempfile.TemporaryDirectory() as tmp:
+            write_sample_strategies(tmp)
+            with mock.patch('app._analyzer', CrossCuttingAnalyzer(data_dir=tmp)), mock.patch('app._visualizer', None):
+                sparse = self.app.get('/api/heatmap?encoding=sparse').get_json()
+                self.assertEqual(sparse['encoding'], 'sparse')
+                self.assertEqual(len(sparse['rows']), sparse['metadata']['non_zero_cells'])
+                self.assertIn('data', self.app.get('/api/heatmap').get_json())
+                self.assertEqual(self.app.get('/api/heatmap?encoding=xml').status_code, 400)
+
+    def test_comparison_returns_all_metric_charts(self):
+        """Test that one comparison request carries a chart per requested metric"""
+        with tempfile.TemporaryDirectory() as tmp:
+            write_sample_strategies(tmp)
+            with mock.patch('app._analyzer', CrossCuttingAnalyzer(data_dir=tmp)), mock.patch('app._visualizer', None):
+                data = self.app.get('/api/comparison?countries=KE&countries=NG').get_json()
+                self.assertEqual(set(data['charts']), {'budget', 'sectors', 'initiatives', 'themes', 'partners'})
+                self.assertEqual(data['differences']['KE']['budget'], 'USD 200 million over 5 years')
+                self.assertIn('Financial Services', data['similarities']['Priority Sectors'])
+                self.assertIn('Agriculture', data['common_themes'])
+                
+                data = self.app.get('/api/comparison?countries=KE&countries=NG&metrics=budget,themes').get_json()
+                self.assertEqual(data['metrics'], ['budget', 'themes'])
+                self.assertEqual(len(data['charts']['themes']['data']), 2)
+                response = self.app.get('/api/comparison?countries=KE&countries=NG&metrics=gdp')
+                self.assertEqual(response.status_code, 400)
+
+    def test_map_resolution_follows_zoom(self):
+        """Test that the map endpoint serves a coarser topology at low zoom"""
+        low = self.app.get('/api/map?zoom=1').get_json()
+        high = self.app.get('/api/map?zoom=6').get_json()
+        self.assertEqual(low['type'], 'Topology')
+        self.assertEqual(low['metadata']['resolution'], 'low')
+        self.assertEqual(high['metadata']['resolution'], 'high')
+        self.assertLess(low['metadata']['point_count'], high['metadata']['point_count'])
+        self.assertEqual(self.app.get('/api/map?resolution=ultra').status_code, 400)
+
+    def test_mind_map_children_endpoint(self):
+        """Test that mind maps load two levels first and expand children by path"""
+        with tempfile.TemporaryDirectory() as tmp:
+            write_sample_strategies(tmp)
+            with mock.patch('app._analyzer', CrossCuttingAnalyzer(data_dir=tmp)), mock.patch('app._visualizer', None):
+                top = self.app.get('/api/mind-map/KE?depth=2').get_json()
+                branch = next(child for child in top['children'] if child.get('child_count'))
+                self.assertNotIn('children', branch)
+                
+                response = self.app.get(f"/api/mind-map/KE/children?path={branch['path']}")
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.get_json()['children']), branch['child_count'])
+                self.assertEqual(self.app.get('/api/mind-map/KE/children?path=42').status_code, 404)
+
+    def test_timeline_query_endpoint(self):
+        """Test that the timeline endpoint filters by date window and country, and pages results"""
+        with tempfile.TemporaryDirectory() as tmp:
+            write_sample_strategies(tmp)
+            with mock.patch('app._analyzer', CrossCuttingAnalyzer(data_dir=tmp)), mock.patch('app._visualizer', None):
+                data = self.app.get('/api/timeline?from=2021&to=2023&countries=ke,ng&limit=1').get_json()
+                self.assertEqual(len(data['events']), 1)
+                self.assertEqual(data['metadata']['next_offset'], 1)
+                self.assertEqual(data['events'][0]['country_code'], 'NG')
+                self.assertEqual(self.app.get('/api/timeline?from=soon').status_code, 400)
+
+    def test_conditional_requests_skip_computation(self):
+        """Test that API responses carry an ETag and a matching If-None-Match gets 304 without recomputing"""
+        with tempfile.TemporaryDirectory() as tmp:
+            write_sample_strategies(tmp)
+            analyzer = CrossCuttingAnalyzer(data_dir=tmp)
+            analyzer.analyze_cross_cutting_themes()
+            with mock.patch('app._analyzer', analyzer), mock.patch('app._visualizer', None):
+                response = self.app.get('/api/themes')
+                etag = response.headers['ETag']
+                self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+                self.assertEqual({t['name'] for t in response.get_json()},
+                                 {t['name'] for t in analyzer.get_all_themes()})
+                
+                with mock.patch.object(analyzer, 'get_all_themes', side_effect=AssertionError):
+                    response = self.app.get('/api/themes', headers={'If-None-Match': etag})
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.data, b'')
+                self.assertEqual(response.headers['ETag'], etag)
+                
+                other = self.app.get('/api/timeline?countries=KE').headers['ETag']
+                self.assertNotEqual(other, self.app.get('/api/timeline?countries=NG').headers['ETag'])
+                self.assertEqual(self.app.get('/api/timeline?countries=KE', headers={'If-None-Match': other}).status_code, 304)
+                
+                graph = self.app.get('/api/network-graph').get_json()
+                self.assertEqual({n['id'] for n in graph['nodes'] if n['type'] == 'country'}, {'KE', 'MA', 'NG', 'RW', 'ZA'})
+                
+                for url in ('/api/map?zoom=1', '/api/rankings'):
+                    etag = self.app.get(url).headers['ETag']
+                    self.assertEqual(self.app.get(url, headers={'If-None-Match': etag}).status_code, 304)
+            
+            db = StrategyDatabase(db_path=f"{tmp}/strategies.db")
+            with mock.patch('app._database', db):
+                etag = self.app.get('/api/countries').headers['ETag']
+                self.assertEqual(self.app.get('/api/countries', headers={'If-None-Match': etag}).status_code, 304)
+                
+                from dataclasses import replace
+                from src.models import AIStrategy
+                kenya = AIStrategy(**db.get_country_strategy("KE"))
+                db.save_strategy(replace(kenya, country_code="UG", country_name="Uganda"))
+                response = self.app.get('/api/countries', headers={'If-None-Match': etag})
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('UG', [c['code'] for c in response.get_json()])
+
+    def test_chart_svg_redirects_to_versioned_snapshot(self):
+        """Test that chart URLs pin the data version, are cached for long, and queue a bulk pre-render"""
+        import app as app_module
+        with tempfile.TemporaryDirectory() as tmp:
+            write_sample_strategies(tmp)
+            runner = app_module.JobRunner(app_module.JobStore(f"{tmp}/strategies.db"), app_module.JOB_HANDLERS)
+            with mock.patch('app._analyzer', CrossCuttingAnalyzer(data_dir=tmp)), mock.patch('app._visualizer', None), \
+                    mock.patch('app._chart_snapshots', None), mock.patch('app._prerendered_version', None), \
+                    mock.patch('app._job_runner', runner):
+                response = self.app.get('/charts/timeline.svg')
+                self.assertEqual(response.status_code, 302)
+                self.assertIn('v=', response.headers['Location'])
+                
+                response = self.app.get(response.headers['Location'])
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.mimetype, 'image/svg+xml')
+                self.assertIn('immutable', response.headers['Cache-Control'])
+                self.assertEqual(self.app.get('/charts/pie.svg').status_code, 404)
+                
+                self.assertEqual(runner.run_pending(), 1)
+                job = runner.store.list_jobs()[0]
+                self.assertEqual((job['kind'], job['status']), ('prerender_charts', 'succeeded'))
+                
+                # Odd sizes snap to the rendering grid; a data change queues the next pre-render by itself
+                response = self.app.get('/charts/timeline.svg?width=977&height=612')
+                self.assertIn('width=960', response.headers['Location'])
+                self.assertIn('height=600', response.headers['Location'])
+                path = os.path.join(tmp, 'processed', 'strategy_MA.json')
+                stat = os.stat(path)
+                os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+                app_module.strategy_files_version()
+                self.assertEqual(runner.run_pending(), 1)
+
+    def test_streamed_json_matches_jsonify(self):
+        """Test that streamed responses encode like jsonify, from generators, in bounded chunks"""
+        from flask import jsonify
+        import app as app_module
+        from src.streaming import chunked, iter_json
+        
+        payload = {"nodes": [{"id": f"n{i}", "name": "Côte d'Ivoire"} for i in range(500)], "total": 500}
+        with app.app_context():
+            expected = jsonify(payload).get_data().rstrip(b'\n')
+        lazy = dict(payload, nodes=(node for node in payload["nodes"]))
+        chunks = list(chunked(iter_json(lazy, batch_size=4), chunk_size=1024))
+        self.assertEqual(b''.join(chunks), expected)
+        self.assertGreater(len(chunks), 1)
+        self.assertLess(max(len(chunk) for chunk in chunks), 1024 + 4 * 100)
+        
+        numbers = {"rows": np.arange(1000), "cols": [[1, 2], iter([3]), 4.5]}
+        self.assertEqual(json.loads(b''.join(chunked(iter_json(numbers, batch_size=64)))),
+                         {"rows": list(range(1000)), "cols": [[1, 2], [3], 4.5]})
+        
+        def failing(after):
+            yield from payload["nodes"][:after]
+            raise RuntimeError("engine failed")
+        
+        with app.test_request_context():
+            # Failing within the first chunk surfaces before any status is sent
+            with self.assertRaises(RuntimeError):
+                app_module.stream_json({"nodes": failing(1)})
+            # Failing later aborts the stream instead of ending a 200 body early
+            response = app_module.stream_json({"nodes": failing(400)}, chunk_size=1024)
+            with self.assertRaises(RuntimeError):
+                b''.join(response.response)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            write_sample_strategies(tmp)
+            with mock.patch('app._analyzer', CrossCuttingAnalyzer(data_dir=tmp)), mock.patch('app._visualizer', None):
+                response = self.app.get('/api/heatmap')
+                self.assertTrue(response.is_streamed)
+                self.assertEqual(response.get_json(), app_module.get_visualizer().generate_theme_heatmap())
+
+    def test_responses_are_compressed_once_per_etag(self):
+        """Test gzip/brotli negotiation, the size threshold, streamed compression and precompressed hits"""
+        import gzip
+        import app as app_module
+        from src import compression
+        from src.compression import CompressedCache
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            write_sample_strategies(tmp)
+            cache = CompressedCache()
+            CrossCuttingAnalyzer(data_dir=tmp).analyze_cross_cutting_themes()
+            with mock.patch('app._analyzer', CrossCuttingAnalyzer(data_dir=tmp)), mock.patch('app._visualizer', None), \
+                    mock.patch.object(app_module.compressor, 'cache', cache), mock.patch.object(compression, 'brotli', None):
+                plain = self.app.get('/api/cross-cutting')
+                self.assertNotIn('Content-Encoding', plain.headers)
+                self.assertIn('Accept-Encoding', plain.headers['Vary'])
+                
+                response = self.app.get('/api/cross-cutting', headers={'Accept-Encoding': 'gzip, br'})
+                self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+                self.assertEqual(gzip.decompress(response.data), plain.data)
+                self.assertEqual(response.headers['ETag'], 'W/' + plain.headers['ETag'])
+                
+                with mock.patch.object(app_module.get_analyzer(), 'load_analysis', side_effect=AssertionError):
+                    again = self.app.get('/api/cross-cutting', headers={'Accept-Encoding': 'gzip'})
+                self.assertEqual(again.data, response.data)
+                self.assertEqual(cache.stats, {"hits": 1, "compressions": 1})
+                self.assertEqual(self.app.get('/api/cross-cutting', headers={'Accept-Encoding': 'gzip',
+                                              'If-None-Match': again.headers['ETag']}).status_code, 304)
+                
+                streamed = self.app.get('/api/heatmap', headers={'Accept-Encoding': 'gzip'})
+                self.assertTrue(streamed.is_streamed)
+                self.assertEqual(gzip.decompress(streamed.data), self.app.get('/api/heatmap').data)
+                
+                small = self.app.get('/api/search', headers={'Accept-Encoding': 'gzip'})
+                self.assertLess(len(small.data), compression.MIN_SIZE)
+                self.assertNotIn('Content-Encoding', small.headers)
+            
+            if compression.brotli is not None:
+                with mock.patch('app._analyzer', CrossCuttingAnalyzer(data_dir=tmp)), mock.patch('app._visualizer', None):
+                    response = self.app.get('/api/themes', headers={'Accept-Encoding': 'gzip, br'})
+                    self.assertEqual(response.headers['Content-Encoding'], 'br')
+                    self.assertEqual(compression.brotli.decompress(response.data), self.app.get('/api/themes').data)
+
+    def test_vercel_responses_are_compressed_once(self):
+        """Test that the serverless entry point tags demo responses and reuses their compressed bodies"""
+        import gzip
+        from api import index as vercel
+        from src.compression import CompressedCache
+        
+        cache = CompressedCache()
+        client = vercel.app.test_client()
+        with mock.patch.object(vercel.app.extensions['compressor'], 'cache', cache):
+            first = client.get('/api/compare', headers={'Accept-Encoding': 'gzip'})
+            self.assertEqual(first.headers['Content-Encoding'], 'gzip')
+            self.assertTrue(first.headers['ETag'].startswith('W/'))
+            again = client.get('/api/compare', headers={'Accept-Encoding': 'gzip'})
+            self.assertEqual(again.data, first.data)
+            self.assertEqual(cache.stats, {"hits": 1, "compressions": 1})
+            self.assertEqual(gzip.decompress(first.data), client.get('/api/compare').data)
+            
+            response = client.get('/api/compare', headers={'Accept-Encoding': 'gzip', 'If-None-Match': first.headers['ETag']})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(client.get('/api/country/XX').status_code, 404)
+
+    def test_jobs_endpoint(self):
+        """Test that analysis runs as a background job with pollable status"""
+        import app as app_module
+        with tempfile.TemporaryDirectory() as tmp:
+            write_sample_strategies(tmp)
+            runner = app_module.JobRunner(app_module.JobStore(f"{tmp}/strategies.db"), app_module.JOB_HANDLERS)
+            with mock.patch('app._analyzer', CrossCuttingAnalyzer(data_dir=tmp)), \
+                    mock.patch('app._job_runner', runner):
+                response = self.app.post('/api/jobs', json={'kind': 'cross_cutting_analysis'})
+                self.assertEqual(response.status_code, 202)
+                job_id = response.get_json()['job_id']
+                self.assertEqual(self.app.get(f'/api/jobs/{job_id}').get_json()['status'], 'pending')
+                
+                runner.run_pending()
+                job = self.app.get(f'/api/jobs/{job_id}').get_json()
+                self.assertEqual(job['status'], 'succeeded')
+                self.assertEqual(job['progress'], 1.0)
+                self.assertGreater(job['result']['total_themes'], 0)
+                
+                self.assertEqual(self.app.get('/api/jobs/missing').status_code, 404)
+                self.assertEqual(self.app.post('/api/jobs', json={'kind': 'unknown'}).status_code, 400)
+
+    def test_analysis_endpoints_queue_instead_of_computing(self):
+        """Test that a missing analysis is queued as a job and answered with 202, never computed in the request"""
+        import app as app_module
+        with tempfile.TemporaryDirectory() as tmp:
+            write_sample_strategies(tmp)
+            runner = app_module.JobRunner(app_module.JobStore(f"{tmp}/strategies.db"), app_module.JOB_HANDLERS)
+            analyzer = CrossCuttingAnalyzer(data_dir=tmp)
+            with mock.patch('app._analyzer', analyzer), mock.patch('app._job_runner', runner):
+                with mock.patch.object(analyzer, '_count_features', side_effect=AssertionError):
+                    response = self.app.get('/api/cross-cutting')
+                    themes = self.app.get('/api/themes')
+                self.assertEqual((response.status_code, themes.status_code), (202, 202))
+                self.assertNotIn('ETag', response.headers)
+                job = response.get_json()
+                self.assertEqual(themes.get_json()['job_id'], job['job_id'])
+                self.assertEqual(job['status'], 'pending')
+                self.assertEqual(job['status_url'], f"/api/jobs/{job['job_id']}")
+                
+                self.assertEqual(runner.run_pending(), 1)
+                self.assertEqual(self.app.get(job['status_url']).get_json()['status'], 'succeeded')
+                response = self.app.get('/api/cross-cutting')
+                self.assertEqual(response.status_code, 200)
+                self.assertGreater(response.get_json()['total_themes'], 0)
+                self.assertEqual({t['name'] for t in self.app.get('/api/themes').get_json()},
+                                 set(response.get_json()['theme_analysis']))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
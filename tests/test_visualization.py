@@ -0,0 +1,608 @@
+import unittest
+import json
+import base64
+import os
+import shutil
+import xml.etree.ElementTree as ET
+import numpy as np
+from pathlib import Path
+from unittest import mock
+
+from src.geo import (BOUNDARIES_FILE, BoundaryTopology, MAP_RESOLUTIONS, PrebuiltTopology, build_encoded_topologies,
+                     extract_arcs, resolution_for_zoom, simplify_arc)
+from src.layout import ForceLayout
+from src.network import NetworkLOD, label_propagation, top_k_edges
+from src.strategy_store import StrategyProvider
+from src.summary import DashboardSummary
+from src.svg_charts import SVG_CHARTS, ChartSnapshots
+from src.timeline import TimelineIndex
+from src.visualizer import VisualizationEngine
+from tests.sample_data import SAMPLE_STRATEGIES, SampleDataTestCase
+
+class TestStrategyProvider(SampleDataTestCase):
+    def test_index_does_not_load_files(self):
+        """Test that listing codes parses no strategy files"""
+        self.assertEqual(sorted(self.provider.codes()), sorted(SAMPLE_STRATEGIES))
+        self.assertIn("KE", self.provider)
+        self.assertEqual(self.provider.stats["loads"], 0)
+    
+    def test_mind_map_touches_one_file(self):
+        """Test that a single-country mind map loads one file, and repeat calls load none"""
+        engine = VisualizationEngine(data_dir=self.tmp.name, provider=self.provider)
+        mind_map = engine.generate_country_mind_map("KE")
+        self.assertEqual(mind_map["name"], "Kenya AI Strategy")
+        self.assertEqual(self.provider.stats["loads"], 1)
+        
+        engine.generate_country_mind_map("KE")
+        self.assertEqual(self.provider.stats["loads"], 1)
+    
+    def test_byte_budget_evicts_least_recently_used(self):
+        """Test that the cache stays within its byte budget"""
+        ke_size = (self.processed_dir / "strategy_KE.json").stat().st_size
+        provider = StrategyProvider(self.processed_dir, max_bytes=ke_size)
+        provider.get("KE")
+        provider.get("NG")
+        self.assertLessEqual(provider.cached_bytes, ke_size)
+        self.assertEqual(provider.stats["evictions"], 1)
+    
+    def test_modified_file_is_reloaded(self):
+        """Test that mtime revalidation picks up edited strategy files"""
+        version = self.provider.version
+        self.assertEqual(self.provider["MA"]["status"], "draft")
+        
+        path = self.processed_dir / "strategy_MA.json"
+        with open(path, "w") as f:
+            json.dump(dict(SAMPLE_STRATEGIES["MA"], status="published"), f)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        
+        self.assertEqual(self.provider["MA"]["status"], "published")
+        self.assertNotEqual(self.provider.version, version)
+    
+    def test_version_is_reused_within_ttl(self):
+        """Test that the version token is not recomputed within its TTL, and invalidate drops it"""
+        provider = StrategyProvider(self.processed_dir, version_ttl=3600)
+        version = provider.version
+        
+        path = self.processed_dir / "strategy_MA.json"
+        with open(path, "w") as f:
+            json.dump(dict(SAMPLE_STRATEGIES["MA"], status="published"), f)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        
+        self.assertEqual(provider.version, version)
+        provider.invalidate()
+        self.assertNotEqual(provider.version, version)
+    
+    def test_live_revision_sees_edits_to_cached_files(self):
+        """Test that revision stats the file while a snapshot keeps the revision of the document it serves"""
+        snapshot = self.provider.snapshot()
+        revision = self.provider.revision("MA")
+        self.assertEqual(snapshot.revision("MA"), revision)
+        
+        path = self.processed_dir / "strategy_MA.json"
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        self.assertNotEqual(self.provider.revision("MA"), revision)
+        self.assertEqual(snapshot.revision("MA"), revision)
+    
+    def test_vanished_file_has_no_content_hash(self):
+        """Test that a file deleted after the index was read hashes to None instead of raising"""
+        self.assertIsNotNone(self.provider.content_hash("KE"))
+        with mock.patch.object(self.provider, "_refresh_index", return_value={"KE": self.processed_dir / "gone.json"}):
+            self.assertIsNone(self.provider.content_hash("KE"))
+        self.assertNotIn("KE", self.provider._hashes)
+    
+    def test_snapshot_listeners_run_outside_the_lock(self):
+        """Test that version listeners fired by snapshot() do not hold the provider lock"""
+        held = []
+        self.provider.add_listener(lambda version: held.append(self.provider._lock._is_owned()))
+        self.provider.snapshot()
+        self.assertEqual(held, [False])
+
+class TestVisualizationSnapshot(SampleDataTestCase):
+    def render_dashboard(self):
+        return [
+            self.engine.generate_network_graph(),
+            self.engine.generate_timeline(),
+            self.engine.generate_comparison_chart(["KE", "NG"], "budget"),
+            self.engine.generate_sector_analysis(),
+            self.engine.generate_theme_heatmap(),
+            self.engine.generate_dashboard_summary()
+        ]
+    
+    def test_generators_share_one_load(self):
+        """Test that a full dashboard parses each file once, and a repeat render reuses every output"""
+        first = self.render_dashboard()
+        self.assertEqual(self.provider.stats["loads"], len(SAMPLE_STRATEGIES))
+        self.assertEqual(self.provider.stats["snapshots"], 1)
+        # Six generators, the theme matrix shared by the heatmap encodings, and the
+        # comparison table behind the batched comparison the single chart delegates to
+        self.assertEqual(self.engine.stats["misses"], 8)
+        
+        second = self.render_dashboard()
+        self.assertEqual(self.provider.stats["loads"], len(SAMPLE_STRATEGIES))
+        self.assertEqual(self.engine.stats["hits"], 6)
+        self.assertTrue(all(a is b for a, b in zip(first, second)))
+    
+    def test_new_version_invalidates_outputs(self):
+        """Test that a changed file yields a new snapshot and fresh outputs"""
+        summary = self.engine.generate_dashboard_summary()
+        self.assertEqual(summary["statistics"]["draft_strategies"], 1)
+        
+        path = self.processed_dir / "strategy_MA.json"
+        with open(path, "w") as f:
+            json.dump(dict(SAMPLE_STRATEGIES["MA"], status="published"), f)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        
+        summary = self.engine.generate_dashboard_summary()
+        self.assertEqual(summary["statistics"]["draft_strategies"], 0)
+        self.assertEqual(self.provider.stats["loads"], len(SAMPLE_STRATEGIES) + 1)
+    
+    def test_dashboard_respects_byte_budget(self):
+        """Test that the snapshot pins no documents, so a full render stays within the cache budget"""
+        ke_size = (self.processed_dir / "strategy_KE.json").stat().st_size
+        provider = StrategyProvider(self.processed_dir, max_bytes=ke_size)
+        self.engine = VisualizationEngine(data_dir=self.tmp.name, provider=provider)
+        
+        summary = self.render_dashboard()[-1]
+        self.assertEqual(summary["statistics"]["total_countries"], len(SAMPLE_STRATEGIES))
+        self.assertLessEqual(provider.cached_bytes, ke_size)
+        self.assertGreater(provider.stats["evictions"], 0)
+    
+    def test_memo_is_bounded_and_normalized(self):
+        """Test that equal calls share a memo entry, unknown codes add none, and the memo stays bounded"""
+        engine = VisualizationEngine(data_dir=self.tmp.name, provider=self.provider, memo_max_entries=3)
+        self.assertIs(engine.generate_network_graph(), engine.generate_network_graph(top_k=5))
+        self.assertEqual(engine.stats["misses"], 1)
+        
+        for i in range(20):
+            comparison = engine.generate_comparison(["KE", "NG", f"X{i}"], ["budget"])
+            self.assertEqual(comparison["missing"], [f"X{i}"])
+        for width in range(100, 105):
+            engine.generate_network_layout("full", width, 500)
+        self.assertLessEqual(len(engine._memo), 3)
+    
+    def test_snapshot_is_read_only(self):
+        """Test that generators cannot replace strategies in the shared snapshot"""
+        snapshot = self.provider.snapshot()
+        self.assertIs(self.provider.snapshot(), snapshot)
+        with self.assertRaises(TypeError):
+            snapshot["KE"] = {}
+
+class TestNetworkLayout(SampleDataTestCase):
+    def test_layout_is_deterministic_and_cached(self):
+        """Test that coordinates are reproducible, in bounds, and computed once per data version"""
+        graph = self.engine.generate_network_layout()
+        layout = graph["metadata"]["layout"]
+        for node in graph["nodes"]:
+            self.assertTrue(0 <= node["x"] <= layout["width"])
+            self.assertTrue(0 <= node["y"] <= layout["height"])
+        self.assertNotIn("x", self.engine.generate_network_graph()["nodes"][0])
+        
+        self.assertIs(self.engine.generate_network_layout(), graph)
+        fresh = VisualizationEngine(data_dir=self.tmp.name, provider=self.provider).generate_network_layout()
+        self.assertEqual(fresh["nodes"], graph["nodes"])
+    
+    def test_grid_repulsion_separates_clusters(self):
+        """Test that linked nodes end up closer than unlinked ones on a larger graph"""
+        rng = np.random.default_rng(0)
+        groups = np.repeat(np.arange(4), 25)
+        edges = np.array([(a, b) for a in range(100) for b in range(a + 1, 100)
+                          if groups[a] == groups[b] and rng.random() < 0.2])
+        pos = ForceLayout(iterations=200).positions(100, edges)
+        self.assertTrue(np.isfinite(pos).all())
+        
+        dist = np.hypot(*(pos[:, None, :] - pos[None, :, :]).transpose(2, 0, 1))
+        same = groups[:, None] == groups[None, :]
+        self.assertLess(dist[same].mean(), dist[~same].mean() * 0.7)
+    
+    def test_repulsion_work_is_subquadratic(self):
+        """Test that quadrupling the node count grows repulsion work about 8x (n^1.5), not 16x"""
+        work = []
+        for count in (400, 1600):
+            layout = ForceLayout(iterations=1)
+            layout.positions(count, np.zeros((0, 2)))
+            work.append(layout.stats["interactions"])
+        self.assertLess(work[1] / work[0], 11)
+
+class TestNetworkLevelOfDetail(SampleDataTestCase):
+    def test_top_k_edges_bound_degree(self):
+        """Test that similarity links are the strongest k per node instead of a fixed threshold"""
+        weights = np.ones((40, 40)) * 3
+        self.assertLessEqual(len(top_k_edges(weights, 2)), 40 * 2)
+        self.assertEqual(top_k_edges(np.array([[0, 0], [0, 0]]), 3), [])
+        
+        graph = self.engine.generate_network_graph(top_k=1)
+        similarity = [l for l in graph["links"] if l["type"] == "country_similarity"]
+        self.assertLessEqual(len(similarity), graph["metadata"]["total_countries"])
+        self.assertTrue(all(l["value"] == len(l["common_themes"]) for l in similarity))
+    
+    def test_label_propagation_finds_separate_groups(self):
+        """Test that two dense groups joined by a weak edge become two communities"""
+        edges = [("A", "B", 3), ("B", "C", 3), ("A", "C", 3), ("X", "Y", 3), ("Y", "Z", 3), ("X", "Z", 3), ("C", "X", 1)]
+        communities = label_propagation(["A", "B", "C", "X", "Y", "Z"], edges)
+        self.assertEqual({communities[n] for n in "ABC"}, {"A"})
+        self.assertEqual({communities[n] for n in "XYZ"}, {"X"})
+    
+    def test_overview_collapses_clusters_and_expands(self):
+        """Test that clusters become super-nodes, expand to their members, and respect budgets"""
+        overview = self.engine.generate_network_overview()
+        clusters = [n for n in overview["nodes"] if n["type"] == "cluster"]
+        self.assertTrue(clusters)
+        self.assertLess(len(overview["nodes"]), len(self.engine.generate_network_graph()["nodes"]))
+        
+        expansion = self.engine.expand_network_cluster(clusters[0]["id"])
+        country_ids = {n["id"] for n in expansion["nodes"] if n["type"] == "country"}
+        self.assertEqual(country_ids, set(clusters[0]["members"]))
+        with self.assertRaises(KeyError):
+            self.engine.expand_network_cluster("cluster_XX")
+        
+        small = self.engine.generate_network_overview(max_nodes=4, max_edges=3)
+        self.assertEqual(len(small["nodes"]), 4)
+        self.assertLessEqual(len(small["links"]), 3)
+        self.assertGreater(small["metadata"]["nodes_dropped"], 0)
+    
+    def test_lod_budgets_on_a_synthetic_graph(self):
+        """Test NetworkLOD directly: two communities collapse, sum their links, and views honour budgets"""
+        countries = [f"C{i}" for i in range(6)]
+        nodes = [{"id": c, "name": c, "type": "country"} for c in countries]
+        nodes += [{"id": f"theme_{t}", "name": t, "type": "theme"} for t in ("ai", "data")]
+        links = [{"source": a, "target": b, "value": 3, "type": "country_similarity"}
+                 for group in (countries[:3], countries[3:]) for a in group for b in group if a < b]
+        links.append({"source": "C2", "target": "C3", "value": 1, "type": "country_similarity"})
+        links += [{"source": c, "target": "theme_ai", "value": 1, "type": "has_theme"} for c in countries]
+        lod = NetworkLOD({"nodes": nodes, "links": links}, top_k=2)
+        
+        overview = lod.overview()
+        self.assertEqual(sorted(n["id"] for n in overview["nodes"] if n["type"] == "cluster"), ["cluster_C0", "cluster_C3"])
+        themed = {l["source"]: l["value"] for l in overview["links"] if l["type"] == "has_theme"}
+        self.assertEqual(themed, {"cluster_C0": 3, "cluster_C3": 3})
+        
+        expansion = lod.expand("cluster_C3", max_nodes=3, max_edges=2)
+        self.assertEqual(len(expansion["nodes"]), 3)
+        self.assertLessEqual(len(expansion["links"]), 2)
+        self.assertEqual(expansion["metadata"]["members"], ["C3", "C4", "C5"])
+        self.assertGreater(expansion["metadata"]["nodes_dropped"], 0)
+
+class TestHeatmapEncoding(SampleDataTestCase):
+    def test_compact_encodings_match_cells(self):
+        """Test that dense bits and sparse coordinates decode to the same matrix as the cell list"""
+        cells = self.engine.generate_theme_heatmap()
+        rows, cols = len(cells["countries"]), len(cells["themes"])
+        expected = np.zeros((rows, cols), dtype=bool)
+        for cell in cells["data"]:
+            expected[cell["y"], cell["x"]] = cell["value"]
+        
+        dense = self.engine.generate_theme_heatmap("dense")
+        bits = np.unpackbits(np.frombuffer(base64.b64decode(dense["bits"]), dtype=np.uint8))
+        self.assertEqual(dense["shape"], [rows, cols])
+        np.testing.assert_array_equal(bits[:rows * cols].reshape(rows, cols).astype(bool), expected)
+        
+        sparse = self.engine.generate_theme_heatmap("sparse")
+        decoded = np.zeros((rows, cols), dtype=bool)
+        decoded[sparse["rows"], sparse["cols"]] = True
+        np.testing.assert_array_equal(decoded, expected)
+        
+        self.assertLess(len(json.dumps(sparse)), len(json.dumps(cells)) / 5)
+        self.assertEqual(sparse["metadata"]["non_zero_cells"], int(expected.sum()))
+        with self.assertRaises(ValueError):
+            self.engine.generate_theme_heatmap("csv")
+
+class TestComparisonCharts(SampleDataTestCase):
+    def test_batched_metrics_match_single_charts(self):
+        """Test that one batched call yields the same charts as one call per metric"""
+        batched = self.engine.generate_comparison(["KE", "NG", "ZA"])
+        self.assertEqual(batched["metrics"], ["budget", "sectors", "initiatives", "themes", "partners"])
+        for metric, chart in batched["charts"].items():
+            self.assertEqual(self.engine.generate_comparison_chart(["KE", "NG", "ZA"], metric), chart)
+        
+        themes = batched["charts"]["themes"]
+        expected = [len(self.engine._extract_themes(SAMPLE_STRATEGIES[c])) for c in ("KE", "NG", "ZA")]
+        self.assertEqual([d["value"] for d in themes["data"]], expected)
+        self.assertEqual(themes["metadata"]["max_value"], max(expected))
+        self.assertEqual(max(d["normalized"] for d in themes["data"]), 1.0)
+    
+    def test_table_is_built_once_per_version(self):
+        """Test that different selections reuse the comparison table and unknown input is reported"""
+        self.engine.generate_comparison(["KE", "NG"], ["budget"])
+        misses = self.engine.stats["misses"]
+        result = self.engine.generate_comparison(["RW", "XX", "MA"], ["sectors", "partners"])
+        self.assertEqual(self.engine.stats["misses"], misses + 1)
+        self.assertEqual(result["countries"], ["RW", "MA"])
+        self.assertEqual(result["missing"], ["XX"])
+        with self.assertRaises(ValueError):
+            self.engine.generate_comparison(["KE", "NG"], ["gdp"])
+        
+        chart = self.engine.generate_comparison_chart(["KE", "NG"], "gdp")
+        self.assertEqual(chart["data"], [])
+        self.assertEqual(chart["metadata"]["countries_compared"], 0)
+
+def decode_ring(topology, refs):
+    """Absolute grid coordinates of a ring from its arc references"""
+    points = []
+    for ref in refs:
+        arc = np.cumsum(np.array(topology["arcs"][ref if ref >= 0 else ~ref]), axis=0)
+        points.append(arc if ref >= 0 else arc[::-1])
+    return points
+
+class TestChoroplethMap(SampleDataTestCase):
+    def test_shared_border_is_one_arc(self):
+        """Test that two squares sharing an edge store it once and reference it in both directions"""
+        west = [(0, 0), (0, 1), (1, 1), (1, 0), (0, 0)]
+        east = [(1, 0), (1, 1), (2, 1), (2, 0), (1, 0)]
+        arcs, rings = extract_arcs([west, east])
+        self.assertEqual(len(arcs), 3)
+        shared = set(map(abs, rings[0])) & {~r if r < 0 else r for r in rings[1]}
+        self.assertEqual(len(shared), 1)
+        self.assertTrue(any(r < 0 for r in rings[1]))
+    
+    def test_closed_arc_keeps_an_area(self):
+        """Test that simplifying a small island leaves a polygon rather than a line"""
+        angles = np.linspace(0, 2 * np.pi, 40)
+        ring = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+        ring[-1] = ring[0]
+        simplified = simplify_arc(ring, tolerance=10.0)
+        self.assertGreaterEqual(len(simplified), 4)
+        self.assertTrue(np.array_equal(simplified[0], simplified[-1]))
+    
+    def test_resolutions_stay_gap_free(self):
+        """Test that every resolution's rings close and coarser ones carry fewer points"""
+        topology = BoundaryTopology.load()
+        counts = []
+        for name, _, _, _ in MAP_RESOLUTIONS:
+            encoded = topology.encode(name)
+            counts.append(encoded["point_count"])
+            for geometry in encoded["objects"]["countries"]["geometries"]:
+                polygons = [geometry["arcs"]] if geometry["type"] == "Polygon" else geometry["arcs"]
+                for ring in (ring for polygon in polygons for ring in polygon):
+                    parts = decode_ring(encoded, ring)
+                    for part, following in zip(parts, parts[1:] + parts[:1]):
+                        self.assertTrue(np.array_equal(part[-1], following[0]))
+        self.assertEqual(counts, sorted(counts))
+        self.assertLess(counts[0], counts[-1])
+        self.assertIs(topology.encode("low"), topology.encode("low"))
+        self.assertEqual(topology.stats["encodings"], len(MAP_RESOLUTIONS))
+        self.assertEqual(resolution_for_zoom(1), "low")
+        self.assertEqual(resolution_for_zoom(8), "high")
+    
+    def test_prebuilt_topologies_skip_simplification(self):
+        """Test that built topology files are served as encoded, and ones from other boundaries are ignored"""
+        boundaries = Path(self.tmp.name) / "boundaries.geojson"
+        shutil.copy(BOUNDARIES_FILE, boundaries)
+        build_encoded_topologies(boundaries)
+        expected = BoundaryTopology.load(boundaries).encode("medium")
+        
+        with mock.patch.object(BoundaryTopology, 'load', side_effect=AssertionError("simplified at request time")):
+            prebuilt = PrebuiltTopology(boundaries)
+            self.assertEqual(prebuilt.encode("medium"), expected)
+        self.assertEqual(prebuilt.stats, {"loads": 1, "fallbacks": 0})
+        
+        with open(boundaries, "a") as f:
+            f.write("\n")
+        stale = PrebuiltTopology(boundaries)
+        self.assertEqual(stale.encode("medium"), expected)
+        self.assertEqual(stale.stats, {"loads": 0, "fallbacks": 1})
+    
+    def test_map_joins_strategy_values_per_version(self):
+        """Test that countries carry status, themes and score, and the join is cached per version"""
+        choropleth = self.analyzer.get_choropleth_map("medium")
+        properties = {g["id"]: g["properties"] for g in choropleth["objects"]["countries"]["geometries"]}
+        
+        self.assertEqual(properties["KE"]["status"], SAMPLE_STRATEGIES["KE"]["status"])
+        self.assertIsNotNone(properties["KE"]["score"])
+        self.assertTrue(properties["KE"]["has_strategy"])
+        self.assertFalse(properties["TD"]["has_strategy"])
+        self.assertEqual(choropleth["metadata"]["countries_with_strategies"], len(SAMPLE_STRATEGIES))
+        
+        self.assertIs(self.analyzer.get_choropleth_map("medium"), choropleth)
+        self.assertEqual(self.analyzer._choropleth.stats, {"joins": 1, "hits": 1})
+        with self.assertRaises(ValueError):
+            self.analyzer.get_choropleth_map("ultra")
+
+class TestSvgCharts(SampleDataTestCase):
+    def setUp(self):
+        super().setUp()
+        self.snapshots = ChartSnapshots(self.engine)
+    
+    def test_charts_render_well_formed_svg(self):
+        """Test that every chart renders parseable SVG showing the engine's data"""
+        for chart in SVG_CHARTS:
+            svg, version = self.snapshots.render(chart, 640, 400)
+            root = ET.fromstring(svg)
+            self.assertEqual(root.tag, "{http://www.w3.org/2000/svg}svg")
+            self.assertEqual(root.get("width"), "640")
+            self.assertEqual(version, self.engine.data_version)
+        
+        svg, _ = self.snapshots.render("sectors", 640, 400)
+        for sector in self.engine.generate_sector_analysis()["sectors"]:
+            self.assertIn(sector["name"].replace("&", "&amp;"), svg)
+    
+    def test_snapshots_cached_per_version(self):
+        """Test that repeat renders are cache hits and a data change re-renders"""
+        first, version = self.snapshots.render("heatmap")
+        self.assertIs(self.snapshots.render("heatmap")[0], first)
+        self.assertEqual(self.snapshots.stats["hits"], 1)
+        
+        path = self.processed_dir / "strategy_MA.json"
+        with open(path, "w") as f:
+            json.dump(dict(SAMPLE_STRATEGIES["MA"], themes=["Quantum Computing"]), f)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        
+        svg, new_version = self.snapshots.render("heatmap")
+        self.assertNotEqual(new_version, version)
+        self.assertIn("Quantum Computing", svg)
+        self.assertEqual(self.snapshots.stats["renders"], 2)
+    
+    def test_sizes_snap_to_grid_without_new_layouts(self):
+        """Test that nearby sizes share a snapshot and a new size reuses the network layout"""
+        svg, _ = self.snapshots.render("network", 977, 612)
+        self.assertEqual(ET.fromstring(svg).get("width"), "960")
+        self.assertIs(self.snapshots.render("network", 970, 590)[0], svg)
+        
+        misses = self.engine.stats["misses"]
+        self.snapshots.render("network", 1280, 800)
+        self.assertEqual(self.engine.stats["misses"], misses)
+    
+    def test_prerender_in_process_pool(self):
+        """Test that bulk pre-rendering fills the cache for every chart"""
+        result = self.snapshots.prerender(workers=2)
+        self.assertEqual(result["rendered"], len(SVG_CHARTS))
+        for chart in SVG_CHARTS:
+            self.snapshots.render(chart)
+        self.assertEqual(self.snapshots.stats["hits"], len(SVG_CHARTS))
+        self.assertEqual(self.snapshots.prerender()["rendered"], 0)
+
+class TestMindMapExpansion(SampleDataTestCase):
+    def test_depth_limited_view_and_paths(self):
+        """Test that views stop at the requested depth and cut-off nodes can be fetched by path"""
+        full = self.engine.generate_country_mind_map("KE")
+        top = self.engine.get_mind_map("KE", depth=2)
+        self.assertEqual(top["metadata"]["total_nodes"], full["node_count"])
+        
+        branch = next(child for child in top["children"] if child.get("child_count"))
+        self.assertNotIn("children", branch)
+        children = self.engine.get_mind_map("KE", branch["path"], depth=2)["children"]
+        self.assertEqual(len(children), branch["child_count"])
+        self.assertTrue(all(child["path"].startswith(branch["path"] + "/") for child in children))
+        
+        self.assertIsNone(self.engine.get_mind_map("KE", "99"))
+        self.assertIsNone(self.engine.get_mind_map("XX"))
+    
+    def test_subtrees_cached_per_country_version(self):
+        """Test that repeated views are served from cache until the country's file changes"""
+        first = self.engine.get_mind_map("KE", depth=2)
+        self.assertIs(self.engine.get_mind_map("KE", depth=2), first)
+        self.assertEqual(self.engine.stats["subtree_hits"], 1)
+        self.engine.get_mind_map("NG")
+        
+        path = self.processed_dir / "strategy_KE.json"
+        with open(path, "w") as f:
+            json.dump(dict(SAMPLE_STRATEGIES["KE"], key_initiatives=[]), f)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        
+        self.assertIsNot(self.engine.get_mind_map("KE", depth=2), first)
+        self.engine.get_mind_map("NG")
+        self.assertEqual(self.engine.stats["mind_map_builds"], 3)
+
+class TestTimelineIndex(SampleDataTestCase):
+    def test_window_queries_match_full_scan(self):
+        """Test that windowed, filtered and paged queries agree with filtering the full timeline"""
+        events = self.engine.generate_timeline()["events"]
+        self.assertEqual([e["date"] for e in events], sorted(e["date"] for e in events))
+        
+        cases = [("2022", "2023", None, None), ("2021-06", None, ["KE", "NG"], None),
+                 (None, "2024", None, ["publication"]), ("2022", None, ["KE"], ["milestone"])]
+        for start, end, countries, types in cases:
+            expected = [e for e in events
+                        if (not start or e["date"] >= start) and (not end or e["date"][:len(end)] <= end)
+                        and (countries is None or e["country_code"] in countries)
+                        and (types is None or e["type"] in types)]
+            result = self.engine.query_timeline(start, end, countries, types, limit=100)
+            self.assertEqual(result["events"], expected)
+            self.assertEqual(result["metadata"]["total_events"], len(expected))
+        
+        first = self.engine.query_timeline(limit=3)
+        second = self.engine.query_timeline(offset=first["metadata"]["next_offset"], limit=3)
+        self.assertEqual(first["events"] + second["events"], events[:6])
+        with self.assertRaises(ValueError):
+            self.engine.query_timeline(start="last week")
+    
+    def test_changed_strategy_reindexed_alone(self):
+        """Test that a changed file re-indexes only that country's events"""
+        index = self.engine.timeline_index()
+        self.assertEqual(index.stats["updates"], len(SAMPLE_STRATEGIES))
+        
+        path = self.processed_dir / "strategy_MA.json"
+        with open(path, "w") as f:
+            json.dump(dict(SAMPLE_STRATEGIES["MA"], publication_date="2020-01-01"), f)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        
+        self.assertEqual(self.engine.query_timeline(limit=1)["events"][0]["country_code"], "MA")
+        self.assertEqual(index.stats["updates"], len(SAMPLE_STRATEGIES) + 1)
+        self.assertEqual(len(index), len(self.engine.generate_timeline()["events"]))
+        
+        index.update_country("MA", None)
+        self.assertNotIn("MA", {e["country_code"] for e in index.events})
+    
+    def test_type_filter_pages_from_type_buckets(self):
+        """Test that type-filtered pages and totals come from the type buckets and match a full scan"""
+        def extract(code, strategy):
+            return [{"date": f"{2000 + i % 25}-01-01", "country_code": code, "type": ("launch", "review", "audit")[i % 3]}
+                    for i in range(strategy["events"])]
+        
+        index = TimelineIndex(extract)
+        for code, count in (("KE", 60), ("NG", 45), ("RW", 30)):
+            index.update_country(code, {"events": count})
+        
+        cases = [(None, ["review"]), (["KE", "RW"], ["launch", "audit"]), (["NG"], ["missing"])]
+        for countries, types in cases:
+            expected = [e for e in index.events if "2005" <= e["date"] < "2021"
+                        and (countries is None or e["country_code"] in countries) and e["type"] in types]
+            pages, offset = [], 0
+            while offset is not None:
+                page = index.query("2005", "2020", countries, types, offset=offset, limit=7)
+                self.assertEqual(page["total"], len(expected))
+                pages.extend(page["events"])
+                offset = page["next_offset"]
+            self.assertEqual(pages, expected)
+        
+        self.assertEqual(index.query(types=["audit"], limit=1)["total"], 20 + 15 + 10)
+        
+        index.update_country("KE", None)
+        index.update_country("NG", None)
+        index.update_country("RW", {"events": 1})
+        self.assertEqual(set(index._by_type), {"launch"})
+        self.assertEqual(set(index._by_country_type), {("RW", "launch")})
+
+class TestDashboardSummary(SampleDataTestCase):
+    def full_rebuild(self, strategies):
+        summary = DashboardSummary(top_n=2)
+        summary.apply_many((code, strategy, None) for code, strategy in strategies.items())
+        return summary.record
+    
+    def test_incremental_writes_match_full_rebuild(self):
+        """Test that applying, replacing and removing strategies leaves the same record as a rebuild"""
+        strategies = dict(SAMPLE_STRATEGIES)
+        summary = DashboardSummary(top_n=2)
+        for code, strategy in strategies.items():
+            summary.apply(code, strategy, updated_at=f"2024-01-0{len(code)}")
+        self.assertEqual(summary.record["statistics"]["total_countries"], len(strategies))
+        
+        newest = max(strategies, key=lambda code: strategies[code]["publication_date"])
+        strategies[newest] = dict(strategies[newest], publication_date="2000-01-01", status="draft")
+        summary.apply(newest, strategies[newest])
+        self.assertEqual(summary.stats["heap_rebuilds"], 1)
+        
+        removed = strategies.pop("KE")
+        summary.apply("KE", None)
+        expected = self.full_rebuild(strategies)
+        for key in ("statistics", "status_counts", "top_themes", "top_sectors", "recent_updates", "country_status"):
+            self.assertEqual(summary.record[key], expected[key])
+        
+        only_ke = set(removed.get("themes", [])) - {t for s in strategies.values() for t in s.get("themes", [])}
+        self.assertTrue(only_ke)
+        self.assertFalse(only_ke & set(summary._themes))
+    
+    def test_visualizer_summary_reads_materialized_record(self):
+        """Test that a changed file updates only its contribution to the dashboard summary"""
+        summary = self.engine.generate_dashboard_summary()
+        self.assertEqual(summary["recent_updates"][0]["country_code"], "MA")
+        self.assertEqual(self.engine._summary.stats["updates"], len(SAMPLE_STRATEGIES))
+        
+        path = self.processed_dir / "strategy_RW.json"
+        with open(path, "w") as f:
+            json.dump(dict(SAMPLE_STRATEGIES["RW"], publication_date="2025-06-01"), f)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        
+        summary = self.engine.generate_dashboard_summary()
+        self.assertEqual(summary["recent_updates"][0]["country_code"], "RW")
+        self.assertEqual(self.engine._summary.stats["updates"], len(SAMPLE_STRATEGIES) + 1)
+
+if __name__ == '__main__':
+    unittest.main()